@@ -0,0 +1,67 @@
+"""Benchmark populating the Existing Shortcuts pane from large folders.
+
+Compares the previous approach (``os.listdir`` followed by one ``addItem``
+and one f-string debug message per file) with the streaming ``os.scandir``
+loader that inserts rows in chunks between event-loop turns.  Reports time
+to first row and total time for 1k, 10k and 50k files; the target for time
+to first row is under 50 ms at every size.
+
+Usage:
+    python benchmarks/bench_shortcut_loading.py [count ...]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QListWidget  # noqa: E402
+
+from wsl_shortcut_creator.core.shortcuts import iter_shortcut_names  # noqa: E402
+from wsl_shortcut_creator.gui.list_loader import ChunkedListLoader  # noqa: E402
+
+logger = logging.getLogger('bench')
+TIME_TO_FIRST_ROW_TARGET = 0.050
+
+
+def load_blocking(list_widget: QListWidget, directory: str) -> float:
+    """Previous implementation; returns the time until the event loop runs again."""
+    start = time.perf_counter()
+    shortcuts = [f for f in os.listdir(directory) if f.endswith('.lnk')]
+    logger.debug(f"Found shortcuts: {shortcuts}")
+    for shortcut in shortcuts:
+        list_widget.addItem(shortcut)
+        logger.debug(f"Added shortcut to list: {shortcut}")
+    return time.perf_counter() - start
+
+
+def load_streaming(app: QApplication, list_widget: QListWidget, directory: str):
+    """Streaming implementation; returns (time to first row, total time)."""
+    loader = ChunkedListLoader(list_widget)
+    start = time.perf_counter()
+    loader.start(iter_shortcut_names(directory))
+    first_row = time.perf_counter() - start
+    while loader.is_running():
+        app.processEvents()
+    return first_row, time.perf_counter() - start
+
+
+def main() -> None:
+    app = QApplication(sys.argv)
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+    for count in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(count):
+                open(os.path.join(directory, f"Application {i}.lnk"), 'wb').close()
+            blocking = load_blocking(QListWidget(), directory)
+            first_row, total = load_streaming(app, QListWidget(), directory)
+        verdict = 'ok' if first_row < TIME_TO_FIRST_ROW_TARGET else 'MISSED'
+        print(f"{count:6d} files  blocking {blocking * 1000:8.1f} ms  |  streaming first row "
+              f"{first_row * 1000:6.1f} ms ({verdict}), total {total * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark shortcut writer backends.
+
+Compares starting one writer process per shortcut (the cost model of the old
+one-``cscript``-per-shortcut approach) with streaming a whole batch to one
+long-lived writer process, using the Python stand-in worker so it runs on
+any platform.
+
+Usage:
+    python benchmarks/bench_shortcut_writer.py [count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from wsl_shortcut_creator.core.shortcut_writer import create_writer, make_wsl_shortcut_spec  # noqa: E402
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for label, per_item in (('process per shortcut', True), ('one process per batch', False)):
+        with tempfile.TemporaryDirectory() as target_dir:
+            specs = [make_wsl_shortcut_spec(target_dir, 'Ubuntu', f'App {i}', f'app{i}') for i in range(count)]
+            writer = create_writer('worker')
+            start = time.perf_counter()
+            if per_item:
+                results = [result for spec in specs for result in writer.write_batch([spec])]
+            else:
+                results = writer.write_batch(specs)
+            elapsed = time.perf_counter() - start
+            ok = sum(result['ok'] for result in results)
+        print(f"{label:24s} {count:6d} shortcuts  {elapsed:8.3f}s  "
+              f"{count / elapsed:10.1f}/s  ({ok} ok)")
+    with tempfile.TemporaryDirectory() as target_dir:
+        specs = [make_wsl_shortcut_spec(target_dir, 'Ubuntu', f'App {i}', f'app{i}') for i in range(count)]
+        start = time.perf_counter()
+        create_writer('native').write_batch(specs)
+        elapsed = time.perf_counter() - start
+    print(f"{'native (in-process)':24s} {count:6d} shortcuts  {elapsed:8.3f}s  {count / elapsed:10.1f}/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark warm shell sessions against one process per command.
+
+A fake WSL shell stands in for ``wsl.exe``: a local bash that sleeps for a
+configurable startup delay before it starts serving, mimicking the cost of
+booting the WSL launcher and a shell.  The benchmark compares running N
+small commands with a new process each, sequentially through one warm
+session, pipelined from several threads into that one session (which runs
+them serially) and from several threads through a SessionPool, which
+spreads them over up to four shells.
+
+Usage:
+    python benchmarks/bench_wsl_session.py [count] [startup_delay_seconds]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from wsl_shortcut_creator.core.wsl_session import SessionPool, WslSession  # noqa: E402
+
+SCRIPT = 'grep -c . /etc/passwd'
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.15
+    startup = f'sleep {delay}; '
+
+    start = time.perf_counter()
+    for _ in range(count):
+        subprocess.run(['bash', '-c', startup + SCRIPT], capture_output=True, text=True)
+    one_shot = time.perf_counter() - start
+
+    start = time.perf_counter()
+    session = WslSession(['bash', '-c', startup + 'exec bash --noprofile --norc'])
+    for _ in range(count):
+        session.run(SCRIPT)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: session.run(SCRIPT), range(count)))
+    pipelined = time.perf_counter() - start
+    session.close()
+
+    pool = SessionPool(lambda distro: ['bash', '-c', startup + 'exec bash --noprofile --norc'])
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=4) as workers:
+        list(workers.map(lambda _: pool.run(None, SCRIPT), range(count)))
+    pooled = time.perf_counter() - start
+    pool.close_all()
+
+    print(f"{count} commands, simulated startup {delay * 1000:.0f} ms")
+    for label, elapsed in (('process per command', one_shot), ('warm session', sequential),
+                           ('warm session, pipelined', pipelined), ('session pool, 4 threads', pooled)):
+        print(f"  {label:24s} {elapsed:8.3f}s  {elapsed / count * 1000:8.2f} ms/command")
+
+
+if __name__ == '__main__':
+    main()
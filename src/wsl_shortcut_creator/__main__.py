@@ -24,6 +24,22 @@ Example:
     wsl-shortcuts
     ```
 
+    Query the shortcut index without opening the window:
+    
+    ```bash
+    wsl-shortcuts --apps-with-shortcuts --distro Ubuntu
+    wsl-shortcuts --icons-in-use
+    wsl-shortcuts --changes
+    wsl-shortcuts --stall-report
+    ```
+
+    Profile a whole session, or record UI stalls:
+    
+    ```bash
+    wsl-shortcuts --profile session.prof
+    wsl-shortcuts --stalls
+    ```
+
 Dependencies:
     - PyQt5: GUI framework
     - utils.config_manager: Configuration management
@@ -34,36 +50,40 @@ import os
 import sys
 import logging
 
-# Configure root logger
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 # Import application dependencies
 try:
+    from wsl_shortcut_creator.cli import has_query, parse_args, run_profiled, run_query
+    from wsl_shortcut_creator.config import settings, setup_logging, shutdown_logging
     from wsl_shortcut_creator.gui.main_window import MainWindow
+    from wsl_shortcut_creator.gui.watchdog import EventLoopWatchdog
     from PyQt5.QtWidgets import QApplication
     from PyQt5.QtGui import QIcon
 except ImportError as e:
-    logger.error(f"Failed to import required module: {e}")
+    logger.error("Failed to import required module: %s", e)
     sys.exit(1)
 
-def main():
-    """Main entry point for the application."""
+def run_gui(args, qt_args):
+    """Create the application and main window and run the event loop."""
+    # Create Qt application
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.setApplicationName("WSL Shortcut Creator")
+    
+    # Set application icon
+    icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources', 'images', 'Logo.ico')
+    if os.path.exists(icon_path):
+        app.setWindowIcon(QIcon(icon_path))
+    else:
+        logger.warning("Application icon not found at %s", icon_path)
+    
+    # Watch the event loop before the window exists so slow startup work is caught too
+    watchdog = None
+    if args.stalls:
+        watchdog = EventLoopWatchdog(args.stall_threshold, args.stall_log)
+        watchdog.start()
+    
     try:
-        # Create Qt application
-        app = QApplication(sys.argv)
-        app.setApplicationName("WSL Shortcut Creator")
-        
-        # Set application icon
-        icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources', 'images', 'Logo.ico')
-        if os.path.exists(icon_path):
-            app.setWindowIcon(QIcon(icon_path))
-        else:
-            logger.warning(f"Application icon not found at {icon_path}")
-        
         # Create and show main window
         window = MainWindow()
         window.show()
@@ -72,10 +92,28 @@ def main():
         return_code = app.exec_()
         logger.info("Application exiting normally")
         return return_code
+    finally:
+        if watchdog is not None:
+            watchdog.stop()
+
+def main():
+    """Main entry point for the application."""
+    args, qt_args = parse_args(sys.argv[1:])
+    setup_logging(logging.DEBUG if args.debug else logging.INFO, args.log_file)
+    
+    try:
+        if has_query(args):
+            return run_query(args)
+        settings.set('index_db', args.index)
+        if args.profile:
+            return run_profiled(lambda: run_gui(args, qt_args), args.profile)
+        return run_gui(args, qt_args)
         
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         return 1
+    finally:
+        shutdown_logging()
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,137 @@
+"""Command line interface for WSL Shortcut Creator.
+
+Without options the GUI is started.  Query options answer questions from
+the sidecar index or the UI stall reports and print the result instead of
+opening a window.
+"""
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import argparse
+import cProfile
+import datetime
+import os
+import pstats
+import sqlite3
+import sys
+
+from .config import settings
+from .core.index_db import ShortcutIndex, default_index_path
+from .core.stalls import default_stall_log_path, read_stall_reports, summarize_stalls
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``wsl-shortcuts`` command."""
+    parser = argparse.ArgumentParser(
+        prog='wsl-shortcuts',
+        description="Manage Windows shortcuts for WSL GUI applications."
+    )
+    index_path = settings.get('index_db') or default_index_path()
+    parser.add_argument('--distro', help="limit queries to one WSL distribution")
+    parser.add_argument('--debug', action='store_true', help="log debug messages")
+    parser.add_argument('--log-file', help="also write the log to this file")
+    parser.add_argument('--index', help="path of the index database (default: %(default)s)",
+                        default=index_path)
+    parser.add_argument('--profile', metavar='FILE',
+                        help="profile the whole session, save the statistics to FILE and print a summary")
+    parser.add_argument('--stalls', action='store_true',
+                        help="record UI stalls with a stack sample of the GUI thread")
+    parser.add_argument('--stall-threshold', metavar='MS', type=float, default=settings.get('stall_threshold_ms'),
+                        help="with --stalls, record stalls longer than MS milliseconds (default: %(default)s)")
+    parser.add_argument('--stall-log', default=settings.get('stall_log'),
+                        help="file receiving UI stall reports (default: stalls.jsonl next to the index)")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument('--apps-with-shortcuts', action='store_true',
+                       help="list scanned applications that already have a shortcut")
+    query.add_argument('--icons-in-use', action='store_true',
+                       help="list icon files used by applications and shortcuts")
+    query.add_argument('--changes', action='store_true',
+                       help="list what changed in the last scan and since then")
+    query.add_argument('--stall-report', action='store_true',
+                       help="summarize the recorded UI stalls by code location")
+    return parser
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> Tuple[argparse.Namespace, List[str]]:
+    """Parse known options; remaining arguments are left for Qt."""
+    args, remaining = build_parser().parse_known_args(argv)
+    if not args.stall_log:
+        # Keep the stall reports with the index the session actually uses
+        args.stall_log = default_stall_log_path(os.path.dirname(os.path.abspath(args.index)))
+    return args, remaining
+
+
+def has_query(args: argparse.Namespace) -> bool:
+    """Return whether the arguments request an index query instead of the GUI."""
+    return bool(args.apps_with_shortcuts or args.icons_in_use or args.changes or args.stall_report)
+
+
+def run_query(args: argparse.Namespace) -> int:
+    """
+    Answer an index query and print the result.
+
+    Returns:
+        The process exit code
+    """
+    if args.stall_report:
+        return print_stall_summary(args.stall_log)
+    try:
+        index = ShortcutIndex(args.index)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Cannot open index {args.index}: {e}")
+        return 1
+    try:
+        distros = [args.distro] if args.distro else index.distro_names()
+        if args.icons_in_use:
+            for ref, digest in index.icons_in_use():
+                print(f"{digest}  {ref}")
+        elif args.apps_with_shortcuts:
+            for distro in distros:
+                for path in sorted(index.apps_with_shortcuts(distro)):
+                    print(f"{distro}\t{path}")
+        elif args.changes:
+            for distro in distros:
+                for change in index.last_scan_changes(distro):
+                    when = datetime.datetime.fromtimestamp(change['at']).strftime('%Y-%m-%d %H:%M:%S')
+                    print(f"{when}\t{distro}\t{change['kind']}\t{change['action']}\t{change['key']}")
+        return 0
+    finally:
+        index.close()
+
+
+def print_stall_summary(path: str) -> int:
+    """
+    Print the recorded UI stalls grouped by the code location that blocked.
+
+    Returns:
+        The process exit code
+    """
+    reports = read_stall_reports(path)
+    if not reports:
+        print(f"No UI stalls recorded in {path}")
+        return 0
+    first = datetime.datetime.fromtimestamp(min(report['at'] for report in reports))
+    print(f"{len(reports)} UI stall{'s' if len(reports) != 1 else ''} since {first:%Y-%m-%d %H:%M:%S}")
+    print(f"{'count':>6} {'total ms':>10} {'max ms':>9}  location")
+    for group in summarize_stalls(reports):
+        print(f"{group['count']:>6} {group['total_ms']:>10.0f} {group['max_ms']:>9.0f}  {group['location']}")
+    return 0
+
+
+def run_profiled(func: Callable[[], int], path: str, limit: int = 30) -> int:
+    """
+    Run a function under cProfile and save the statistics for ``pstats``.
+
+    The most expensive functions by cumulative time are printed when a
+    console is available.
+
+    Returns:
+        The function's result
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        profiler.dump_stats(path)
+        if sys.stdout is not None:
+            print(f"Profile saved to {path}")
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(limit)
@@ -1,4 +1,5 @@
 """Configuration package initialization."""
 from .settings import settings
+from .logging_config import dump_ring_buffer, log_event, ring_buffer, setup_logging, shutdown_logging
 
-__all__ = ['settings']
+__all__ = ['settings', 'dump_ring_buffer', 'log_event', 'ring_buffer', 'setup_logging', 'shutdown_logging']
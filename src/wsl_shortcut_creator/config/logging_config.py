@@ -0,0 +1,195 @@
+"""Logging setup for WSL Shortcut Creator.
+
+Log records are written through a QueueHandler so that the full log line
+is formatted and written on a background listener thread instead of the
+GUI thread.  Only the message itself (and the text of any traceback) is
+rendered on the logging thread when the record is queued, so the record no
+longer references its arguments.  The listener also keeps the most recent
+lines in a bounded in-memory ring buffer that can be saved for bug reports.
+
+Messages use deferred ``%``-style formatting; structured events attach
+key/value fields that are only rendered when a record is actually emitted::
+
+    log_event(logger, logging.INFO, 'scan_finished', apps=12, skipped=3)
+"""
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Deque, List, Optional, TextIO
+
+import logging
+import queue
+import sys
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+RING_BUFFER_SIZE = 2000
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formatter appending the ``fields`` of structured events as key=value pairs.
+
+    The line is remembered on the record, so handlers sharing one formatter
+    format each record only once.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        cached = record.__dict__.get('_formatted')
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        message = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            message += ' ' + ' '.join(f'{key}={value!r}' for key, value in fields.items())
+        record.__dict__['_formatted'] = (self, message)
+        return message
+
+
+class MessageQueueHandler(QueueHandler):
+    """
+    QueueHandler rendering only the message on the calling thread.
+
+    ``QueueHandler.prepare`` copies the record and runs a formatter over it;
+    this handler renders the message and traceback text in place, which is
+    safe because it is the only handler on the root logger, and leaves the
+    rest of the line to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keep the last capacity records in memory for diagnostics.
+
+    Records are formatted when they are emitted and only the resulting line
+    is kept, so the buffer never holds on to message arguments, tracebacks
+    or the objects they reference.  setup_logging attaches it to the queue
+    listener, so that formatting runs on the listener thread.
+    """
+
+    def __init__(self, capacity: int = RING_BUFFER_SIZE) -> None:
+        super().__init__()
+        self.buffer: Deque[str] = deque(maxlen=capacity)
+        self.setFormatter(StructuredFormatter(LOG_FORMAT))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self.buffer.append(line)
+
+    def lines(self) -> List[str]:
+        """Return the buffered lines, oldest first."""
+        self.acquire()
+        try:
+            return list(self.buffer)
+        finally:
+            self.release()
+
+    def dump(self, stream: TextIO) -> int:
+        """Write the buffered records to a stream; returns the number written."""
+        lines = self.lines()
+        for line in lines:
+            stream.write(line + '\n')
+        return len(lines)
+
+
+class _LoggingState:
+    """Handlers installed by setup_logging."""
+    listener: Optional[QueueListener] = None
+    queue_handler: Optional[QueueHandler] = None
+    ring_buffer: Optional[RingBufferHandler] = None
+
+
+_state = _LoggingState()
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """
+    Log a structured event with key/value fields.
+
+    Nothing is formatted when the level is disabled.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={'fields': fields})
+
+
+def setup_logging(level: int = logging.INFO, log_file: Optional[str] = None,
+                  ring_size: int = RING_BUFFER_SIZE, stream: Optional[TextIO] = None) -> RingBufferHandler:
+    """
+    Configure the root logger.
+
+    Calling it again replaces the handlers installed by a previous call.
+
+    Args:
+        level: Minimum level for all handlers
+        log_file: Optional file receiving the log, rotated at 1 MB
+        ring_size: Number of records kept in memory
+        stream: Console stream; defaults to stderr
+
+    Returns:
+        The ring buffer handler
+    """
+    shutdown_logging()
+    formatter = StructuredFormatter(LOG_FORMAT)
+    
+    handlers: List[logging.Handler] = [logging.StreamHandler(stream or sys.stderr)]
+    if log_file:
+        handlers.append(RotatingFileHandler(log_file, maxBytes=1024 * 1024, backupCount=2, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # The ring buffer is fed by the listener so its lines are formatted off the calling thread
+    _state.ring_buffer = RingBufferHandler(ring_size)
+    _state.ring_buffer.setFormatter(formatter)
+    handlers.append(_state.ring_buffer)
+    
+    log_queue: queue.Queue = queue.Queue(-1)
+    _state.queue_handler = MessageQueueHandler(log_queue)
+    _state.listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_state.queue_handler)
+    _state.listener.start()
+    return _state.ring_buffer
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and remove the handlers installed by setup_logging."""
+    root = logging.getLogger()
+    if _state.listener is not None:
+        _state.listener.stop()
+        for handler in _state.listener.handlers:
+            handler.close()
+    if _state.queue_handler is not None:
+        root.removeHandler(_state.queue_handler)
+    _state.listener = _state.queue_handler = None
+
+
+def ring_buffer() -> Optional[RingBufferHandler]:
+    """Return the in-memory ring buffer, if logging has been set up."""
+    return _state.ring_buffer
+
+
+def dump_ring_buffer(path: str) -> int:
+    """
+    Save the in-memory log for a bug report.
+
+    Returns:
+        Number of records written
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        return _state.ring_buffer.dump(f) if _state.ring_buffer else 0
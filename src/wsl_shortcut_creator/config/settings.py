@@ -9,7 +9,26 @@ class Settings:
         self._config: Dict[str, Any] = {
             'app_name': 'WSL Shortcut Creator',
             'shortcuts_dir': os.path.expandvars('%AppData%\\Microsoft\\Windows\\Start Menu\\Programs'),
-            'resources_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources')
+            'common_shortcuts_dir': os.path.expandvars('%ProgramData%\\Microsoft\\Windows\\Start Menu\\Programs'),
+            'desktop_dir': os.path.join(os.path.expanduser('~'), 'Desktop'),
+            # Folders new shortcuts are deployed to: 'start_menu', 'common_start_menu', 'desktop';
+            # 'start_menu' is shown in the shortcuts list and always included
+            'deploy_roots': ['start_menu'],
+            'resources_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources'),
+            # Extra applications directories inside WSL scanned after the standard ones
+            'custom_app_dirs': [],
+            # Reuse one warm shell per distribution instead of starting wsl.exe per command
+            'use_wsl_sessions': True,
+            # Seconds a WSL command may run before it is abandoned (and its session shell closed)
+            'wsl_timeout': 60,
+            # Shortcut writer backend: 'wsh', 'worker' or 'native'
+            'shortcut_writer': 'wsh',
+            # SQLite index of scanned applications and created shortcuts; None for the default location
+            'index_db': None,
+            # Event-loop delay in milliseconds recorded as a UI stall when started with --stalls
+            'stall_threshold_ms': 250,
+            # JSON-lines file receiving UI stall reports; None for the default location
+            'stall_log': None
         }
     
     def get(self, key: str) -> Any:
@@ -0,0 +1,95 @@
+"""Core (non-GUI) logic for discovering WSL applications and managing shortcuts."""
+from .desktop_entries import (
+    DesktopFileIndex,
+    ScanStats,
+    desktop_file_id,
+    new_scan_stats,
+    parse_desktop_fields,
+    parse_find_listing,
+)
+from .wsl import BashRunner, distro_runner, run_in_distro, run_wsl_bash
+from .deploy import DeployResult, DeployRoot, ShortcutDeployer, deploy_roots, remove_copies
+from .distros import (
+    DistroInfo, boot_distro, find_distro, is_running, list_distros, parse_distro_list
+)
+from .wsl_session import SessionError, SessionPool, WslSession, session_pool
+from .health import ShortcutHealth, check_shortcuts, prune_broken
+from .index_db import ChangeRecord, ShortcutEntry, ShortcutIndex, default_index_path
+from .icons import fetch_icon_bytes, icon_cache_key
+from .lnk import (
+    ShortcutFormatError, ShortcutInfo, build_shortcut, parse_shortcut, read_shortcut, write_shortcut
+)
+from .stalls import StallMonitor, StallReport, read_stall_reports, summarize_stalls
+from .sources import (
+    AppRecord,
+    ApplicationScanner,
+    ScanSource,
+    SourceRegistry,
+    discover_registry,
+)
+from .shortcut_writer import (
+    WRITER_BACKENDS,
+    ShortcutSpec,
+    ShortcutWriter,
+    WriteResult,
+    create_writer,
+    make_wsl_shortcut_spec,
+)
+
+__all__ = [
+    'DesktopFileIndex',
+    'ScanStats',
+    'desktop_file_id',
+    'new_scan_stats',
+    'parse_desktop_fields',
+    'parse_find_listing',
+    'BashRunner',
+    'distro_runner',
+    'run_in_distro',
+    'run_wsl_bash',
+    'DeployResult',
+    'DeployRoot',
+    'ShortcutDeployer',
+    'deploy_roots',
+    'remove_copies',
+    'DistroInfo',
+    'boot_distro',
+    'find_distro',
+    'is_running',
+    'list_distros',
+    'parse_distro_list',
+    'SessionError',
+    'SessionPool',
+    'WslSession',
+    'session_pool',
+    'ShortcutHealth',
+    'check_shortcuts',
+    'prune_broken',
+    'ChangeRecord',
+    'ShortcutEntry',
+    'ShortcutIndex',
+    'default_index_path',
+    'fetch_icon_bytes',
+    'icon_cache_key',
+    'ShortcutFormatError',
+    'ShortcutInfo',
+    'build_shortcut',
+    'parse_shortcut',
+    'read_shortcut',
+    'write_shortcut',
+    'StallMonitor',
+    'StallReport',
+    'read_stall_reports',
+    'summarize_stalls',
+    'AppRecord',
+    'ApplicationScanner',
+    'ScanSource',
+    'SourceRegistry',
+    'discover_registry',
+    'WRITER_BACKENDS',
+    'ShortcutSpec',
+    'ShortcutWriter',
+    'WriteResult',
+    'create_writer',
+    'make_wsl_shortcut_spec',
+]
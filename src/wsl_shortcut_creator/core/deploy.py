@@ -0,0 +1,228 @@
+"""Deployment of shortcuts to several folders at once.
+
+A batch of shortcuts is written once, by any writer backend, into a private
+staging directory and read back once.  The contents are then written to
+every configured root in parallel, one thread per root.  Each copy goes to a temporary file
+in the destination folder and is moved over the final name with
+``os.replace``, so an interrupted run never leaves a partial ``.lnk``
+behind.  Deploying to several roots therefore costs one shortcut write per
+item plus a cheap file copy per root.
+
+Roots such as the Desktop are shared with other programs, so an existing
+file is only replaced when it is a WSL shortcut for the same distribution;
+any other file with the same name is reported as a failure for that root.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Sequence, TypedDict
+
+import filecmp
+import logging
+import os
+import shutil
+import tempfile
+
+from ..config import settings
+from .health import parse_launch_target
+from .lnk import ShortcutFormatError, read_shortcut
+from .shortcut_writer import ShortcutSpec, ShortcutWriter, WriteResult
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+# Root name -> (setting holding the folder, whether shortcuts go into a per-distribution subfolder)
+DEPLOY_ROOTS = {
+    'start_menu': ('shortcuts_dir', True),
+    'common_start_menu': ('common_shortcuts_dir', True),
+    'desktop': ('desktop_dir', False),
+}
+# Root shown in the Existing Shortcuts list; shortcuts are always deployed there
+LISTED_ROOT = 'start_menu'
+
+
+class DeployRoot(TypedDict):
+    """Type definition for one folder shortcuts are deployed to"""
+    name: str
+    directory: str
+
+
+class DeployResult(TypedDict):
+    """Type definition for the outcome of deploying one shortcut to one root"""
+    item: int
+    root: str
+    path: str
+    ok: bool
+    error: Optional[str]
+
+
+def deploy_roots(folder_name: str, names: Optional[Iterable[str]] = None) -> List[DeployRoot]:
+    """
+    Resolve the folders a distribution's shortcuts are deployed to.
+
+    Args:
+        folder_name: Name of the distribution folder used in Start Menu roots
+        names: Root names; defaults to the ``deploy_roots`` setting
+
+    Returns:
+        The roots in the given order, preceded by LISTED_ROOT if it is not among them
+
+    Raises:
+        ValueError: If a root name is unknown
+    """
+    names = list(names if names is not None else settings.get('deploy_roots'))
+    if LISTED_ROOT not in names:
+        names.insert(0, LISTED_ROOT)
+    roots: List[DeployRoot] = []
+    for name in names:
+        try:
+            setting, per_distro = DEPLOY_ROOTS[name]
+        except KeyError:
+            raise ValueError(f"Unknown shortcut root: {name}") from None
+        directory = settings.get(setting)
+        roots.append({'name': name, 'directory': os.path.join(directory, folder_name) if per_distro else directory})
+    return roots
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Replace a file atomically by writing a temporary file next to it and renaming it."""
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            # The data must be on disk before the rename makes it visible
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def is_replaceable(path: str, data: bytes, distro_name: Optional[str]) -> bool:
+    """
+    Return whether a shortcut may be written to path.
+
+    The file may be replaced when it does not exist, has the same content or
+    is a ``wslg.exe`` shortcut launching in the same distribution, i.e. a
+    copy deployed earlier.  Anything else belongs to the user.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return True
+        info = read_shortcut(path)
+    except FileNotFoundError:
+        return True
+    except (OSError, ShortcutFormatError):
+        return False
+    target = os.path.basename((info['target'] or '').replace('\\', '/')).lower()
+    return target == 'wslg.exe' and parse_launch_target(info['arguments'])[0] == distro_name
+
+
+class ShortcutDeployer:
+    """Write a batch of shortcuts once and fan it out to several roots."""
+
+    def __init__(self, writer: ShortcutWriter, roots: Sequence[DeployRoot]) -> None:
+        """
+        Args:
+            writer: Backend writing the staged shortcuts
+            roots: Folders receiving every shortcut
+        """
+        self.writer = writer
+        self.roots = list(roots)
+
+    def deploy(self, specs: Sequence[ShortcutSpec]) -> List[DeployResult]:
+        """
+        Deploy shortcuts to all roots.
+
+        Only the file name of each spec's path is used; the folder comes from
+        the root.
+
+        Returns:
+            One result per spec and root, ordered by spec and then by root
+        """
+        staging = tempfile.mkdtemp(prefix='wslsc-deploy-')
+        try:
+            # Write every shortcut once, under a neutral name in the staging directory
+            staged: List[ShortcutSpec] = [
+                {**spec, 'path': os.path.join(staging, f'{item}.lnk')} for item, spec in enumerate(specs)
+            ]
+            written = self.writer.write_batch(staged)
+            contents = [self._read_staged(spec['path'], result) for spec, result in zip(staged, written)]
+            names = [os.path.basename(spec['path']) for spec in specs]
+            distros = [parse_launch_target(spec['arguments'])[0] for spec in specs]
+            with ThreadPoolExecutor(max_workers=max(len(self.roots), 1)) as pool:
+                per_root = list(pool.map(
+                    lambda root: self._copy_to_root(root, contents, written, names, distros), self.roots
+                ))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return [per_root[r][item] for item in range(len(specs)) for r in range(len(self.roots))]
+
+    @staticmethod
+    def _read_staged(path: str, result: WriteResult) -> Optional[bytes]:
+        if not result['ok']:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            result['ok'] = False
+            result['error'] = str(e)
+            return None
+
+    @staticmethod
+    def _copy_to_root(root: DeployRoot, contents: List[Optional[bytes]], written: List[WriteResult],
+                      names: List[str], distros: List[Optional[str]]) -> List[DeployResult]:
+        results: List[DeployResult] = []
+        try:
+            os.makedirs(root['directory'], exist_ok=True)
+            folder_error = None
+        except OSError as e:
+            folder_error = str(e)
+        for item, (data, result) in enumerate(zip(contents, written)):
+            path = os.path.join(root['directory'], names[item])
+            error: Optional[str] = folder_error
+            if data is None:
+                error = result['error'] or "Shortcut was not written"
+            elif error is None:
+                try:
+                    if is_replaceable(path, data, distros[item]):
+                        write_atomic(path, data)
+                    else:
+                        error = f"A different shortcut named {names[item]} already exists"
+                except OSError as e:
+                    error = str(e)
+            if error is not None:
+                logger.debug("Could not deploy %s: %s", path, error)
+            results.append({'item': item, 'root': root['name'], 'path': path, 'ok': error is None, 'error': error})
+        return results
+
+
+def remove_copies(path: str, roots: Sequence[DeployRoot]) -> List[str]:
+    """
+    Remove the copies of a deployed shortcut from the other roots.
+
+    A file in another root is only removed when its content is identical,
+    so unrelated shortcuts with the same name are left alone.  Call this
+    before removing the shortcut at path itself.
+
+    Returns:
+        The paths removed
+    """
+    removed = []
+    name = os.path.basename(path)
+    for root in roots:
+        copy = os.path.join(root['directory'], name)
+        if os.path.normcase(os.path.abspath(copy)) == os.path.normcase(os.path.abspath(path)):
+            continue
+        try:
+            if os.path.isfile(copy) and filecmp.cmp(path, copy, shallow=False):
+                os.remove(copy)
+                removed.append(copy)
+        except OSError as e:
+            logger.warning("Could not remove %s: %s", copy, e)
+    return removed
@@ -0,0 +1,141 @@
+"""Desktop-file discovery and XDG precedence handling.
+
+Applications are identified by their desktop-file ID as defined by the XDG
+Desktop Entry specification: the path of the ``.desktop`` file relative to
+its ``applications`` directory, with ``/`` replaced by ``-``.  When the same
+ID exists in several directories only the one from the directory with the
+highest precedence is used, which is how user overrides in
+``~/.local/share/applications`` hide the system-wide entry.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypedDict
+
+import logging
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+
+class ScanStats(TypedDict):
+    """Type definition for application scan statistics"""
+    sources: int
+    sources_skipped: int
+    sources_failed: int
+    files_listed: int
+    duplicates_skipped: int
+    entries_parsed: int
+    apps_found: int
+
+
+def new_scan_stats() -> ScanStats:
+    """Return a zeroed statistics record for a new scan."""
+    return {
+        'sources': 0,
+        'sources_skipped': 0,
+        'sources_failed': 0,
+        'files_listed': 0,
+        'duplicates_skipped': 0,
+        'entries_parsed': 0,
+        'apps_found': 0,
+    }
+
+
+def desktop_file_id(relative_path: str) -> str:
+    """
+    Compute the desktop-file ID for a path relative to an applications directory.
+
+    Args:
+        relative_path: Path below the ``applications`` directory, e.g. ``kde/konsole.desktop``
+
+    Returns:
+        The desktop-file ID, e.g. ``kde-konsole.desktop``
+    """
+    return relative_path.strip('/').replace('/', '-')
+
+
+class DesktopFileIndex:
+    """
+    Hash index of desktop files keyed by desktop-file ID.
+
+    Sources must be added in precedence order (highest first).  The first
+    file seen for an ID wins; later files with the same ID are shadowed and
+    are counted but never stored, so their contents are never fetched.
+    """
+
+    def __init__(self, stats: Optional[ScanStats] = None) -> None:
+        self.stats: ScanStats = stats if stats is not None else new_scan_stats()
+        self._entries: Dict[str, str] = {}
+
+    def add_source(self, listing: Iterable[Tuple[str, str]]) -> int:
+        """
+        Merge the listing of one applications directory into the index.
+
+        Args:
+            listing: ``(full_path, relative_path)`` pairs for every desktop file found
+
+        Returns:
+            Number of new (non-shadowed) entries added from this source
+        """
+        self.stats['sources'] += 1
+        added = 0
+        for full_path, relative_path in listing:
+            self.stats['files_listed'] += 1
+            file_id = desktop_file_id(relative_path)
+            if file_id in self._entries:
+                self.stats['duplicates_skipped'] += 1
+                logger.debug("Skipping shadowed desktop file %s (%s)", full_path, file_id)
+                continue
+            self._entries[file_id] = full_path
+            added += 1
+        return added
+
+    def __contains__(self, file_id: object) -> bool:
+        return file_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """Iterate over ``(desktop_file_id, full_path)`` pairs in discovery order."""
+        return iter(self._entries.items())
+
+    def path_for(self, file_id: str) -> Optional[str]:
+        """Return the winning path for a desktop-file ID, if any."""
+        return self._entries.get(file_id)
+
+
+def parse_find_listing(output: str) -> List[Tuple[str, str]]:
+    """
+    Parse ``find -printf '%p\\t%P\\n'`` output into ``(full_path, relative_path)`` pairs.
+
+    Args:
+        output: Raw stdout of the listing command
+
+    Returns:
+        List of path pairs, skipping blank or malformed lines
+    """
+    pairs = []
+    for line in output.splitlines():
+        full_path, sep, relative_path = line.partition('\t')
+        if not sep or not full_path or not relative_path:
+            continue
+        pairs.append((full_path, relative_path))
+    return pairs
+
+
+def parse_desktop_fields(output: str, keys: Tuple[str, ...] = ('Name', 'Icon')) -> Dict[str, str]:
+    """
+    Extract the first value of each requested key from desktop-file lines.
+
+    Args:
+        output: Desktop-file lines, e.g. the output of ``grep -E '^(Name|Icon)='``
+        keys: Keys to extract
+
+    Returns:
+        Mapping of key to its first value; missing keys are omitted
+    """
+    fields: Dict[str, str] = {}
+    for line in output.splitlines():
+        key, sep, value = line.partition('=')
+        if sep and key in keys and key not in fields:
+            fields[key] = value.strip()
+    return fields
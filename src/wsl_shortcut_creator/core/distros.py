@@ -0,0 +1,116 @@
+"""Installed WSL distributions and their run state.
+
+``wsl.exe -l -v`` lists every distribution with its state and WSL version
+without starting any of them, while any command run inside a distribution
+(``wsl -d <name> -- ...``) boots its VM first.  The window uses the state
+reported here to decide whether a distribution may be scanned or must be
+served from the last recorded scan.
+"""
+from typing import List, Optional, TypedDict
+
+import logging
+import subprocess
+
+from .wsl import run_in_distro
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+STATE_RUNNING = 'Running'
+STATE_STOPPED = 'Stopped'
+
+
+class DistroInfo(TypedDict):
+    """Type definition for one row of ``wsl -l -v``"""
+    name: str
+    state: str
+    version: int
+    default: bool
+
+
+def decode_wsl_output(data: bytes) -> str:
+    """Decode ``wsl.exe`` output, which is UTF-16LE unless ``WSL_UTF8`` is set."""
+    if data.startswith(b'\xff\xfe') or b'\x00' in data[:64]:
+        text = data.decode('utf-16-le', errors='replace')
+    else:
+        text = data.decode('utf-8', errors='replace')
+    return text.lstrip('\ufeff').replace('\x00', '')
+
+
+def parse_distro_list(output: str) -> List[DistroInfo]:
+    """
+    Parse the table printed by ``wsl -l -v``.
+
+    The header is localized, so it is skipped by position; rows that do not
+    end in a version number are ignored.
+
+    Args:
+        output: Decoded command output
+
+    Returns:
+        The distributions in the listed order
+    """
+    distros: List[DistroInfo] = []
+    lines = [line for line in output.splitlines() if line.strip()]
+    for line in lines[1:]:
+        stripped = line.strip()
+        default = stripped.startswith('*')
+        parts = stripped.lstrip('*').split()
+        if len(parts) < 3 or not parts[-1].isdigit():
+            continue
+        distros.append({
+            'name': parts[0],
+            'state': ' '.join(parts[1:-1]),
+            'version': int(parts[-1]),
+            'default': default,
+        })
+    return distros
+
+
+def list_distros(timeout: Optional[float] = 10) -> List[DistroInfo]:
+    """
+    List installed distributions without starting any of them.
+
+    Returns:
+        The distributions, or an empty list when none are installed
+
+    Raises:
+        OSError: If ``wsl.exe`` cannot be started
+        subprocess.TimeoutExpired: If it does not answer in time
+    """
+    result = subprocess.run(['wsl.exe', '-l', '-v'], capture_output=True, timeout=timeout)
+    output = decode_wsl_output(result.stdout)
+    logger.debug("WSL list output:\n%s", output)
+    if result.returncode != 0:
+        logger.warning("wsl -l -v exited with %d: %s", result.returncode, output.strip())
+        return []
+    return parse_distro_list(output)
+
+
+def find_distro(distros: List[DistroInfo], name: Optional[str] = None) -> Optional[DistroInfo]:
+    """Return the distribution with the given name, or the default one when name is None."""
+    for distro in distros:
+        if (distro['name'] == name) if name else distro['default']:
+            return distro
+    return None
+
+
+def is_running(distro: DistroInfo) -> bool:
+    """Return whether the distribution's VM is up, so commands will not boot it."""
+    return distro['state'] == STATE_RUNNING
+
+
+def boot_distro(name: str, timeout: Optional[float] = 120) -> None:
+    """
+    Start a distribution by running a no-op command in it.
+
+    With WSL sessions enabled this also leaves its warm shell running for the
+    commands that follow.
+
+    Raises:
+        RuntimeError: If the distribution did not start
+    """
+    logger.info("Starting WSL distribution %s", name)
+    result = run_in_distro('true', name, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"Could not start {name}: {(result.stderr or '').strip()}")
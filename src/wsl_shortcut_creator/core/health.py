@@ -0,0 +1,221 @@
+"""Health checks for existing shortcuts.
+
+Every shortcut in a distribution folder is parsed to find what it launches:
+the desktop file passed through ``BAMF_DESKTOP_FILE_HINT`` or, for custom
+applications, the command.  All distinct targets are then checked for
+existence with a single WSL call, so checking a thousand shortcuts costs one
+process start rather than a thousand.
+
+Targets the shell would expand (``$VAR``, globs, ``~user``) or resolve
+against a working directory cannot be checked reliably; they are reported
+as unknown and never pruned.  A leading ``~`` or ``~/`` is expanded to
+``$HOME`` inside WSL like the shell does.
+"""
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+import logging
+import os
+import shlex
+
+from .lnk import ShortcutFormatError, read_shortcut
+from .shortcuts import iter_shortcut_names
+from .wsl import BashRunner
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+STATUS_OK = 'ok'
+STATUS_BROKEN = 'broken'
+STATUS_UNKNOWN = 'unknown'
+
+# Target kinds: a file that must exist, a command that must resolve on $PATH,
+# or a target that cannot be checked without running a shell
+KIND_FILE = 'f'
+KIND_COMMAND = 'c'
+KIND_UNKNOWN = 'u'
+
+# Characters that make the shell expand or reinterpret a word
+SHELL_EXPANSION_CHARS = frozenset('$`*?[]{}\\\'"<>|;&()!')
+
+# Reads "kind<TAB>value" lines from stdin and prints 1 or 0 for each; a
+# leading ~ is expanded to $HOME first
+CHECK_TARGETS_COMMAND = (
+    'while IFS=$\'\\t\' read -r kind value; do '
+    'case "$value" in "~"|"~/"*) value="$HOME${value#\\~}";; esac; '
+    'if [ "$kind" = f ]; then [ -e "$value" ] && echo 1 || echo 0; '
+    'else command -v -- "$value" >/dev/null 2>&1 && echo 1 || echo 0; fi; '
+    'done'
+)
+
+
+class ShortcutHealth(TypedDict):
+    """Type definition for the health of one shortcut"""
+    name: str
+    path: str
+    status: str
+    target: Optional[str]
+    reason: Optional[str]
+    arguments: str
+    icon_location: Optional[str]
+
+
+def classify_target(value: str, kind: str = KIND_COMMAND) -> Tuple[str, str]:
+    """
+    Decide how a launch target can be checked.
+
+    Args:
+        value: Desktop file path or executable as the shell would receive it
+        kind: Kind to use for plain names; paths are always files
+
+    Returns:
+        A ``(kind, value)`` target; the kind is KIND_UNKNOWN when the shell would
+        expand the value or it is relative to the working directory
+    """
+    if not value or any(char in SHELL_EXPANSION_CHARS for char in value):
+        return KIND_UNKNOWN, value
+    if value == '~' or value.startswith(('/', '~/')):
+        return KIND_FILE, value
+    if value.startswith('~') or '/' in value or kind == KIND_FILE:
+        return KIND_UNKNOWN, value
+    return KIND_COMMAND, value
+
+
+def parse_launch_target(arguments: str) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+    """
+    Extract the distribution and launch target from wslg.exe shortcut arguments.
+
+    Args:
+        arguments: Shortcut arguments, e.g. ``-d Ubuntu --cd "~" -- env BAMF_DESKTOP_FILE_HINT=/x.desktop x``
+
+    Returns:
+        The distribution name (or None) and a ``(kind, value)`` target, or None
+        if the arguments do not describe a WSL launch.  Desktop-file hints that
+        do not end in ``.desktop`` (unquoted paths with spaces are split by the
+        shell) are of kind KIND_UNKNOWN.
+    """
+    try:
+        tokens = shlex.split(arguments)
+    except ValueError:
+        return None, None
+    distro = None
+    if '-d' in tokens:
+        position = tokens.index('-d')
+        if position + 1 < len(tokens):
+            distro = tokens[position + 1]
+    if '--' not in tokens:
+        return distro, None
+    command = tokens[tokens.index('--') + 1:]
+    if command and command[0] == 'env':
+        command = command[1:]
+        while command and '=' in command[0] and not command[0].startswith('/'):
+            name, _, value = command.pop(0).partition('=')
+            if name == 'BAMF_DESKTOP_FILE_HINT' and value:
+                if not value.endswith('.desktop'):
+                    return distro, (KIND_UNKNOWN, value)
+                return distro, classify_target(value, KIND_FILE)
+    if not command:
+        return distro, None
+    return distro, classify_target(command[0])
+
+
+def check_targets(targets: List[Tuple[str, str]], runner: BashRunner) -> Dict[Tuple[str, str], bool]:
+    """
+    Check a list of distinct targets for existence in one WSL call.
+
+    Returns:
+        Mapping of target to whether it exists; empty if the check did not
+        answer every target, so nothing is reported broken by mistake
+    """
+    if not targets:
+        return {}
+    request = ''.join(f'{kind}\t{value}\n' for kind, value in targets)
+    result = runner(CHECK_TARGETS_COMMAND, input=request)
+    answers = result.stdout.split()
+    if result.returncode != 0 or len(answers) != len(targets) or not set(answers) <= {'0', '1'}:
+        logger.warning("Shortcut target check failed (exit code %s, %d of %d answers)",
+                       result.returncode, len(answers), len(targets))
+        return {}
+    return {target: answer == '1' for target, answer in zip(targets, answers)}
+
+
+def check_shortcuts(directory: str, runner: BashRunner, distro_name: Optional[str] = None,
+                    prune: bool = False) -> List[ShortcutHealth]:
+    """
+    Check every shortcut in a folder and optionally delete the broken ones.
+
+    Shortcuts that cannot be parsed, do not launch a WSL application or
+    belong to another distribution are reported as unknown and never pruned.
+
+    Args:
+        directory: Start Menu folder with the shortcuts
+        runner: Runs the batched existence check inside the distribution
+        distro_name: Distribution the runner executes in
+        prune: Delete shortcuts whose target no longer exists
+
+    Returns:
+        One health record per shortcut
+    """
+    reports: List[ShortcutHealth] = []
+    pending: Dict[Tuple[str, str], List[ShortcutHealth]] = {}
+    for name in iter_shortcut_names(directory):
+        path = os.path.join(directory, name)
+        report: ShortcutHealth = {'name': name, 'path': path, 'status': STATUS_UNKNOWN,
+                                  'target': None, 'reason': None, 'arguments': '', 'icon_location': None}
+        reports.append(report)
+        try:
+            info = read_shortcut(path)
+        except (OSError, ShortcutFormatError) as e:
+            report['reason'] = f"Unreadable shortcut: {e}"
+            continue
+        report['arguments'] = info['arguments']
+        report['icon_location'] = info['icon_location']
+        distro, target = parse_launch_target(info['arguments'])
+        if target is None:
+            report['reason'] = "Not a WSL application shortcut"
+        elif distro_name and distro and distro != distro_name:
+            report['reason'] = f"Shortcut for distribution {distro}"
+        elif target[0] == KIND_UNKNOWN:
+            report['target'] = target[1]
+            report['reason'] = "Target is expanded by the shell and cannot be checked"
+        else:
+            report['target'] = target[1]
+            pending.setdefault(target, []).append(report)
+
+    found = check_targets(list(pending), runner)
+    for target, target_reports in pending.items():
+        exists = found.get(target)
+        for report in target_reports:
+            if exists is None:
+                report['reason'] = "Target could not be checked"
+            elif exists:
+                report['status'] = STATUS_OK
+            else:
+                report['status'] = STATUS_BROKEN
+                report['reason'] = (
+                    "Desktop file not found" if target[0] == KIND_FILE else "Command not found"
+                )
+
+    if prune:
+        prune_broken(reports)
+    return reports
+
+
+def prune_broken(reports: List[ShortcutHealth]) -> int:
+    """
+    Delete the shortcuts reported as broken.
+
+    Shortcuts with any other status, including unknown, are never touched.
+
+    Returns:
+        Number of shortcut files removed
+    """
+    removed = 0
+    for report in reports:
+        if report['status'] == STATUS_BROKEN:
+            try:
+                os.remove(report['path'])
+                report['reason'] = f"{report['reason']} (removed)"
+                removed += 1
+            except OSError as e:
+                logger.error("Failed to remove broken shortcut %s: %s", report['path'], e)
+    return removed
@@ -0,0 +1,113 @@
+"""Icon references, cache keys and byte fetching for list thumbnails.
+
+Rows in the application and shortcut lists carry an icon *reference* rather
+than a decoded image.  A reference is a short string with a scheme prefix:
+
+- ``wsl:<name-or-path>`` - the ``Icon=`` value of a desktop file inside WSL
+- ``file:<path>`` - an image file on the Windows side (custom applications)
+- ``lnk:<path>`` - a shortcut file whose icon location should be used
+
+References are hashed into cache keys so decoded thumbnails can be shared
+between rows and lists.
+"""
+from typing import Optional
+
+import hashlib
+import logging
+import os
+import shlex
+import subprocess
+
+from .lnk import ShortcutFormatError, read_shortcut
+from .wsl import run_in_distro
+from .wsl_session import SessionError
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+# Seconds an icon read inside WSL may take, e.g. when the path is a FIFO
+ICON_TIMEOUT = 10
+
+IMAGE_EXTENSIONS = ('.ico', '.png', '.jpg', '.jpeg', '.bmp', '.gif', '.svg', '.xpm')
+
+# Theme lookup order used for bare icon names in desktop files
+ICON_SEARCH_DIRS = [
+    '/usr/share/icons/hicolor/48x48/apps',
+    '/usr/share/icons/hicolor/64x64/apps',
+    '/usr/share/icons/hicolor/32x32/apps',
+    '/usr/share/icons/hicolor/128x128/apps',
+    '/usr/share/icons/hicolor/256x256/apps',
+    '/usr/share/icons/hicolor/scalable/apps',
+    '/usr/share/pixmaps',
+]
+
+
+def icon_cache_key(icon_ref: str) -> str:
+    """Return the cache key (a hash of the reference) for an icon reference."""
+    return 'wslsc-' + hashlib.sha1(icon_ref.encode('utf-8')).hexdigest()
+
+
+def icon_lookup_script(icon: str) -> str:
+    """
+    Build a shell snippet that writes the bytes of a desktop-file icon to stdout.
+
+    Args:
+        icon: The ``Icon=`` value, either an absolute path or a theme icon name
+
+    Returns:
+        A bash script suitable for ``bash -c``
+    """
+    if icon.startswith('/'):
+        return f'cat {shlex.quote(icon)}'
+    name = shlex.quote(icon)
+    dirs = ' '.join(shlex.quote(d) for d in ICON_SEARCH_DIRS)
+    return (
+        f'for d in {dirs}; do for e in png svg xpm; do '
+        f'if [ -f "$d/"{name}".$e" ]; then exec cat "$d/"{name}".$e"; fi; '
+        f'done; done; exit 1'
+    )
+
+
+def _read_image_file(location: str) -> Optional[bytes]:
+    """Read a local image file, ignoring executables and other non-image icon sources."""
+    path = os.path.expandvars(location.split(',')[0].strip().strip('"'))
+    if not path.lower().endswith(IMAGE_EXTENSIONS) or not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def fetch_icon_bytes(icon_ref: str, distro_name: Optional[str] = None, allow_start: bool = True) -> Optional[bytes]:
+    """
+    Fetch the raw image bytes for an icon reference.
+
+    This performs blocking I/O (and for ``wsl:`` references runs a command in
+    WSL), so it must not be called on the GUI thread.
+
+    Args:
+        icon_ref: Icon reference with scheme prefix
+        distro_name: WSL distribution to read ``wsl:`` icons from
+        allow_start: Whether reading a ``wsl:`` icon may start a WSL shell
+
+    Returns:
+        The image bytes, or None if the icon could not be found
+
+    Raises:
+        SessionUnavailable: If allow_start is False and no WSL shell is running
+    """
+    scheme, _, value = icon_ref.partition(':')
+    try:
+        if scheme == 'wsl':
+            result = run_in_distro(icon_lookup_script(value), distro_name, text=False, timeout=ICON_TIMEOUT,
+                                   allow_start=allow_start)
+            return result.stdout if result.returncode == 0 and result.stdout else None
+        if scheme == 'file':
+            return _read_image_file(value)
+        if scheme == 'lnk':
+            location = read_shortcut(value)['icon_location']
+            return _read_image_file(location) if location else None
+    except (OSError, ShortcutFormatError, SessionError, subprocess.TimeoutExpired) as e:
+        logger.debug("Could not fetch icon %s: %s", icon_ref, e)
+        return None
+    logger.debug("Unknown icon reference scheme: %s", icon_ref)
+    return None
@@ -0,0 +1,355 @@
+"""SQLite sidecar index of distributions, applications, shortcuts and icons.
+
+The index remembers what earlier scans found and which shortcuts the
+application created, so questions such as "which applications already have
+shortcuts?", "which icon files are in use?" and "what changed since the last
+scan?" are answered with indexed lookups instead of rescanning WSL or
+walking the Start Menu.  The database runs in WAL mode and every update is a
+single transaction using batched statements.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TypedDict
+
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+from .icons import icon_cache_key
+from .sources import AppRecord
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Change rows kept per distribution; older ones are deleted
+MAX_CHANGES = 10000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS distros (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    last_scan_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    distro_id INTEGER NOT NULL REFERENCES distros(id) ON DELETE CASCADE,
+    finished REAL NOT NULL,
+    apps_found INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS icons (
+    id INTEGER PRIMARY KEY,
+    ref TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS apps (
+    id INTEGER PRIMARY KEY,
+    distro_id INTEGER NOT NULL REFERENCES distros(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    desktop_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT,
+    icon_id INTEGER REFERENCES icons(id),
+    content_hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    UNIQUE (distro_id, path)
+);
+CREATE INDEX IF NOT EXISTS apps_icon ON apps(icon_id);
+CREATE TABLE IF NOT EXISTS shortcuts (
+    id INTEGER PRIMARY KEY,
+    distro_id INTEGER NOT NULL REFERENCES distros(id) ON DELETE CASCADE,
+    path TEXT NOT NULL UNIQUE,
+    app_path TEXT,
+    icon_id INTEGER REFERENCES icons(id),
+    content_hash TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS shortcuts_app ON shortcuts(distro_id, app_path);
+CREATE INDEX IF NOT EXISTS shortcuts_icon ON shortcuts(icon_id);
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY,
+    distro_id INTEGER NOT NULL REFERENCES distros(id) ON DELETE CASCADE,
+    scan_id INTEGER,
+    kind TEXT NOT NULL,
+    action TEXT NOT NULL,
+    key TEXT NOT NULL,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_time ON changes(distro_id, at);
+'''
+
+
+class ChangeRecord(TypedDict):
+    """Type definition for one recorded change"""
+    kind: str
+    action: str
+    key: str
+    at: float
+
+
+class ShortcutEntry(TypedDict):
+    """Type definition for a shortcut recorded in the index"""
+    path: str
+    app_path: Optional[str]
+    icon_location: Optional[str]
+    arguments: str
+
+
+def content_hash(*parts: Optional[str]) -> str:
+    """Return a stable hash of the given fields."""
+    return hashlib.sha1('\0'.join(part or '' for part in parts).encode('utf-8')).hexdigest()
+
+
+def default_index_path() -> str:
+    """Return the default database location next to the converted icons."""
+    base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'WSL Shortcuts', 'index.sqlite3')
+
+
+class ShortcutIndex:
+    """Connection to the sidecar index database."""
+
+    def __init__(self, path: str, max_changes: int = MAX_CHANGES) -> None:
+        """
+        Args:
+            path: Database file, or ``:memory:``
+            max_changes: Change rows kept per distribution
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_changes = max_changes
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('PRAGMA foreign_keys=ON')
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def _distro_id(self, name: str) -> int:
+        self.connection.execute('INSERT OR IGNORE INTO distros (name) VALUES (?)', (name,))
+        return self.connection.execute('SELECT id FROM distros WHERE name = ?', (name,)).fetchone()[0]
+
+    def _icon_ids(self, refs: Iterable[str]) -> Dict[str, int]:
+        unique = sorted(set(refs))
+        self.connection.executemany(
+            'INSERT OR IGNORE INTO icons (ref, hash) VALUES (?, ?)',
+            [(ref, icon_cache_key(ref)) for ref in unique]
+        )
+        ids: Dict[str, int] = {}
+        # Stay below SQLite's host parameter limit
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT ref, id FROM icons WHERE ref IN ({','.join('?' * len(chunk))})", chunk
+            )
+            ids.update(rows)
+        return ids
+
+    def record_scan(self, distro_name: str, records: List[AppRecord], complete: bool = True) -> List[ChangeRecord]:
+        """
+        Store the result of an application scan and the changes since the previous one.
+
+        Applications missing from the scan are only removed when the scan is
+        complete and found something, so a failed or empty scan never wipes
+        the recorded applications.
+
+        Args:
+            distro_name: Scanned distribution
+            records: Applications found
+            complete: Whether every scan source could be read
+
+        Returns:
+            The changes detected by this scan
+        """
+        now = time.time()
+        with self.connection:
+            distro_id = self._distro_id(distro_name)
+            previous = dict(self.connection.execute(
+                'SELECT path, content_hash FROM apps WHERE distro_id = ?', (distro_id,)
+            ))
+            scan_id = self.connection.execute(
+                'INSERT INTO scans (distro_id, finished, apps_found) VALUES (?, ?, ?)',
+                (distro_id, now, len(records))
+            ).lastrowid
+            icon_ids = self._icon_ids(f"wsl:{r['icon']}" for r in records if r['icon'])
+            
+            rows = []
+            changes: List[ChangeRecord] = []
+            for record in records:
+                icon_ref = f"wsl:{record['icon']}" if record['icon'] else None
+                digest = content_hash(record['desktop_id'], record['name'], record['icon'], record['source'])
+                old = previous.pop(record['path'], None)
+                if old is None:
+                    changes.append({'kind': 'app', 'action': 'added', 'key': record['path'], 'at': now})
+                elif old != digest:
+                    changes.append({'kind': 'app', 'action': 'changed', 'key': record['path'], 'at': now})
+                rows.append((distro_id, record['path'], record['desktop_id'], record['name'], record['source'],
+                             icon_ids.get(icon_ref) if icon_ref else None, digest, now, now))
+            self.connection.executemany(
+                '''INSERT INTO apps (distro_id, path, desktop_id, name, source, icon_id, content_hash,
+                                     first_seen, last_seen)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (distro_id, path) DO UPDATE SET
+                       desktop_id = excluded.desktop_id, name = excluded.name, source = excluded.source,
+                       icon_id = excluded.icon_id, content_hash = excluded.content_hash,
+                       last_seen = excluded.last_seen''',
+                rows
+            )
+            
+            removed = list(previous) if complete and records else []
+            if previous and not removed:
+                logger.warning("Keeping %d applications not seen by an incomplete or empty scan of %s",
+                               len(previous), distro_name)
+            self.connection.executemany(
+                'DELETE FROM apps WHERE distro_id = ? AND path = ?', [(distro_id, path) for path in removed]
+            )
+            changes += [{'kind': 'app', 'action': 'removed', 'key': path, 'at': now} for path in removed]
+            self._record_changes(distro_id, scan_id, changes)
+            self.connection.execute('UPDATE distros SET last_scan_id = ? WHERE id = ?', (scan_id, distro_id))
+        return changes
+
+    def record_shortcuts(self, distro_name: str, entries: List[ShortcutEntry]) -> None:
+        """Insert or update shortcuts created or found for a distribution."""
+        with self.connection:
+            self._record_shortcuts(self._distro_id(distro_name), entries, time.time())
+
+    def sync_shortcuts(self, distro_name: str, entries: List[ShortcutEntry]) -> None:
+        """Replace the recorded shortcuts of a distribution with the given complete list."""
+        now = time.time()
+        with self.connection:
+            distro_id = self._distro_id(distro_name)
+            current = {entry['path'] for entry in entries}
+            stale = [path for (path,) in self.connection.execute(
+                'SELECT path FROM shortcuts WHERE distro_id = ?', (distro_id,)
+            ) if path not in current]
+            self._remove_shortcuts(distro_id, stale, now)
+            self._record_shortcuts(distro_id, entries, now)
+
+    def remove_shortcuts(self, distro_name: str, paths: List[str]) -> None:
+        """Forget shortcuts that were deleted."""
+        if not paths:
+            return
+        with self.connection:
+            self._remove_shortcuts(self._distro_id(distro_name), paths, time.time())
+
+    def _record_shortcuts(self, distro_id: int, entries: List[ShortcutEntry], now: float) -> None:
+        existing = dict(self.connection.execute(
+            'SELECT path, content_hash FROM shortcuts WHERE distro_id = ?', (distro_id,)
+        ))
+        # Unchanged shortcuts are not rewritten, so syncing a large folder stays cheap
+        changed = []
+        for entry in entries:
+            digest = content_hash(entry['app_path'], entry['icon_location'], entry['arguments'])
+            if existing.get(entry['path']) != digest:
+                changed.append((entry, digest))
+        icon_ids = self._icon_ids(f"file:{e['icon_location']}" for e, _ in changed if e['icon_location'])
+        rows = []
+        changes: List[ChangeRecord] = []
+        for entry, digest in changed:
+            action = 'added' if entry['path'] not in existing else 'changed'
+            changes.append({'kind': 'shortcut', 'action': action, 'key': entry['path'], 'at': now})
+            icon_id = icon_ids.get(f"file:{entry['icon_location']}") if entry['icon_location'] else None
+            rows.append((distro_id, entry['path'], entry['app_path'], icon_id, digest, now))
+        self.connection.executemany(
+            '''INSERT INTO shortcuts (distro_id, path, app_path, icon_id, content_hash, updated)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT (path) DO UPDATE SET
+                   distro_id = excluded.distro_id, app_path = excluded.app_path,
+                   icon_id = excluded.icon_id, content_hash = excluded.content_hash,
+                   updated = excluded.updated''',
+            rows
+        )
+        self._record_changes(distro_id, None, changes)
+
+    def _remove_shortcuts(self, distro_id: int, paths: List[str], now: float) -> None:
+        self.connection.executemany('DELETE FROM shortcuts WHERE path = ?', [(path,) for path in paths])
+        self._record_changes(distro_id, None, [
+            {'kind': 'shortcut', 'action': 'removed', 'key': path, 'at': now} for path in paths
+        ])
+
+    def _record_changes(self, distro_id: int, scan_id: Optional[int], changes: List[ChangeRecord]) -> None:
+        self.connection.executemany(
+            'INSERT INTO changes (distro_id, scan_id, kind, action, key, at) VALUES (?, ?, ?, ?, ?, ?)',
+            [(distro_id, scan_id, c['kind'], c['action'], c['key'], c['at']) for c in changes]
+        )
+        if changes:
+            self.connection.execute(
+                '''DELETE FROM changes WHERE distro_id = ? AND id <= (
+                       SELECT id FROM changes WHERE distro_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)''',
+                (distro_id, distro_id, self.max_changes)
+            )
+
+    def apps_with_shortcuts(self, distro_name: str) -> Set[str]:
+        """Return the paths of scanned applications that have a shortcut."""
+        rows = self.connection.execute(
+            '''SELECT DISTINCT apps.path FROM apps
+               JOIN distros ON distros.id = apps.distro_id
+               JOIN shortcuts ON shortcuts.distro_id = apps.distro_id AND shortcuts.app_path = apps.path
+               WHERE distros.name = ?''',
+            (distro_name,)
+        )
+        return {path for (path,) in rows}
+
+    def icons_in_use(self) -> List[Tuple[str, str]]:
+        """Return ``(icon reference, icon hash)`` for every icon used by an app or shortcut."""
+        return self.connection.execute(
+            '''SELECT ref, hash FROM icons
+               WHERE id IN (SELECT icon_id FROM apps UNION SELECT icon_id FROM shortcuts)
+               ORDER BY ref'''
+        ).fetchall()
+
+    def last_scan_changes(self, distro_name: str) -> List[ChangeRecord]:
+        """Return the changes found by the most recent scan plus later shortcut changes."""
+        rows = self.connection.execute(
+            '''SELECT changes.kind, changes.action, changes.key, changes.at FROM changes
+               JOIN distros ON distros.id = changes.distro_id
+               WHERE distros.name = ? AND changes.at >= COALESCE(
+                   (SELECT finished FROM scans WHERE id = distros.last_scan_id), 0)
+               ORDER BY changes.id''',
+            (distro_name,)
+        )
+        return [{'kind': kind, 'action': action, 'key': key, 'at': at} for kind, action, key, at in rows]
+
+    def cached_apps(self, distro_name: str) -> List[AppRecord]:
+        """Return the applications recorded by the last scan of a distribution, sorted by name."""
+        rows = self.connection.execute(
+            '''SELECT apps.desktop_id, apps.path, apps.name, icons.ref, apps.source FROM apps
+               JOIN distros ON distros.id = apps.distro_id
+               LEFT JOIN icons ON icons.id = apps.icon_id
+               WHERE distros.name = ?
+               ORDER BY apps.name COLLATE NOCASE, apps.path''',
+            (distro_name,)
+        )
+        return [
+            {'desktop_id': desktop_id, 'path': path, 'name': name,
+             'icon': ref[len('wsl:'):] if ref else None, 'source': source}
+            for desktop_id, path, name, ref, source in rows
+        ]
+
+    def last_scan_time(self, distro_name: str) -> Optional[float]:
+        """Return when the distribution was last scanned, or None if it never was."""
+        row = self.connection.execute(
+            '''SELECT scans.finished FROM distros JOIN scans ON scans.id = distros.last_scan_id
+               WHERE distros.name = ?''',
+            (distro_name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def distro_names(self) -> List[str]:
+        """Return the names of all distributions in the index."""
+        return [name for (name,) in self.connection.execute('SELECT name FROM distros ORDER BY name')]
+
+    def app_count(self, distro_name: str) -> int:
+        """Return the number of applications recorded for a distribution."""
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM apps JOIN distros ON distros.id = apps.distro_id WHERE distros.name = ?',
+            (distro_name,)
+        ).fetchone()[0]
@@ -0,0 +1,188 @@
+"""Minimal reader and writer for Windows shell link (``.lnk``) files.
+
+Only the parts of the MS-SHLLINK format needed by the application are
+handled: the local target path, the string data section (arguments, working
+directory, icon location, description), the icon index and the show command.
+The code is pure Python so it works without Windows Script Host and on any
+platform.
+"""
+from typing import Optional, Tuple, TypedDict
+
+import struct
+
+HEADER_SIZE = 0x4C
+LINK_CLSID = b'\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46'
+DRIVE_FIXED = 3
+
+# LinkFlags bits
+HAS_LINK_TARGET_ID_LIST = 0x01
+HAS_LINK_INFO = 0x02
+HAS_NAME = 0x04
+HAS_RELATIVE_PATH = 0x08
+HAS_WORKING_DIR = 0x10
+HAS_ARGUMENTS = 0x20
+HAS_ICON_LOCATION = 0x40
+IS_UNICODE = 0x80
+
+
+class ShortcutInfo(TypedDict):
+    """Type definition for the fields read from a shortcut file"""
+    target: Optional[str]
+    arguments: str
+    working_dir: Optional[str]
+    icon_location: Optional[str]
+    icon_index: int
+    description: Optional[str]
+
+
+class ShortcutFormatError(ValueError):
+    """Raised when data is not a valid shell link."""
+
+
+def _read_c_string(data: bytes, offset: int, unicode: bool) -> str:
+    """Read a NUL-terminated string starting at offset."""
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b'\x00\x00':
+            end += 2
+        return data[offset:end].decode('utf-16-le', errors='replace')
+    end = data.find(b'\x00', offset)
+    if end < 0:
+        end = len(data)
+    return data[offset:end].decode('cp1252', errors='replace')
+
+
+def _read_link_info(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    """Return the local base path stored in a LinkInfo structure and its size."""
+    size, header_size, flags = struct.unpack_from('<III', data, offset)
+    target = None
+    if flags & 0x1:  # VolumeIDAndLocalBasePath
+        if header_size >= 0x24:
+            unicode_offset = struct.unpack_from('<I', data, offset + 0x1C)[0]
+            target = _read_c_string(data, offset + unicode_offset, True)
+        else:
+            base_offset = struct.unpack_from('<I', data, offset + 0x10)[0]
+            target = _read_c_string(data, offset + base_offset, False)
+    return target, size
+
+
+def parse_shortcut(data: bytes) -> ShortcutInfo:
+    """
+    Parse the contents of a ``.lnk`` file.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        The decoded shortcut fields
+
+    Raises:
+        ShortcutFormatError: If the data is not a shell link
+    """
+    if len(data) < HEADER_SIZE or struct.unpack_from('<I', data, 0)[0] != HEADER_SIZE:
+        raise ShortcutFormatError("Not a shell link file")
+    try:
+        flags = struct.unpack_from('<I', data, 0x14)[0]
+        icon_index = struct.unpack_from('<i', data, 0x38)[0]
+        offset = HEADER_SIZE
+
+        if flags & HAS_LINK_TARGET_ID_LIST:
+            id_list_size = struct.unpack_from('<H', data, offset)[0]
+            offset += 2 + id_list_size
+
+        target = None
+        if flags & HAS_LINK_INFO:
+            target, link_info_size = _read_link_info(data, offset)
+            offset += link_info_size
+
+        unicode = bool(flags & IS_UNICODE)
+        strings = {}
+        for flag in (HAS_NAME, HAS_RELATIVE_PATH, HAS_WORKING_DIR, HAS_ARGUMENTS, HAS_ICON_LOCATION):
+            if not flags & flag:
+                continue
+            count = struct.unpack_from('<H', data, offset)[0]
+            offset += 2
+            length = count * 2 if unicode else count
+            raw = data[offset:offset + length]
+            if len(raw) != length:
+                raise ShortcutFormatError("Truncated string data")
+            strings[flag] = raw.decode('utf-16-le' if unicode else 'cp1252', errors='replace')
+            offset += length
+    except struct.error as e:
+        raise ShortcutFormatError(f"Truncated shell link: {e}") from e
+
+    return {
+        'target': target,
+        'arguments': strings.get(HAS_ARGUMENTS, ''),
+        'working_dir': strings.get(HAS_WORKING_DIR),
+        'icon_location': strings.get(HAS_ICON_LOCATION),
+        'icon_index': icon_index,
+        'description': strings.get(HAS_NAME),
+    }
+
+
+def read_shortcut(path: str) -> ShortcutInfo:
+    """Read and parse the shortcut file at path."""
+    with open(path, 'rb') as f:
+        return parse_shortcut(f.read())
+
+
+def build_shortcut(target: str, arguments: str = '', working_dir: Optional[str] = None,
+                   icon_location: Optional[str] = None, icon_index: int = 0,
+                   description: Optional[str] = None, show_command: int = 1) -> bytes:
+    """
+    Build the contents of a ``.lnk`` file pointing at a local target.
+
+    Args:
+        target: Absolute Windows path of the target executable
+        arguments: Command line arguments
+        working_dir: Working directory, may contain environment variables
+        icon_location: Icon file path (without the ``,index`` suffix)
+        icon_index: Index of the icon inside icon_location
+        description: Shortcut comment shown as tooltip
+        show_command: Window show state (1 = normal, 3 = maximized, 7 = minimized)
+
+    Returns:
+        The encoded shell link
+    """
+    flags = HAS_LINK_INFO | IS_UNICODE
+    strings = b''
+    for flag, value in ((HAS_NAME, description), (HAS_WORKING_DIR, working_dir),
+                        (HAS_ARGUMENTS, arguments), (HAS_ICON_LOCATION, icon_location)):
+        if not value:
+            continue
+        flags |= flag
+        strings += struct.pack('<H', len(value)) + value.encode('utf-16-le')
+
+    header = struct.pack(
+        '<I16sII24sIiIHHII',
+        HEADER_SIZE, LINK_CLSID, flags, 0, b'\x00' * 24, 0,
+        icon_index, show_command, 0, 0, 0, 0
+    )
+
+    # LinkInfo with a VolumeID and the local base path in ANSI and UTF-16
+    volume_id = struct.pack('<IIII', 0x11, DRIVE_FIXED, 0, 0x10) + b'\x00'
+    ansi_path = target.encode('cp1252', errors='replace') + b'\x00'
+    unicode_path = target.encode('utf-16-le') + b'\x00\x00'
+    link_info_header_size = 0x24
+    volume_id_offset = link_info_header_size
+    base_path_offset = volume_id_offset + len(volume_id)
+    suffix_offset = base_path_offset + len(ansi_path)
+    unicode_base_path_offset = suffix_offset + 1
+    unicode_suffix_offset = unicode_base_path_offset + len(unicode_path)
+    link_info_size = unicode_suffix_offset + 2
+    link_info = struct.pack(
+        '<IIIIIIIII',
+        link_info_size, link_info_header_size, 0x1, volume_id_offset, base_path_offset,
+        0, suffix_offset, unicode_base_path_offset, unicode_suffix_offset
+    ) + volume_id + ansi_path + b'\x00' + unicode_path + b'\x00\x00'
+
+    # Terminal block ends the ExtraData section
+    return header + link_info + strings + b'\x00' * 4
+
+
+def write_shortcut(path: str, target: str, **fields) -> None:
+    """Write a shortcut file; keyword arguments are passed to build_shortcut."""
+    data = build_shortcut(target, **fields)
+    with open(path, 'wb') as f:
+        f.write(data)
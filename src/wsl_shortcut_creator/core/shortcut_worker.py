@@ -0,0 +1,42 @@
+"""Python implementation of the shortcut writer line protocol.
+
+Run as ``python -m wsl_shortcut_creator.core.shortcut_worker``.  It plays the
+role of the Windows Script Host worker (see shortcut_writer) and writes
+shortcuts with the pure-Python link writer.
+"""
+from typing import Optional, TextIO
+
+import sys
+
+from .shortcut_writer import decode_request, escape, write_spec
+
+
+def serve(stdin: TextIO, stdout: TextIO) -> None:
+    """Answer protocol requests from stdin until end of input."""
+    for line in stdin:
+        if not line.strip():
+            continue
+        item_id: Optional[str] = line.split('\t', 1)[0]
+        try:
+            fields = decode_request(line)
+            result = write_spec({
+                'path': fields[1],
+                'target': fields[2],
+                'arguments': fields[3],
+                'working_dir': fields[4],
+                'icon_location': fields[5],
+                'description': fields[6],
+                'window_style': int(fields[7]),
+            })
+            error = result['error']
+        except ValueError as e:
+            error = str(e)
+        if error is None:
+            stdout.write(f"{item_id}\tOK\n")
+        else:
+            stdout.write(f"{item_id}\tERR\t{escape(error)}\n")
+        stdout.flush()
+
+
+if __name__ == '__main__':
+    serve(sys.stdin, sys.stdout)
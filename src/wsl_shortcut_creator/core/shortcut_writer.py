@@ -0,0 +1,394 @@
+"""Shortcut writer backends.
+
+A writer turns a batch of ShortcutSpec records into ``.lnk`` files and
+reports a WriteResult per item.  Three backends are available:
+
+- ``wsh`` - one long-lived ``cscript`` process per batch running a Windows
+  Script Host worker script, for full WScript.Shell semantics
+- ``worker`` - the same line protocol served by a Python worker process
+  (``python -m wsl_shortcut_creator.core.shortcut_worker``); used as a local
+  stand-in for the WSH worker and works on any platform
+- ``native`` - writes shortcuts in-process with the pure-Python link writer
+
+Process backends speak a line protocol over stdin/stdout.  Each request is
+one line of tab-separated, ``escape()``-encoded fields::
+
+    <id> TAB <path> TAB <target> TAB <arguments> TAB <working_dir> TAB <icon_location> TAB <description> TAB <window_style>
+
+and each response is ``<id> TAB OK`` or ``<id> TAB ERR TAB <escaped message>``.
+Encoding every field keeps the stream pure ASCII, so the protocol is safe
+for the console code page used by ``cscript``.
+"""
+from abc import ABC, abstractmethod
+from typing import IO, Callable, Dict, List, Optional, Sequence, Tuple, TypedDict, cast
+
+import logging
+import os
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+
+from ..config import settings
+from .lnk import write_shortcut
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+WSLG_PATH = "C:\\Program Files\\WSL\\wslg.exe"
+DEFAULT_ICON_LOCATION = f"{WSLG_PATH},0"
+PROTOCOL_FIELDS = 8
+
+
+class ShortcutSpec(TypedDict):
+    """Type definition for a shortcut to be written"""
+    path: str
+    target: str
+    arguments: str
+    working_dir: str
+    icon_location: str
+    description: str
+    window_style: int
+
+
+class WriteResult(TypedDict):
+    """Type definition for the outcome of writing one shortcut"""
+    path: str
+    ok: bool
+    error: Optional[str]
+
+
+def make_wsl_shortcut_spec(shortcut_dir: str, distro_name: str, app_name: str,
+                           app_path: str, icon_path: Optional[str] = None) -> ShortcutSpec:
+    """
+    Build the spec for a shortcut launching a WSL application through wslg.exe.
+
+    Args:
+        shortcut_dir: Directory the shortcut is written to
+        distro_name: WSL distribution running the application
+        app_name: Display name of the application
+        app_path: Path of the .desktop file, or a command for custom applications
+        icon_path: Optional Windows icon file
+
+    Returns:
+        The shortcut spec
+    """
+    if app_path.endswith('.desktop'):
+        # For .desktop files, use BAMF_DESKTOP_FILE_HINT
+        # Quoted so desktop files with spaces in their path reach env as one word
+        hint = shlex.quote(app_path)
+        arguments = f'-d {distro_name} --cd "~" -- env BAMF_DESKTOP_FILE_HINT={hint} {app_name.lower()}'
+    else:
+        # For custom applications, directly execute the command
+        arguments = f'-d {distro_name} --cd "~" -- {app_path}'
+    return {
+        'path': os.path.join(shortcut_dir, f"{app_name}.lnk"),
+        'target': WSLG_PATH,
+        'arguments': arguments,
+        'working_dir': '%USERPROFILE%',
+        'icon_location': icon_path or DEFAULT_ICON_LOCATION,
+        'description': f"WSL GUI Application: {app_name}",
+        'window_style': 1,
+    }
+
+
+# Characters left alone by the JavaScript/VBScript escape() function
+_ESCAPE_SAFE = re.compile(r'[A-Za-z0-9@*_+\-./]')
+_UNESCAPE = re.compile(r'%u([0-9A-Fa-f]{4})|%([0-9A-Fa-f]{2})')
+
+
+def escape(value: str) -> str:
+    """Encode a string like VBScript's ``Escape`` so ``Unescape`` restores it."""
+    out = []
+    for char in value:
+        code = ord(char)
+        if _ESCAPE_SAFE.match(char):
+            out.append(char)
+        elif code < 0x100:
+            out.append(f'%{code:02X}')
+        elif code < 0x10000:
+            out.append(f'%u{code:04X}')
+        else:
+            # Encode astral characters as a UTF-16 surrogate pair
+            code -= 0x10000
+            out.append(f'%u{0xD800 + (code >> 10):04X}%u{0xDC00 + (code & 0x3FF):04X}')
+    return ''.join(out)
+
+
+def unescape(value: str) -> str:
+    """Decode a string produced by ``escape`` or VBScript's ``Escape``."""
+    decoded = _UNESCAPE.sub(lambda m: chr(int(m.group(1) or m.group(2), 16)), value)
+    return decoded.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'replace')
+
+
+def encode_request(item_id: int, spec: ShortcutSpec) -> str:
+    """Encode a spec as one protocol request line (without newline)."""
+    fields = [
+        spec['path'], spec['target'], spec['arguments'], spec['working_dir'],
+        spec['icon_location'], spec['description']
+    ]
+    return '\t'.join([str(item_id)] + [escape(field) for field in fields] + [str(int(spec['window_style']))])
+
+
+def decode_request(line: str) -> List[str]:
+    """
+    Decode a request line into ``[id, path, target, arguments, working_dir, icon_location, description, window_style]``.
+
+    Raises:
+        ValueError: If the line does not have the expected number of fields
+    """
+    fields = line.rstrip('\r\n').split('\t')
+    if len(fields) != PROTOCOL_FIELDS:
+        raise ValueError(f"Expected {PROTOCOL_FIELDS} fields, got {len(fields)}")
+    return [fields[0]] + [unescape(field) for field in fields[1:7]] + [fields[7]]
+
+
+def split_icon_location(icon_location: str) -> Tuple[str, int]:
+    """Split a WSH style ``path,index`` icon location into path and index."""
+    path, sep, index = icon_location.rpartition(',')
+    if sep and index.strip().lstrip('-').isdigit():
+        return path, int(index)
+    return icon_location, 0
+
+
+class ShortcutWriter(ABC):
+    """Base class for shortcut writer backends."""
+
+    name = 'base'
+
+    @abstractmethod
+    def write_batch(self, specs: Sequence[ShortcutSpec],
+                    on_result: Optional[Callable[[WriteResult], None]] = None) -> List[WriteResult]:
+        """
+        Write a batch of shortcuts.
+
+        Args:
+            specs: Shortcuts to write
+            on_result: Optional callback invoked as each result arrives
+
+        Returns:
+            One result per spec, in the same order
+        """
+
+
+class NativeShortcutWriter(ShortcutWriter):
+    """Write shortcuts in-process with the pure-Python link writer."""
+
+    name = 'native'
+
+    def write_batch(self, specs: Sequence[ShortcutSpec],
+                    on_result: Optional[Callable[[WriteResult], None]] = None) -> List[WriteResult]:
+        results = []
+        for spec in specs:
+            result = write_spec(spec)
+            if on_result:
+                on_result(result)
+            results.append(result)
+        return results
+
+
+def write_spec(spec: ShortcutSpec) -> WriteResult:
+    """Write one spec with the native link writer, capturing any error."""
+    try:
+        icon_location, icon_index = split_icon_location(spec['icon_location'])
+        write_shortcut(
+            spec['path'], spec['target'],
+            arguments=spec['arguments'],
+            working_dir=spec['working_dir'],
+            icon_location=icon_location,
+            icon_index=icon_index,
+            description=spec['description'],
+            show_command=int(spec['window_style']),
+        )
+        return {'path': spec['path'], 'ok': True, 'error': None}
+    except Exception as e:
+        return {'path': spec['path'], 'ok': False, 'error': str(e)}
+
+
+class ProcessShortcutWriter(ShortcutWriter):
+    """
+    Stream a batch of specs to one long-lived writer process.
+
+    Every batch runs in its own temporary working directory, so concurrent
+    batches never share helper files and nothing is written to the CWD.
+    """
+
+    name = 'process'
+
+    def __init__(self, command: Sequence[str], env: Optional[Dict[str, str]] = None) -> None:
+        """
+        Args:
+            command: Command line of a process speaking the writer line protocol
+            env: Environment for the writer process; inherited when None
+        """
+        self.command = list(command)
+        self.env = env
+
+    def build_command(self, workdir: str) -> List[str]:
+        """Return the command line to start the writer in workdir."""
+        return self.command
+
+    def write_batch(self, specs: Sequence[ShortcutSpec],
+                    on_result: Optional[Callable[[WriteResult], None]] = None) -> List[WriteResult]:
+        results: List[Optional[WriteResult]] = [None] * len(specs)
+        requests = []
+        for item_id, spec in enumerate(specs):
+            if any(char in str(value) for value in spec.values() for char in '\r\n'):
+                rejected: WriteResult = {'path': spec['path'], 'ok': False, 'error': "Line breaks are not allowed"}
+                results[item_id] = rejected
+                if on_result:
+                    on_result(rejected)
+                continue
+            requests.append(encode_request(item_id, spec) + '\n')
+        if not requests:
+            return results  # type: ignore
+
+        with tempfile.TemporaryDirectory(prefix='wsl-shortcuts-') as workdir:
+            stderr_path = os.path.join(workdir, 'stderr.log')
+            with open(stderr_path, 'w') as stderr:
+                process = subprocess.Popen(
+                    self.build_command(workdir), cwd=workdir, env=self.env,
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr,
+                    text=True, encoding='ascii', errors='replace'
+                )
+                feeder = threading.Thread(target=self._feed, args=(process, requests), daemon=True)
+                feeder.start()
+                # stdout was requested as a pipe above, so it is not None
+                for line in cast(IO[str], process.stdout):
+                    result = self._parse_response(line, specs, results)
+                    if result and on_result:
+                        on_result(result)
+                feeder.join()
+                returncode = process.wait()
+            with open(stderr_path) as stderr:
+                error_output = stderr.read().strip()
+
+        missing_error = f"Writer exited with code {returncode}"
+        if error_output:
+            missing_error += f": {error_output.splitlines()[-1]}"
+        for item_id, result in enumerate(results):
+            if result is None:
+                missing: WriteResult = {'path': specs[item_id]['path'], 'ok': False, 'error': missing_error}
+                results[item_id] = missing
+                if on_result:
+                    on_result(missing)
+        return results  # type: ignore
+
+    @staticmethod
+    def _feed(process: subprocess.Popen, requests: List[str]) -> None:
+        """Write all requests to the writer and close its stdin."""
+        stdin = cast(IO[str], process.stdin)
+        try:
+            for request in requests:
+                stdin.write(request)
+            stdin.close()
+        except (BrokenPipeError, OSError) as e:
+            logger.warning("Shortcut writer stopped accepting requests: %s", e)
+
+    @staticmethod
+    def _parse_response(line: str, specs: Sequence[ShortcutSpec],
+                        results: List[Optional[WriteResult]]) -> Optional[WriteResult]:
+        """Record one response line; returns the new result or None if unusable."""
+        fields = line.rstrip('\r\n').split('\t')
+        try:
+            item_id = int(fields[0])
+            spec = specs[item_id]
+        except (ValueError, IndexError):
+            logger.warning("Ignoring unexpected writer output: %r", line)
+            return None
+        if len(fields) >= 2 and fields[1] == 'OK':
+            result: WriteResult = {'path': spec['path'], 'ok': True, 'error': None}
+        else:
+            message = unescape(fields[2]) if len(fields) > 2 else "Unknown error"
+            result = {'path': spec['path'], 'ok': False, 'error': message}
+        results[item_id] = result
+        return result
+
+
+# Windows Script Host implementation of the writer line protocol
+WSH_WORKER_SCRIPT = '''
+Set shell = WScript.CreateObject("WScript.Shell")
+Do While Not WScript.StdIn.AtEndOfStream
+    line = WScript.StdIn.ReadLine
+    If Len(line) > 0 Then
+        fields = Split(line, vbTab)
+        If UBound(fields) <> 7 Then
+            WScript.StdOut.WriteLine fields(0) & vbTab & "ERR" & vbTab & Escape("Malformed request")
+        Else
+            On Error Resume Next
+            Err.Clear
+            Set shortcut = shell.CreateShortcut(Unescape(fields(1)))
+            shortcut.TargetPath = Unescape(fields(2))
+            shortcut.Arguments = Unescape(fields(3))
+            shortcut.WorkingDirectory = Unescape(fields(4))
+            shortcut.WindowStyle = CInt(fields(7))
+            shortcut.IconLocation = Unescape(fields(5))
+            shortcut.Description = Unescape(fields(6))
+            shortcut.Save
+            If Err.Number <> 0 Then
+                WScript.StdOut.WriteLine fields(0) & vbTab & "ERR" & vbTab & Escape(Err.Description)
+            Else
+                WScript.StdOut.WriteLine fields(0) & vbTab & "OK"
+            End If
+            On Error GoTo 0
+        End If
+    End If
+Loop
+'''.strip()
+
+
+class WshShortcutWriter(ProcessShortcutWriter):
+    """Run the Windows Script Host worker script under ``cscript``."""
+
+    name = 'wsh'
+
+    def __init__(self, cscript: str = 'cscript') -> None:
+        super().__init__([cscript, '//Nologo'])
+
+    def build_command(self, workdir: str) -> List[str]:
+        script_path = os.path.join(workdir, 'shortcut_writer.vbs')
+        with open(script_path, 'w') as f:
+            f.write(WSH_WORKER_SCRIPT)
+        return self.command + [script_path]
+
+
+class PythonWorkerShortcutWriter(ProcessShortcutWriter):
+    """Run the Python stand-in worker speaking the same protocol as the WSH worker."""
+
+    name = 'worker'
+
+    def __init__(self) -> None:
+        # The worker runs in a temporary directory, so make sure it can import this package
+        package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+        super().__init__([sys.executable, '-m', 'wsl_shortcut_creator.core.shortcut_worker'], env)
+
+
+WRITER_BACKENDS: Dict[str, Callable[[], ShortcutWriter]] = {
+    'wsh': WshShortcutWriter,
+    'worker': PythonWorkerShortcutWriter,
+    'native': NativeShortcutWriter,
+}
+
+
+def create_writer(name: Optional[str] = None) -> ShortcutWriter:
+    """
+    Create a shortcut writer backend.
+
+    Args:
+        name: Backend name; defaults to the ``shortcut_writer`` setting
+
+    Returns:
+        The writer instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = name or settings.get('shortcut_writer')
+    try:
+        return WRITER_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown shortcut writer backend: {name}") from None
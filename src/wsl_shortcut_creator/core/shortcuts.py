@@ -0,0 +1,36 @@
+"""Helpers for the Start Menu folder holding a distribution's shortcuts."""
+from typing import Iterator, Optional
+
+import os
+
+from ..config import settings
+
+SHORTCUT_SUFFIX = '.lnk'
+
+
+def shortcut_folder(folder_name: str, root: Optional[str] = None) -> str:
+    """
+    Return the Start Menu folder for a distribution's shortcuts.
+
+    Args:
+        folder_name: Name of the distribution folder
+        root: Programs folder; defaults to the ``shortcuts_dir`` setting
+
+    Returns:
+        The absolute folder path
+    """
+    return os.path.join(root or settings.get('shortcuts_dir'), folder_name)
+
+
+def iter_shortcut_names(directory: str) -> Iterator[str]:
+    """
+    Lazily yield the file names of the shortcuts in a directory.
+
+    Uses ``os.scandir`` so no list of all entries is built and file types
+    come from the directory listing without extra ``stat`` calls.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(SHORTCUT_SUFFIX) and entry.is_file():
+                yield name
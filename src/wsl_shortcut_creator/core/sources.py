@@ -0,0 +1,306 @@
+"""Registry of application scan sources.
+
+A scan source is one ``applications`` directory inside WSL (XDG data dirs,
+Flatpak and Snap exports, user-configured directories).  Every source has a
+change-detection token covering the whole directory tree; on rescan, sources whose token is unchanged
+are served from the cache without being listed or parsed again.  Changed
+sources are enumerated in parallel and all sources are merged into a single
+record stream in precedence order by desktop-file ID.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, TypedDict
+
+import logging
+import shlex
+
+from .desktop_entries import DesktopFileIndex, ScanStats, new_scan_stats, parse_desktop_fields, parse_find_listing
+from .wsl import BashRunner
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+MISSING_TOKEN = 'missing'
+# Never equal to a real token, so a source that could not be read is read again
+FAILED_TOKEN = ''
+
+# Separates files in the output of the batched desktop-file reader
+FILE_MARKER = '\x1e'
+
+
+class AppRecord(TypedDict):
+    """Type definition for an application found by a scan"""
+    desktop_id: str
+    path: str
+    name: str
+    icon: Optional[str]
+    source: str
+
+
+class SourceCache(TypedDict):
+    """Type definition for the cached state of one scan source"""
+    token: str
+    listing: List[Tuple[str, str]]
+    fields: Dict[str, Dict[str, str]]
+
+
+class ScanSource:
+    """
+    A directory of desktop files inside WSL.
+
+    Subclasses can override the shell commands to support other layouts.
+    """
+
+    def __init__(self, path: str, kind: str = 'custom') -> None:
+        """
+        Args:
+            path: Absolute path of the applications directory
+            kind: Source type, e.g. ``xdg``, ``flatpak``, ``snap`` or ``custom``
+        """
+        self.path = path.rstrip('/') or '/'
+        self.kind = kind
+
+    def __repr__(self) -> str:
+        return f"ScanSource({self.path!r}, {self.kind!r})"
+
+    def token_command(self) -> str:
+        """
+        Shell command printing one line that changes whenever a desktop file in the tree changes.
+
+        The line is a hash of the modification time, size and path of every
+        desktop file, so files added, removed or edited in subdirectories
+        change it as well.
+        """
+        path = shlex.quote(self.path)
+        return (
+            f'if [ -d {path} ]; then '
+            f'find {path} -name "*.desktop" -printf "%T@ %s %p\\n" 2>/dev/null | sort | md5sum | cut -d" " -f1; '
+            f'else echo {MISSING_TOKEN}; fi'
+        )
+
+    def listing_command(self) -> str:
+        """Shell command listing desktop files as ``full_path<TAB>relative_path`` lines."""
+        return f'find {shlex.quote(self.path)} -name "*.desktop" -printf "%p\\t%P\\n" 2>/dev/null'
+
+
+class SourceRegistry:
+    """Ordered collection of scan sources, highest precedence first."""
+
+    def __init__(self, sources: Iterable[ScanSource] = ()) -> None:
+        self._sources: List[ScanSource] = []
+        for source in sources:
+            self.register(source)
+
+    def register(self, source: ScanSource) -> bool:
+        """
+        Append a source with lower precedence than the existing ones.
+
+        Returns:
+            False if a source for the same directory is already registered
+        """
+        if any(existing.path == source.path for existing in self._sources):
+            return False
+        self._sources.append(source)
+        return True
+
+    def __iter__(self):
+        return iter(self._sources)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    @classmethod
+    def from_environment(cls, home: str, xdg_data_home: str = '', xdg_data_dirs: str = '',
+                         custom_dirs: Iterable[str] = ()) -> 'SourceRegistry':
+        """
+        Build the default registry following XDG precedence rules.
+
+        Args:
+            home: Home directory of the WSL user; sources below it are skipped when empty
+            xdg_data_home: Value of ``$XDG_DATA_HOME`` (may be empty)
+            xdg_data_dirs: Value of ``$XDG_DATA_DIRS`` (may be empty)
+            custom_dirs: Additional applications directories, lowest precedence
+
+        Returns:
+            The populated registry
+        """
+        home = home.rstrip('/')
+        data_home = xdg_data_home or (f'{home}/.local/share' if home else '')
+        data_dirs = [d for d in (xdg_data_dirs or '/usr/local/share:/usr/share').split(':') if d]
+        registry = cls()
+        if data_home:
+            registry.register(ScanSource(f'{data_home}/applications', 'xdg'))
+            # Flatpak prepends its export directories to $XDG_DATA_DIRS when it is installed
+            registry.register(ScanSource(f'{data_home}/flatpak/exports/share/applications', 'flatpak'))
+        registry.register(ScanSource('/var/lib/flatpak/exports/share/applications', 'flatpak'))
+        for data_dir in data_dirs:
+            kind = 'flatpak' if '/flatpak/' in data_dir else 'snap' if '/snapd/' in data_dir else 'xdg'
+            registry.register(ScanSource(f"{data_dir.rstrip('/')}/applications", kind))
+        registry.register(ScanSource('/var/lib/snapd/desktop/applications', 'snap'))
+        for custom_dir in custom_dirs:
+            if custom_dir.startswith('~/'):
+                if not home:
+                    logger.warning("Skipping %s: the home directory is unknown", custom_dir)
+                    continue
+                custom_dir = home + custom_dir[1:]
+            registry.register(ScanSource(custom_dir, 'custom'))
+        return registry
+
+
+# Prints $HOME, $XDG_DATA_HOME and $XDG_DATA_DIRS on separate lines; an unset
+# $HOME falls back to the user's passwd entry
+ENVIRONMENT_COMMAND = (
+    'printf "%s\\n%s\\n%s\\n" "${HOME:-$(getent passwd "$(id -u)" | cut -d: -f6)}" '
+    '"$XDG_DATA_HOME" "$XDG_DATA_DIRS"'
+)
+
+
+def discover_registry(runner: BashRunner, custom_dirs: Iterable[str] = ()) -> SourceRegistry:
+    """Query the WSL environment and build the default source registry."""
+    result = runner(ENVIRONMENT_COMMAND)
+    lines = (result.stdout.split('\n') + ['', '', ''])[:3] if result.returncode == 0 else ['', '', '']
+    home, xdg_data_home, xdg_data_dirs = (line.strip() for line in lines)
+    if not home:
+        logger.warning("Could not determine the WSL home directory; skipping per-user sources")
+    return SourceRegistry.from_environment(home, xdg_data_home, xdg_data_dirs, custom_dirs)
+
+
+def parse_desktop_batch(output: str) -> Dict[str, Dict[str, str]]:
+    """Parse the output of the batched desktop-file reader into fields per path."""
+    fields: Dict[str, Dict[str, str]] = {}
+    path = None
+    lines: List[str] = []
+    for line in output.split('\n') + [FILE_MARKER]:
+        if line.startswith(FILE_MARKER):
+            if path is not None:
+                fields[path] = parse_desktop_fields('\n'.join(lines))
+            path, lines = line[1:] or None, []
+        else:
+            lines.append(line)
+    return fields
+
+
+# Reads newline separated paths from stdin and prints the Name/Icon lines of each
+READ_FIELDS_COMMAND = (
+    'while IFS= read -r f; do printf "\\036%s\\n" "$f"; '
+    'grep -E "^(Name|Icon)=" "$f" 2>/dev/null; done'
+)
+
+
+class ApplicationScanner:
+    """
+    Scan all registered sources and keep per-source results for rescans.
+
+    The runner executes bash scripts inside the target distribution and is
+    called from worker threads, so it must be thread-safe.
+    """
+
+    def __init__(self, registry: SourceRegistry, runner: BashRunner, max_workers: int = 4) -> None:
+        self.registry = registry
+        self.runner = runner
+        self.max_workers = max_workers
+        self.cache: Dict[str, SourceCache] = {}
+
+    def read_tokens(self) -> Dict[str, str]:
+        """
+        Return the change-detection token of every source using one WSL call.
+
+        Returns:
+            Tokens by source path; empty if the call failed
+        """
+        sources = list(self.registry)
+        if not sources:
+            return {}
+        result = self.runner('; '.join(source.token_command() for source in sources))
+        if result.returncode != 0:
+            logger.warning("Reading scan source tokens failed: %s", (result.stderr or '').strip())
+            return {}
+        lines = result.stdout.split('\n')
+        return {
+            source.path: (lines[i].strip() if i < len(lines) and lines[i].strip() else MISSING_TOKEN)
+            for i, source in enumerate(sources)
+        }
+
+    def _list_source(self, source: ScanSource) -> Optional[List[Tuple[str, str]]]:
+        result = self.runner(source.listing_command())
+        # find also exits non-zero for unreadable subdirectories; only an empty result is a failure
+        if result.returncode != 0 and not result.stdout:
+            logger.warning("Listing %s failed: %s", source.path, (result.stderr or '').strip())
+            return None
+        return parse_find_listing(result.stdout)
+
+    def _read_fields(self, paths: List[str]) -> Dict[str, Dict[str, str]]:
+        result = self.runner(READ_FIELDS_COMMAND, input='\n'.join(paths) + '\n')
+        return parse_desktop_batch(result.stdout)
+
+    def scan(self) -> Tuple[List[AppRecord], ScanStats]:
+        """
+        Scan for applications, skipping sources that have not changed.
+
+        Sources that could not be read are counted in ``sources_failed``; they
+        keep the listing of an earlier scan if there is one and are read again
+        on the next scan.
+
+        Returns:
+            The merged application records in precedence order and the scan statistics
+        """
+        stats = new_scan_stats()
+        tokens = self.read_tokens()
+        sources = list(self.registry)
+        
+        changed = []
+        for source in sources:
+            cached = self.cache.get(source.path)
+            if source.path not in tokens:
+                stats['sources_failed'] += 1
+                self.cache.setdefault(source.path, {'token': FAILED_TOKEN, 'listing': [], 'fields': {}})
+            elif cached is not None and cached['token'] == tokens[source.path]:
+                stats['sources_skipped'] += 1
+            elif tokens[source.path] == MISSING_TOKEN:
+                self.cache[source.path] = {'token': MISSING_TOKEN, 'listing': [], 'fields': {}}
+            else:
+                changed.append(source)
+        logger.debug("%d of %d sources changed", len(changed), len(sources))
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            listings = list(pool.map(self._list_source, changed))
+            for source, listing in zip(changed, listings):
+                if listing is None:
+                    stats['sources_failed'] += 1
+                    self.cache.setdefault(source.path, {'token': FAILED_TOKEN, 'listing': [], 'fields': {}})
+                    self.cache[source.path]['token'] = FAILED_TOKEN
+                    continue
+                self.cache[source.path] = {'token': tokens[source.path], 'listing': listing, 'fields': {}}
+            
+            # Merge in precedence order so shadowed files are never read
+            index = DesktopFileIndex(stats)
+            owner: Dict[str, ScanSource] = {}
+            for source in sources:
+                for full_path, _ in self.cache[source.path]['listing']:
+                    owner.setdefault(full_path, source)
+                index.add_source(self.cache[source.path]['listing'])
+            
+            to_read: Dict[str, List[str]] = {}
+            for _, full_path in index:
+                source = owner[full_path]
+                if full_path not in self.cache[source.path]['fields']:
+                    to_read.setdefault(source.path, []).append(full_path)
+            batches = list(to_read.items())
+            for (source_path, paths), parsed in zip(batches, pool.map(self._read_fields, [p for _, p in batches])):
+                stats['entries_parsed'] += len(paths)
+                self.cache[source_path]['fields'].update(parsed)
+        
+        records: List[AppRecord] = []
+        for desktop_id, full_path in index:
+            source = owner[full_path]
+            fields = self.cache[source.path]['fields'].get(full_path, {})
+            if not fields.get('Name'):
+                continue
+            records.append({
+                'desktop_id': desktop_id,
+                'path': full_path,
+                'name': fields['Name'],
+                'icon': fields.get('Icon'),
+                'source': source.kind,
+            })
+        stats['apps_found'] = len(records)
+        return records, stats
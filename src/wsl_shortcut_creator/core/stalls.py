@@ -0,0 +1,191 @@
+"""Detection and reporting of stalls on the GUI thread.
+
+The GUI thread calls ``StallMonitor.beat`` from a periodic heartbeat.  A
+monitoring thread notices when the heartbeat is overdue by more than the
+threshold and samples the GUI thread's Python stack while it is still
+blocked, which shows the code responsible for the freeze.  When the next
+heartbeat arrives the stall's duration is known and the report is logged
+and appended to a JSON-lines file that the command line can summarize.
+"""
+from typing import Dict, List, Optional, TypedDict
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from ..config import log_event
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+# Frames kept per stack sample, innermost last
+MAX_STACK_DEPTH = 40
+PACKAGE_MARKER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STALL_LOG_NAME = 'stalls.jsonl'
+
+
+class StallReport(TypedDict):
+    """Type definition for one recorded stall"""
+    at: float
+    duration_ms: float
+    threshold_ms: float
+    stack: List[str]
+    location: Optional[str]
+
+
+class StallSummary(TypedDict):
+    """Type definition for stalls grouped by location"""
+    location: str
+    count: int
+    total_ms: float
+    max_ms: float
+
+
+def default_stall_log_path(data_dir: str) -> str:
+    """Return the default stall report file in the application's data folder."""
+    return os.path.join(data_dir, STALL_LOG_NAME)
+
+
+def sample_stack(thread_id: int) -> List[str]:
+    """Return ``file:line in function`` entries for a thread's current stack, innermost last."""
+    frame = sys._current_frames().get(thread_id)
+    if frame is None:
+        return []
+    return [
+        f"{entry.filename}:{entry.lineno} in {entry.name}"
+        for entry in traceback.extract_stack(frame, limit=MAX_STACK_DEPTH)
+    ]
+
+
+def stall_location(stack: List[str]) -> Optional[str]:
+    """Return the innermost application frame of a stack sample, or the innermost frame."""
+    for entry in reversed(stack):
+        if entry.startswith(PACKAGE_MARKER):
+            return os.path.relpath(entry, os.path.dirname(PACKAGE_MARKER))
+    return stack[-1] if stack else None
+
+
+class StallMonitor:
+    """
+    Record stalls of the thread that calls ``beat``.
+
+    Args:
+        threshold_ms: Minimum heartbeat delay reported as a stall
+        interval_ms: Heartbeat interval, subtracted from the measured gap
+        report_path: JSON-lines file receiving the reports; None to keep them in memory only
+        thread_id: Thread to sample; defaults to the creating thread
+    """
+
+    def __init__(self, threshold_ms: float = 250, interval_ms: float = 50,
+                 report_path: Optional[str] = None, thread_id: Optional[int] = None) -> None:
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.report_path = report_path
+        self.thread_id = thread_id or threading.get_ident()
+        self.reports: List[StallReport] = []
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._pending: Optional[StallReport] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the monitoring thread."""
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='wslsc-stall-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the monitoring thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def beat(self) -> Optional[StallReport]:
+        """
+        Mark the monitored thread as responsive.
+
+        Returns:
+            The report if the previous heartbeat was late enough to be a stall
+        """
+        now = time.monotonic()
+        with self._lock:
+            latency = now - self._last_beat - self.interval
+            self._last_beat = now
+            report, self._pending = self._pending, None
+        if latency <= self.threshold:
+            return None
+        if report is None:
+            # The monitoring thread did not get to sample this one
+            report = self._new_report(now - latency, [])
+        report['duration_ms'] = round(latency * 1000, 1)
+        self._record(report)
+        return report
+
+    def _new_report(self, started: float, stack: List[str]) -> StallReport:
+        return {
+            'at': time.time() - (time.monotonic() - started),
+            'duration_ms': 0.0,
+            'threshold_ms': self.threshold * 1000,
+            'stack': stack,
+            'location': stall_location(stack),
+        }
+
+    def _run(self) -> None:
+        poll = max(self.threshold / 4, 0.005)
+        while not self._stop.wait(poll):
+            with self._lock:
+                overdue = time.monotonic() - self._last_beat - self.interval
+                if self._pending is not None or overdue <= self.threshold:
+                    continue
+                started = self._last_beat + self.interval
+            # Sample while the thread is still blocked
+            report = self._new_report(started, sample_stack(self.thread_id))
+            with self._lock:
+                if self._last_beat + self.interval == started:
+                    self._pending = report
+
+    def _record(self, report: StallReport) -> None:
+        self.reports.append(report)
+        log_event(logger, logging.WARNING, 'ui_stall', duration_ms=report['duration_ms'],
+                  location=report['location'])
+        if self.report_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.report_path)), exist_ok=True)
+                with open(self.report_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(report) + '\n')
+            except OSError as e:
+                logger.warning("Could not save stall report to %s: %s", self.report_path, e)
+
+
+def read_stall_reports(path: str) -> List[StallReport]:
+    """Read a stall report file, skipping damaged lines; a missing file has no reports."""
+    reports: List[StallReport] = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    reports.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return reports
+
+
+def summarize_stalls(reports: List[StallReport]) -> List[StallSummary]:
+    """Group stalls by location, longest total first."""
+    groups: Dict[str, StallSummary] = {}
+    for report in reports:
+        location = report.get('location') or 'unknown'
+        group = groups.setdefault(location, {'location': location, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        group['count'] += 1
+        group['total_ms'] += report['duration_ms']
+        group['max_ms'] = max(group['max_ms'], report['duration_ms'])
+    return sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)
@@ -0,0 +1,69 @@
+"""Helpers for running commands inside WSL."""
+from typing import Callable, Optional, Union
+
+import subprocess
+
+from ..config import settings
+from .wsl_session import SessionUnavailable, session_pool
+
+# Runs a bash script in WSL with optional stdin text and returns the completed process
+BashRunner = Callable[..., subprocess.CompletedProcess]
+
+
+def run_wsl_bash(script: str, input: Union[str, bytes, None] = None, distro_name: Optional[str] = None,
+                 timeout: Optional[float] = None, text: bool = True) -> subprocess.CompletedProcess:
+    """
+    Run a bash script in a WSL distribution with a new ``wsl`` process.
+
+    Args:
+        script: Script passed to ``bash -c``
+        input: Optional data written to the script's stdin
+        distro_name: Distribution to run in; the default distribution when None
+        timeout: Optional timeout in seconds
+        text: Decode stdout and stderr as text instead of returning bytes
+
+    Returns:
+        The completed process
+    """
+    cmd = ['wsl']
+    if distro_name:
+        cmd += ['-d', distro_name]
+    cmd += ['--', '/bin/bash', '-c', script]
+    return subprocess.run(cmd, input=input, capture_output=True, text=text, timeout=timeout)
+
+
+def run_in_distro(script: str, distro_name: Optional[str] = None, input: Union[str, bytes, None] = None,
+                  text: bool = True, timeout: Optional[float] = None,
+                  allow_start: bool = True) -> subprocess.CompletedProcess:
+    """
+    Run a bash script in a distribution, reusing its warm shell session when enabled.
+
+    Sessions are controlled by the ``use_wsl_sessions`` setting; without them
+    every call starts a new ``wsl`` process.  Without an explicit timeout the
+    ``wsl_timeout`` setting applies, so a hanging command cannot block its
+    session forever.
+
+    With allow_start False the script only runs in an already running shell
+    session, which proves the distribution is up; a new ``wsl`` process
+    would boot a stopped distribution.
+
+    Raises:
+        subprocess.TimeoutExpired: If the script does not finish in time
+        SessionUnavailable: If allow_start is False and no session is running
+    """
+    if timeout is None:
+        timeout = settings.get('wsl_timeout')
+    if settings.get('use_wsl_sessions'):
+        return session_pool.run(distro_name, script, input, text, timeout, allow_start)
+    if not allow_start:
+        raise SessionUnavailable("WSL sessions are disabled")
+    if isinstance(input, bytes) and text:
+        input = input.decode('utf-8')
+    return run_wsl_bash(script, input, distro_name, timeout, text)
+
+
+def distro_runner(distro_name: Optional[str]) -> BashRunner:
+    """Return a BashRunner bound to one distribution."""
+    def run(script: str, input: Optional[str] = None) -> subprocess.CompletedProcess:
+        return run_in_distro(script, distro_name, input)
+    return run
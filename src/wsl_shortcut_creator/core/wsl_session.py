@@ -0,0 +1,413 @@
+"""Persistent shell sessions inside WSL distributions.
+
+Starting ``wsl.exe`` costs far more than the commands it runs, so instead of
+one ``wsl -- bash -c`` per request the application keeps one long-lived
+bash process per distribution and sends it requests over stdin.
+
+Each request is one line calling a small helper function defined when the
+session starts::
+
+    __wslsc_run <id> <base64 script> <base64 stdin>
+
+The helper runs the script in a subshell and answers with a frame::
+
+    \\n@@WSLSC <id> <returncode> <stdout length> <stderr length>\\n<stdout bytes><stderr bytes>
+
+Requests may be pipelined: several can be written before the first answer
+arrives.  Answers come back in order and are matched to requests by id.
+One shell runs its requests one after another, so the pool keeps up to
+``max_sessions`` shells per distribution and sends each request to the
+least busy one.  A shell that sat idle is pinged before it is reused, and a
+request that does not answer in time closes its shell.
+"""
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from itertools import count
+from typing import IO, Callable, Dict, List, Optional, Sequence, Tuple, Union, cast
+
+import atexit
+import base64
+import logging
+import subprocess
+import threading
+import time
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+FRAME_MARKER = b'@@WSLSC '
+
+# Shells kept per distribution; requests on one shell run serially
+MAX_SESSIONS_PER_DISTRO = 4
+# Seconds without requests after which a shell is pinged before it is reused
+PING_AFTER = 30.0
+PING_TIMEOUT = 5.0
+
+# Helper function installed in every session; see the module docstring
+SESSION_BOOTSTRAP = r'''
+__wslsc_run() {
+  local f e rc
+  f=$(mktemp) && e=$(mktemp) || { printf '\n@@WSLSC %s 255 0 0\n' "$1"; return; }
+  (eval "$(printf '%s' "$2" | base64 -d)") < <(printf '%s' "$3" | base64 -d) >"$f" 2>"$e"
+  rc=$?
+  printf '\n@@WSLSC %s %s %s %s\n' "$1" "$rc" "$(wc -c <"$f")" "$(wc -c <"$e")"
+  cat "$f" "$e"
+  rm -f "$f" "$e"
+}
+'''
+
+
+class SessionError(RuntimeError):
+    """Raised when a shell session has failed or been closed."""
+
+
+class SessionUnavailable(RuntimeError):
+    """Raised when a request may not start a shell and none is running."""
+
+
+def wsl_shell_command(distro_name: Optional[str]) -> List[str]:
+    """Return the command starting a session shell in a distribution."""
+    cmd = ['wsl']
+    if distro_name:
+        cmd += ['-d', distro_name]
+    return cmd + ['--', '/bin/bash', '--noprofile', '--norc']
+
+
+class WslSession:
+    """
+    One long-lived shell process answering framed requests.
+
+    Thread-safe: requests can be submitted from any thread.  At most
+    max_in_flight requests are outstanding at once; further submissions
+    block until an answer arrives.
+    """
+
+    def __init__(self, command: Sequence[str], max_in_flight: int = 8) -> None:
+        """
+        Args:
+            command: Command line starting a bash-compatible shell reading stdin
+            max_in_flight: Maximum number of pipelined requests
+        """
+        self.command = list(command)
+        self.last_used = time.monotonic()
+        self.closed = False
+        # Requests a SessionPool has routed here that have not been answered yet
+        self.reserved = 0
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._pending: Dict[int, Tuple[Future, str, bool]] = {}
+        self._process = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        # Both pipes were requested above, so neither is None
+        self._stdin = cast(IO[bytes], self._process.stdin)
+        self._stdout = cast(IO[bytes], self._process.stdout)
+        self._stdin.write(SESSION_BOOTSTRAP.encode('ascii'))
+        self._stdin.flush()
+        self._reader = threading.Thread(target=self._read_frames, name='wsl-session-reader', daemon=True)
+        self._reader.start()
+        logger.debug("Started shell session: %s", self.command)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests waiting for an answer."""
+        return len(self._pending)
+
+    def is_alive(self) -> bool:
+        """Return whether the shell process is still running."""
+        return not self.closed and self._process.poll() is None
+
+    def submit(self, script: str, input: Union[str, bytes, None] = None, text: bool = True) -> Future:
+        """
+        Send a request without waiting for its answer.
+
+        Args:
+            script: Bash script to run
+            input: Data written to the script's stdin
+            text: Decode stdout and stderr as UTF-8 instead of returning bytes
+
+        Returns:
+            A future resolving to a subprocess.CompletedProcess
+
+        Raises:
+            SessionError: If the session is closed or the shell cannot be written to
+        """
+        if isinstance(input, str):
+            input = input.encode('utf-8')
+        encoded_script = base64.b64encode(script.encode('utf-8')).decode('ascii')
+        encoded_input = base64.b64encode(input or b'').decode('ascii')
+        
+        self._slots.acquire()
+        future: Future = Future()
+        with self._lock:
+            if self.closed:
+                self._slots.release()
+                raise SessionError("Session is closed")
+            request_id = next(self._ids)
+            self._pending[request_id] = (future, script, text)
+        # Writes use their own lock so the reader thread is never blocked by a full stdin pipe
+        try:
+            with self._write_lock:
+                self._stdin.write(
+                    f"__wslsc_run {request_id} '{encoded_script}' '{encoded_input}'\n".encode('ascii')
+                )
+                self._stdin.flush()
+        except (OSError, ValueError) as e:
+            with self._lock:
+                entry = self._pending.pop(request_id, None)
+            if entry is not None:
+                self._slots.release()
+            raise SessionError(f"Session shell is not accepting requests: {e}") from e
+        self.last_used = time.monotonic()
+        return future
+
+    def run(self, script: str, input: Union[str, bytes, None] = None, text: bool = True,
+            timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """
+        Run a script and wait for its result.
+
+        Raises:
+            SessionError: If the session fails before answering
+            subprocess.TimeoutExpired: If no answer arrives in time; the session is closed
+        """
+        future = self.submit(script, input, text)
+        if timeout is None:
+            return future.result()
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            # The shell is busy with this request and cannot be reused
+            self.close()
+            raise subprocess.TimeoutExpired(script, timeout) from None
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        """Health check: return whether the shell answers a trivial request."""
+        try:
+            return self.run('echo ok', timeout=timeout).stdout.strip() == 'ok'
+        except (SessionError, subprocess.TimeoutExpired):
+            return False
+
+    def close(self) -> None:
+        """Stop the shell; outstanding requests fail with SessionError."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        try:
+            self._stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        if threading.current_thread() is not self._reader:
+            self._reader.join(timeout=1)
+        self._fail_pending(SessionError("Session closed"))
+        logger.debug("Closed shell session: %s", self.command)
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self._stdout.read(size) if size else b''
+        if len(data) != size:
+            raise SessionError("Session ended in the middle of a response")
+        return data
+
+    def _read_frames(self) -> None:
+        stream = self._stdout
+        error = SessionError("Session shell exited")
+        try:
+            while True:
+                line = stream.readline()
+                if not line:
+                    break
+                if not line.startswith(FRAME_MARKER):
+                    continue  # Output outside of a frame, e.g. from the shell itself
+                request_id, returncode, out_size, err_size = (
+                    int(field) for field in line[len(FRAME_MARKER):].split()
+                )
+                stdout = self._read_exact(out_size)
+                stderr = self._read_exact(err_size)
+                with self._lock:
+                    entry = self._pending.pop(request_id, None)
+                if entry is None:
+                    continue
+                future, script, text = entry
+                self._slots.release()
+                if text:
+                    future.set_result(subprocess.CompletedProcess(
+                        script, returncode, stdout.decode('utf-8', 'replace'), stderr.decode('utf-8', 'replace')
+                    ))
+                else:
+                    future.set_result(subprocess.CompletedProcess(script, returncode, stdout, stderr))
+        except (OSError, ValueError, SessionError) as e:
+            error = SessionError(f"Session protocol error: {e}")
+        with self._lock:
+            self.closed = True
+        self._fail_pending(error)
+
+    def _fail_pending(self, error: SessionError) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, _, _ in pending.values():
+            self._slots.release()
+            future.set_exception(error)
+
+
+class SessionPool:
+    """
+    Warm shell sessions keyed by distribution.
+
+    Sessions are started on demand, up to max_sessions per distribution
+    while the existing ones are busy.  Dead sessions are replaced, sessions
+    idle for longer than ping_after seconds are health-checked before reuse
+    and sessions are shut down after idle_timeout seconds without requests.
+    """
+
+    def __init__(self, command_factory: Callable[[Optional[str]], List[str]] = wsl_shell_command,
+                 idle_timeout: float = 300.0, max_in_flight: int = 8,
+                 max_sessions: int = MAX_SESSIONS_PER_DISTRO, ping_after: float = PING_AFTER,
+                 ping_timeout: float = PING_TIMEOUT) -> None:
+        self.command_factory = command_factory
+        self.idle_timeout = idle_timeout
+        self.max_in_flight = max_in_flight
+        self.max_sessions = max_sessions
+        self.ping_after = ping_after
+        self.ping_timeout = ping_timeout
+        self._sessions: Dict[Optional[str], List[WslSession]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    def session(self, distro_name: Optional[str] = None) -> WslSession:
+        """Return a live session for a distribution, starting one if all are busy."""
+        session = self._checkout(distro_name)
+        self._release(session)
+        return session
+
+    def _checkout(self, distro_name: Optional[str], allow_start: bool = True) -> WslSession:
+        """Pick the least busy live session and reserve it; release it with _release."""
+        while True:
+            with self._lock:
+                sessions = self._sessions.get(distro_name, [])
+                alive = [session for session in sessions if session.is_alive()]
+                if len(alive) < len(sessions):
+                    logger.info("Replacing dead shell session for %s", distro_name or 'default distribution')
+                if not alive and not allow_start:
+                    self._sessions[distro_name] = alive
+                    raise SessionUnavailable(f"No shell session running for {distro_name or 'default distribution'}")
+                session = min(alive, key=self._load, default=None)
+                if session is None or (self._load(session) and len(alive) < self.max_sessions):
+                    session = WslSession(self.command_factory(distro_name), self.max_in_flight)
+                    alive.append(session)
+                    self._start_reaper()
+                self._sessions[distro_name] = alive
+                idle = not self._load(session)
+                session.reserved += 1
+            if not idle or time.monotonic() - session.last_used <= self.ping_after:
+                return session
+            # Health check before reusing a shell that has been idle for a while
+            if session.ping(self.ping_timeout):
+                return session
+            logger.warning("Shell session for %s did not answer; replacing it",
+                           distro_name or 'default distribution')
+            self._release(session)
+            session.close()
+
+    def _release(self, session: WslSession) -> None:
+        with self._lock:
+            session.reserved -= 1
+
+    @staticmethod
+    def _load(session: WslSession) -> int:
+        return max(session.in_flight, session.reserved)
+
+    def run(self, distro_name: Optional[str], script: str, input: Union[str, bytes, None] = None,
+            text: bool = True, timeout: Optional[float] = None,
+            allow_start: bool = True) -> subprocess.CompletedProcess:
+        """
+        Run a script in a distribution's session.
+
+        A request that fails because its session died is retried once on a
+        fresh session, so scripts should be safe to run twice.
+
+        Args:
+            allow_start: Start a shell if none is running; starting one boots a
+                stopped distribution
+
+        Raises:
+            SessionUnavailable: If allow_start is False and no shell is running
+        """
+        try:
+            return self._run_once(distro_name, script, input, text, timeout, allow_start)
+        except SessionError as e:
+            logger.warning("Shell session failed (%s); retrying on a new session", e)
+            return self._run_once(distro_name, script, input, text, timeout, allow_start)
+
+    def _run_once(self, distro_name: Optional[str], script: str, input: Union[str, bytes, None],
+                  text: bool, timeout: Optional[float], allow_start: bool) -> subprocess.CompletedProcess:
+        session = self._checkout(distro_name, allow_start)
+        try:
+            return session.run(script, input, text, timeout)
+        finally:
+            self._release(session)
+
+    def session_count(self, distro_name: Optional[str] = None) -> int:
+        """Number of sessions held by the pool, for one distribution or in total."""
+        with self._lock:
+            if distro_name is not None:
+                return len(self._sessions.get(distro_name, []))
+            return sum(len(sessions) for sessions in self._sessions.values())
+
+    def runner(self, distro_name: Optional[str]) -> Callable[..., subprocess.CompletedProcess]:
+        """Return a BashRunner executing in the distribution's session."""
+        def run(script: str, input: Optional[str] = None) -> subprocess.CompletedProcess:
+            return self.run(distro_name, script, input)
+        return run
+
+    def close_idle(self) -> int:
+        """Close sessions without requests for longer than idle_timeout; returns how many."""
+        now = time.monotonic()
+        idle: List[WslSession] = []
+        with self._lock:
+            for name, sessions in list(self._sessions.items()):
+                expired = [
+                    session for session in sessions
+                    if not self._load(session) and now - session.last_used > self.idle_timeout
+                ]
+                idle += expired
+                remaining = [session for session in sessions if session not in expired]
+                if remaining:
+                    self._sessions[name] = remaining
+                else:
+                    del self._sessions[name]
+        for session in idle:
+            session.close()
+        return len(idle)
+
+    def close_all(self) -> None:
+        """Close every session and stop the idle reaper."""
+        self._stop.set()
+        with self._lock:
+            sessions = [session for group in self._sessions.values() for session in group]
+            self._sessions = {}
+        for session in sessions:
+            session.close()
+
+    def _start_reaper(self) -> None:
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._stop.clear()
+        self._reaper = threading.Thread(target=self._reap, name='wsl-session-reaper', daemon=True)
+        self._reaper.start()
+
+    def _reap(self) -> None:
+        interval = max(0.05, min(self.idle_timeout / 2, 30.0))
+        while not self._stop.wait(interval):
+            self.close_idle()
+
+
+# Global session pool
+session_pool = SessionPool()
+atexit.register(session_pool.close_all)
@@ -0,0 +1,62 @@
+"""Running blocking work on a worker thread and reporting back to the GUI thread."""
+from typing import Any, Callable, cast
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+import logging
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+
+class _TaskSignals(QObject):
+    """Signals emitted by background tasks (QRunnable cannot emit itself)."""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class BackgroundTask(QRunnable):
+    """
+    Run a blocking function on the global thread pool.
+
+    The result or the raised exception is delivered through queued signals,
+    so the connected slots run on the GUI thread.
+    """
+
+    def __init__(self, func: Callable[..., Any], *args: Any) -> None:
+        super().__init__()
+        # The owner keeps a reference while the task runs; Qt must not delete it
+        self.setAutoDelete(False)
+        self.func = func
+        self.args = args
+        self.signals = _TaskSignals()
+
+    def run(self) -> None:
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            logger.debug("Background task %s failed", getattr(self.func, '__name__', self.func), exc_info=True)
+            self.signals.failed.emit(e)
+            return
+        self.signals.finished.emit(result)
+
+
+def run_in_background(func: Callable[..., Any], on_finished: Callable[[Any], None],
+                      on_failed: Callable[[Exception], None], *args: Any) -> BackgroundTask:
+    """
+    Start func(*args) on a worker thread.
+
+    Args:
+        func: Blocking function; must not touch widgets
+        on_finished: Called on the GUI thread with the result
+        on_failed: Called on the GUI thread with the exception
+
+    Returns:
+        The task; keep a reference until one of the callbacks ran
+    """
+    task = BackgroundTask(func, *args)
+    task.signals.finished.connect(on_finished)
+    task.signals.failed.connect(on_failed)
+    # The global pool exists for the lifetime of the application
+    cast(QThreadPool, QThreadPool.globalInstance()).start(task)
+    return task
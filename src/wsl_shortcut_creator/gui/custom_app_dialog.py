@@ -36,7 +36,7 @@ class CustomAppDialog(QDialog):
         icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'imgs', 'Logo.ico')
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
-            logger.debug(f"Set dialog icon from {icon_path}")
+            logger.debug("Set dialog icon from %s", icon_path)
         
         self.setup_ui()
     
@@ -177,7 +177,7 @@ class CustomAppDialog(QDialog):
             return ico_path
             
         except Exception as e:
-            print(f"Error converting image: {e}")
+            logger.error("Error converting image %s: %s", image_path, e)
             return None
 
     def browse_icon(self) -> None:
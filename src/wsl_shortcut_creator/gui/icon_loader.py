@@ -0,0 +1,227 @@
+"""Lazy, cached icon thumbnails for list widgets."""
+from typing import Callable, Optional, Set, cast
+
+from PyQt5.QtWidgets import QListWidget, QListWidgetItem, QScrollBar, QWidget
+from PyQt5.QtCore import QAbstractItemModel, QObject, QPoint, QRunnable, QSize, Qt, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon, QImage, QPixmap, QPixmapCache
+
+import logging
+
+from .ui_constants import ICON_SETTINGS
+from ..core.icons import icon_cache_key
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+# Item data role holding the icon reference of a list row
+ICON_REF_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class IconUnavailable(Exception):
+    """Raised by a fetch function when an icon cannot be read right now but may be later."""
+
+
+class _LoaderSignals(QObject):
+    """Signals emitted by icon decode jobs (QRunnable cannot emit itself)."""
+    loaded = pyqtSignal(str, object)
+    skipped = pyqtSignal(str)
+    deferred = pyqtSignal(str)
+
+
+class _IconJob(QRunnable):
+    """Fetch and decode a single icon on a worker thread."""
+
+    def __init__(self, loader: 'LazyIconLoader', key: str, icon_ref: str) -> None:
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.icon_ref = icon_ref
+        self.signals = loader.signals
+
+    def run(self) -> None:
+        # The row may have scrolled out of view while the job was queued
+        if not self.loader.is_wanted(self.key):
+            self.signals.skipped.emit(self.key)
+            return
+        image = None
+        try:
+            data = self.loader.fetch(self.icon_ref)
+            if data:
+                decoded = QImage.fromData(data)
+                if not decoded.isNull():
+                    size = self.loader.icon_size
+                    image = decoded.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                           Qt.TransformationMode.SmoothTransformation)
+        except IconUnavailable:
+            # Not cached, so the icon is fetched again after retry_deferred()
+            self.signals.deferred.emit(self.key)
+            return
+        except Exception as e:
+            logger.debug("Error decoding icon %s: %s", self.icon_ref, e)
+        self.signals.loaded.emit(self.key, image)
+
+
+class LazyIconLoader(QObject):
+    """
+    Decorate the visible rows of a QListWidget with icons loaded on demand.
+    
+    Each row stores an icon reference under ICON_REF_ROLE (or the reference is
+    derived from the row by the icon_ref function).  Only rows inside
+    the viewport (plus a prefetch margin) are decorated; icons are fetched and
+    decoded on a thread pool and kept in the bounded global QPixmapCache keyed
+    by the hash of their reference.  Rows that leave the viewport drop their
+    icon so memory use stays bounded by the cache limit.
+    
+    A fetch function that raises IconUnavailable gets the fallback icon shown
+    without caching it; call retry_deferred once the icons can be read.
+    """
+
+    def __init__(self, list_widget: QListWidget, fetch: Callable[[str], Optional[bytes]],
+                 fallback: Optional[QIcon] = None,
+                 icon_ref: Optional[Callable[[QListWidgetItem], Optional[str]]] = None) -> None:
+        """
+        Args:
+            list_widget: The list whose rows should be decorated
+            fetch: Blocking function returning image bytes for an icon reference, None if
+                there is none, or raising IconUnavailable if it cannot be read yet
+            fallback: Icon used for rows whose icon could not be loaded
+            icon_ref: Function deriving a row's icon reference; reads ICON_REF_ROLE by default
+        """
+        super().__init__(list_widget)
+        self.list_widget = list_widget
+        self.fetch = fetch
+        self.icon_ref = icon_ref or (lambda item: item.data(ICON_REF_ROLE))
+        self.fallback = fallback or QIcon()
+        self.icon_size: int = ICON_SETTINGS['size']
+        self.prefetch_rows: int = ICON_SETTINGS['prefetch_rows']
+        self.signals = _LoaderSignals(self)
+        self.signals.loaded.connect(self._on_loaded)
+        self.signals.skipped.connect(self._on_skipped)
+        self.signals.deferred.connect(self._on_deferred)
+        
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(ICON_SETTINGS['worker_threads'])
+        self._wanted: Set[str] = set()
+        self._pending: Set[str] = set()
+        self._decorated: Set[int] = set()
+        self._deferred: Set[str] = set()
+        
+        if QPixmapCache.cacheLimit() < ICON_SETTINGS['cache_kb']:
+            QPixmapCache.setCacheLimit(ICON_SETTINGS['cache_kb'])
+        
+        list_widget.setIconSize(QSize(self.icon_size, self.icon_size))
+        list_widget.setUniformItemSizes(True)
+        
+        # Coalesce bursts of scroll and model events into one update per turn
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(ICON_SETTINGS['update_delay_ms'])
+        self._update_timer.timeout.connect(self.update_visible)
+        
+        # A list widget always has its scroll bar, viewport and model
+        cast(QScrollBar, list_widget.verticalScrollBar()).valueChanged.connect(self.schedule_update)
+        model = cast(QAbstractItemModel, list_widget.model())
+        model.rowsInserted.connect(self.schedule_update)
+        model.rowsRemoved.connect(self.schedule_update)
+        model.modelReset.connect(self._decorated.clear)
+        model.modelReset.connect(self.schedule_update)
+
+    def schedule_update(self, *args) -> None:
+        """Request an update of the visible rows on the next event-loop turn."""
+        self._update_timer.start()
+
+    def is_wanted(self, key: str) -> bool:
+        """Return whether an icon is still needed by a visible row (thread-safe)."""
+        return key in self._wanted
+
+    def visible_rows(self) -> range:
+        """Return the rows inside the viewport extended by the prefetch margin."""
+        count = self.list_widget.count()
+        if not count:
+            return range(0)
+        viewport = cast(QWidget, self.list_widget.viewport()).rect()
+        x = viewport.center().x()
+        first = self.list_widget.indexAt(QPoint(x, viewport.top() + 1))
+        last = self.list_widget.indexAt(QPoint(x, viewport.bottom() - 1))
+        first_row = first.row() if first.isValid() else 0
+        last_row = last.row() if last.isValid() else count - 1
+        return range(max(0, first_row - self.prefetch_rows),
+                     min(count, last_row + self.prefetch_rows + 1))
+
+    def update_visible(self) -> None:
+        """Set icons on visible rows, queue missing ones and release hidden ones."""
+        rows = self.visible_rows()
+        count = self.list_widget.count()
+        
+        for row in self._decorated.difference(rows):
+            hidden = self.list_widget.item(row) if row < count else None
+            if hidden is not None:
+                hidden.setIcon(QIcon())
+        self._decorated.intersection_update(rows)
+        
+        wanted = set()
+        jobs = []
+        for row in rows:
+            item = self.list_widget.item(row)
+            if item is None or (row in self._decorated and not item.icon().isNull()):
+                continue
+            icon_ref = self.icon_ref(item)
+            if not icon_ref:
+                continue
+            key = icon_cache_key(icon_ref)
+            if key in self._deferred:
+                item.setIcon(self.fallback)
+                self._decorated.add(row)
+                continue
+            pixmap = QPixmapCache.find(key)
+            if pixmap is not None and not pixmap.isNull():
+                item.setIcon(QIcon(pixmap))
+                self._decorated.add(row)
+                continue
+            wanted.add(key)
+            if key not in self._pending:
+                self._pending.add(key)
+                jobs.append(_IconJob(self, key, icon_ref))
+        # Replaced atomically so worker threads always see a consistent set, and
+        # before the jobs start so they do not find their own key unwanted
+        self._wanted = wanted
+        for job in jobs:
+            self._pool.start(job)
+
+    def _on_loaded(self, key: str, image: Optional[QImage]) -> None:
+        """Store a decoded icon in the cache and decorate the rows using it."""
+        self._pending.discard(key)
+        if image is not None:
+            pixmap = QPixmap.fromImage(image)
+        else:
+            pixmap = self.fallback.pixmap(self.icon_size, self.icon_size)
+            if pixmap.isNull():
+                # Cache a blank thumbnail so the icon is not fetched again
+                pixmap = QPixmap(self.icon_size, self.icon_size)
+                pixmap.fill(Qt.GlobalColor.transparent)
+        QPixmapCache.insert(key, pixmap)
+        self.schedule_update()
+
+    def _on_skipped(self, key: str) -> None:
+        self._pending.discard(key)
+
+    def _on_deferred(self, key: str) -> None:
+        """Show the fallback for an icon that cannot be read yet, without caching it."""
+        self._pending.discard(key)
+        self._deferred.add(key)
+        self.schedule_update()
+
+    def retry_deferred(self) -> None:
+        """Fetch the icons that were unavailable again, e.g. once their source can be read."""
+        if not self._deferred:
+            return
+        self._deferred.clear()
+        # Rows showing the fallback are decorated; re-check them all
+        self._decorated.clear()
+        self.schedule_update()
+
+    def shutdown(self) -> None:
+        """Drop queued jobs and wait for running ones to finish."""
+        self._wanted = set()
+        self._pool.clear()
+        self._pool.waitForDone()
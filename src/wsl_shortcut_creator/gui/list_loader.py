@@ -0,0 +1,80 @@
+"""Incremental population of list widgets from large iterables."""
+from itertools import islice
+from typing import Iterator, List, Optional
+
+from PyQt5.QtWidgets import QListWidget
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+import logging
+
+from .ui_constants import LIST_LOADING
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+
+class ChunkedListLoader(QObject):
+    """
+    Append rows to a QListWidget in chunks between event-loop turns.
+    
+    The first, small chunk is inserted synchronously so rows appear at once;
+    the rest follows in larger chunks on zero-delay timer ticks, keeping the
+    window responsive while huge folders are listed.
+    """
+
+    # Emitted with the total number of rows added once the iterable is exhausted
+    finished = pyqtSignal(int)
+
+    def __init__(self, list_widget: QListWidget, first_chunk: Optional[int] = None,
+                 chunk: Optional[int] = None) -> None:
+        super().__init__(list_widget)
+        self.list_widget = list_widget
+        self.first_chunk = first_chunk or LIST_LOADING['first_chunk']
+        self.chunk = chunk or LIST_LOADING['chunk']
+        self.count = 0
+        self._texts: Optional[Iterator[str]] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._add_next_chunk)
+
+    def is_running(self) -> bool:
+        """Return whether rows are still being added."""
+        return self._texts is not None
+
+    def start(self, texts: Iterator[str]) -> None:
+        """Cancel any running load and start appending the given row texts."""
+        self.cancel()
+        self._texts = texts
+        self.count = 0
+        self._add_chunk(self.first_chunk)
+
+    def cancel(self) -> None:
+        """Stop a running load, keeping the rows added so far."""
+        self._timer.stop()
+        if self._texts is not None:
+            close = getattr(self._texts, 'close', None)
+            if close:
+                close()
+            self._texts = None
+
+    def _add_next_chunk(self) -> None:
+        self._add_chunk(self.chunk)
+
+    def _add_chunk(self, size: int) -> None:
+        if self._texts is None:
+            return
+        try:
+            texts: List[str] = list(islice(self._texts, size))
+        except OSError as e:
+            # The folder may disappear while it is being listed
+            logger.warning("Stopped loading list rows: %s", e)
+            texts, size = [], 1
+        if texts:
+            self.list_widget.addItems(texts)
+            self.count += len(texts)
+        if len(texts) < size:
+            self._texts = None
+            self.finished.emit(self.count)
+        else:
+            self._timer.start()
@@ -1,23 +1,47 @@
 """Main window for the WSL Shortcut Creator application."""
-from typing import Dict, Optional, Union, TypedDict
+from typing import Dict, List, Optional, Set, Tuple, Union, TypedDict, cast
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QListWidget, QPushButton, QAbstractItemView
+    QLabel, QListWidget, QListWidgetItem, QPushButton, QAbstractItemView, QStyle, QMessageBox,
+    QShortcut, QFileDialog
 )
 from PyQt5.QtCore import QTimer
-from PyQt5.QtGui import QIcon
+from PyQt5.QtGui import QCloseEvent, QColor, QIcon, QKeySequence
 
+import datetime
 import os
 import logging
+import sqlite3
 import subprocess
+import threading
+import time
 
 from .ui_constants import COLORS, STYLES
 from .custom_app_dialog import AppInfo, CustomAppDialog
+from .icon_loader import ICON_REF_ROLE, IconUnavailable, LazyIconLoader
+from .background import BackgroundTask, run_in_background
+from .list_loader import ChunkedListLoader
+from ..config import dump_ring_buffer, log_event, settings
+from ..core.deploy import LISTED_ROOT, ShortcutDeployer, deploy_roots, remove_copies
+from ..core.desktop_entries import ScanStats
+from ..core.distros import STATE_RUNNING, DistroInfo, boot_distro, find_distro, is_running, list_distros
+from ..core.sources import AppRecord, ApplicationScanner, discover_registry
+from ..core.wsl import distro_runner
+from ..core.wsl_session import SessionUnavailable, session_pool
+from ..core.health import STATUS_BROKEN, ShortcutHealth, check_shortcuts, parse_launch_target, prune_broken
+from ..core.icons import fetch_icon_bytes
+from ..core.index_db import ShortcutEntry, ShortcutIndex, default_index_path
+from ..core.lnk import ShortcutFormatError, read_shortcut
+from ..core.shortcuts import iter_shortcut_names, shortcut_folder
+from ..core.shortcut_writer import create_writer, make_wsl_shortcut_spec, split_icon_location
 
 # Setup module logger
 logger = logging.getLogger(__name__)
 
+# Seconds an icon fetch may rely on the last state check before listing distributions again
+STATE_CHECK_INTERVAL = 10.0
+
 class WSLDistroInfo(TypedDict):
     """Type definition for WSL distribution information"""
     name: Optional[str]
@@ -42,9 +66,20 @@ class MainWindow(QMainWindow):
         super().__init__()
         
         # Initialize instance variables
+        self.last_scan_stats: Optional[ScanStats] = None
+        self.app_scanner: Optional[ApplicationScanner] = None
+        self.distro: Optional[DistroInfo] = None
+        self.health_task: Optional[BackgroundTask] = None
+        self.index_sync_task: Optional[BackgroundTask] = None
+        # (monotonic time, running) of the last state check made by an icon fetch
+        self.state_check: Tuple[float, bool] = (float('-inf'), False)
+        self.state_check_lock = threading.Lock()
         self.distro_name, self.folder_name = self.get_wsl_distro_info()
         if not self.distro_name:
             logger.error("No WSL distribution found")
+        # Resolve the Start Menu folder once; it is used for every list and file operation
+        self.shortcut_dir: Optional[str] = shortcut_folder(self.folder_name) if self.folder_name else None
+        self.index = self._open_index()
             
         # Set up window properties
         self.setWindowTitle("WSL Shortcut Creator")
@@ -54,7 +89,7 @@ class MainWindow(QMainWindow):
         icon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'images', 'Logo.ico')
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
-            logger.debug(f"Set window icon from {icon_path}")
+            logger.debug("Set window icon from %s", icon_path)
         
         # Initialize UI
         self.init_ui()
@@ -90,6 +125,12 @@ class MainWindow(QMainWindow):
         self.add_custom_btn.clicked.connect(self.add_custom_application)
         app_layout.addWidget(self.add_custom_btn)
         
+        # Rescan button; starts the distribution first if it is stopped
+        self.rescan_btn = QPushButton("Rescan Applications")
+        self.rescan_btn.setStyleSheet(STYLES['button'])
+        self.rescan_btn.clicked.connect(self.rescan_applications)
+        app_layout.addWidget(self.rescan_btn)
+        
         lists_layout.addLayout(app_layout)
         
         # Action buttons
@@ -121,14 +162,35 @@ class MainWindow(QMainWindow):
         self.remove_shortcut_btn.clicked.connect(self.remove_shortcut)
         shortcut_layout.addWidget(self.remove_shortcut_btn)
         
+        # Check shortcut targets button
+        self.check_shortcuts_btn = QPushButton("Check Shortcuts")
+        self.check_shortcuts_btn.setStyleSheet(STYLES['button'])
+        self.check_shortcuts_btn.clicked.connect(self.check_shortcut_health)
+        shortcut_layout.addWidget(self.check_shortcuts_btn)
+        
         lists_layout.addLayout(shortcut_layout)
         
         layout.addLayout(lists_layout)
         
+        # Load row icons lazily for the visible part of each list
+        fallback_icon = cast(QStyle, self.style()).standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+        self.app_icons = LazyIconLoader(self.app_listbox, self._fetch_icon, fallback_icon)
+        self.shortcut_icons = LazyIconLoader(
+            self.shortcuts_listbox, self._fetch_icon, fallback_icon, self._shortcut_icon_ref
+        )
+        
+        # Stream shortcut rows in chunks so large folders do not block the window
+        self.shortcut_rows = ChunkedListLoader(self.shortcuts_listbox)
+        self.shortcut_rows.finished.connect(self._on_shortcuts_loaded)
+        
         # Status label
         self.status_label = QLabel("Ready")
         self.status_label.setStyleSheet(STYLES['status_label'])
         layout.addWidget(self.status_label)
+        
+        # Save the in-memory log for bug reports
+        save_log_shortcut = QShortcut(QKeySequence("Ctrl+Shift+L"), self)
+        save_log_shortcut.activated.connect(self.save_diagnostic_log)
     
     def update_status(self, message: str, is_error: bool = False) -> None:
         """
@@ -169,45 +231,34 @@ class MainWindow(QMainWindow):
         """
         Load existing shortcuts from the WSL default location.
         
-        This method scans the Windows Start Menu directory for the current WSL
-        distribution and populates the shortcuts listbox with any .lnk files found.
+        This method streams the .lnk files in the Windows Start Menu directory for
+        the current WSL distribution into the shortcuts listbox.  Rows are added in
+        chunks between event-loop turns so huge folders do not block the window;
+        the status is updated once loading finishes.
         """
         try:
-            if not self.folder_name:
+            if not self.shortcut_dir:
                 self.update_status("No WSL distribution detected", True)
                 logger.warning("No folder name available")
                 return
                 
-            # Clean up the folder name and normalize it for Windows paths
-            folder_name = self.folder_name
-            start_menu = os.path.expandvars(
-                os.path.join('%AppData%', 'Microsoft', 'Windows', 'Start Menu', 'Programs', folder_name)
-            )
-            logger.debug(f"Looking for shortcuts in: {start_menu}")
+            start_menu = self.shortcut_dir
+            logger.debug("Looking for shortcuts in: %s", start_menu)
             
             # Clear existing items before adding new ones
+            self.shortcut_rows.cancel()
             self.shortcuts_listbox.clear()
             
             if os.path.exists(start_menu):
-                shortcuts = [f for f in os.listdir(start_menu) if f.endswith('.lnk')]
-                logger.debug(f"Found shortcuts: {shortcuts}")
-                
-                for shortcut in shortcuts:
-                    self.shortcuts_listbox.addItem(shortcut)
-                    logger.debug(f"Added shortcut to list: {shortcut}")
-                
-                self.update_status(
-                    "No shortcuts found" if not shortcuts 
-                    else f"Found {len(shortcuts)} shortcut{'s' if len(shortcuts) != 1 else ''}"
-                )
+                self.shortcut_rows.start(iter_shortcut_names(start_menu))
             else:
-                logger.info(f"WSL shortcuts folder not found at: {start_menu}")
+                logger.info("WSL shortcuts folder not found at: %s", start_menu)
                 try:
                     os.makedirs(start_menu)
-                    logger.info(f"Created shortcuts directory: {start_menu}")
+                    logger.info("Created shortcuts directory: %s", start_menu)
                     self.update_status("Created shortcuts folder - ready to add shortcuts")
                 except Exception as e:
-                    logger.error(f"Error creating directory: {e}")
+                    logger.error("Error creating directory: %s", e)
                     self.update_status(f"Could not create shortcuts folder: {e}", True)
                 
         except Exception as e:
@@ -215,6 +266,60 @@ class MainWindow(QMainWindow):
             logger.error(error_msg, exc_info=True)
             self.update_status(error_msg, True)
 
+    def _on_shortcuts_loaded(self, count: int) -> None:
+        """Report the number of shortcuts once the list has been populated and update the index."""
+        logger.debug("Loaded %d shortcuts", count)
+        self.update_status(
+            "No shortcuts found" if not count
+            else f"Found {count} shortcut{'s' if count != 1 else ''}"
+        )
+        if self.index is not None and self.index.path != ':memory:' and self.distro_name and self.shortcut_dir:
+            # Reading the files and writing the index both happen on a worker thread
+            self.index_sync_task = run_in_background(
+                self._sync_listed_shortcuts, self._on_listed_shortcuts_synced,
+                lambda error: logger.warning("Could not update the shortcut index: %s", error),
+                self.index.path, self.distro_name, self.shortcut_dir
+            )
+
+    @classmethod
+    def _sync_listed_shortcuts(cls, index_path: str, distro_name: str, directory: str) -> int:
+        """
+        Replace the indexed shortcuts of a distribution with the files in its folder.
+
+        Runs on a worker thread with its own database connection, which WAL
+        mode allows next to the window's connection.  Unreadable files are
+        skipped.
+
+        Returns:
+            The number of shortcuts recorded
+        """
+        entries = []
+        for name in iter_shortcut_names(directory):
+            path = os.path.join(directory, name)
+            try:
+                info = read_shortcut(path)
+            except (OSError, ShortcutFormatError) as e:
+                logger.debug("Skipping %s in the index: %s", path, e)
+                continue
+            entries.append(cls._index_entry(path, info['arguments'], info['icon_location']))
+        index = ShortcutIndex(index_path)
+        try:
+            index.sync_shortcuts(distro_name, entries)
+        finally:
+            index.close()
+        return len(entries)
+
+    def _on_listed_shortcuts_synced(self, count: int) -> None:
+        """Note that the index matches the shortcuts folder again."""
+        self.index_sync_task = None
+        logger.debug("Synced %d shortcuts to the index", count)
+
+    def _shortcut_icon_ref(self, item: QListWidgetItem) -> str:
+        """Derive the icon reference of a shortcuts list row from its file name."""
+        if not self.shortcut_dir:
+            return ''
+        return f"lnk:{os.path.join(self.shortcut_dir, item.text())}"
+
     def remove_shortcut(self) -> None:
         """
         Remove the selected shortcut(s) from both the list and the file system.
@@ -225,27 +330,34 @@ class MainWindow(QMainWindow):
         if not selected_items:
             self.update_status("Please select a shortcut to remove", True)
             return
+        if not self.shortcut_dir:
+            self.update_status("No shortcuts folder found", True)
+            return
         
         try:
             removed_count = 0
+            removed_paths = []
+            roots = deploy_roots(self.folder_name) if self.folder_name else []
             for item in selected_items:
                 shortcut_name = item.text()
-                # Clean up the folder name and create the shortcut path
-                folder_name = self.folder_name
-                shortcut_path = os.path.expandvars(
-                    os.path.join('%AppData%', 'Microsoft', 'Windows', 'Start Menu', 'Programs', folder_name, shortcut_name)
-                )
+                shortcut_path = os.path.join(self.shortcut_dir, shortcut_name)
                 if os.path.exists(shortcut_path):
                     try:
+                        # Identical copies deployed to the other folders go as well
+                        remove_copies(shortcut_path, roots)
                         os.remove(shortcut_path)
                         self.shortcuts_listbox.takeItem(self.shortcuts_listbox.row(item))
+                        removed_paths.append(shortcut_path)
                         removed_count += 1
-                        logger.debug(f"Removed shortcut: {shortcut_path}")
+                        logger.debug("Removed shortcut: %s", shortcut_path)
                     except Exception as e:
-                        logger.error(f"Failed to remove shortcut {shortcut_name}: {e}")
+                        logger.error("Failed to remove shortcut %s: %s", shortcut_name, e)
                         self.update_status(f"Error removing {shortcut_name}: {e}", True)
                         continue
             
+            if self.index is not None and self.distro_name:
+                self.index.remove_shortcuts(self.distro_name, removed_paths)
+            
             if removed_count > 0:
                 self.update_status(
                     f"Successfully removed {removed_count} shortcut{'s' if removed_count != 1 else ''}"
@@ -268,52 +380,150 @@ class MainWindow(QMainWindow):
             logger.error(error_msg, exc_info=True)
             self.update_status(error_msg, True)
 
-    def load_wsl_applications(self) -> None:
+    def check_shortcut_health(self) -> None:
         """
-        Load WSL applications by scanning common installation directories.
+        Check whether the applications behind the existing shortcuts still exist.
         
-        This method searches for .desktop files in standard Linux application directories
-        and extracts application names from them.
+        All shortcut targets are verified with a single WSL call on a worker
+        thread, so the window stays responsive.  Broken shortcuts are then
+        highlighted in the list and the user is offered to remove them.
         """
+        if not self.shortcut_dir or not os.path.isdir(self.shortcut_dir):
+            self.update_status("No shortcuts folder to check", True)
+            return
+        if self.health_task is not None:
+            return
+        
+        # Checking targets needs the distribution, so a stopped one is started
+        boot = self.distro is not None and not is_running(self.distro)
+        if boot:
+            log_event(logger, logging.INFO, 'distro_boot', distro=self.distro_name, reason='health_check')
+        self.update_status(f"Starting {self.distro_name} and checking shortcuts..." if boot else "Checking shortcuts...")
+        self.check_shortcuts_btn.setEnabled(False)
+        self.health_task = run_in_background(
+            self._check_shortcuts_job, self._on_shortcuts_checked, self._on_shortcut_check_failed,
+            self.shortcut_dir, boot
+        )
+
+    def _check_shortcuts_job(self, directory: str, boot: bool) -> List[ShortcutHealth]:
+        """Start the distribution if needed and check the shortcuts; runs on a worker thread."""
+        if boot and self.distro_name:
+            boot_distro(self.distro_name)
+        return check_shortcuts(directory, distro_runner(self.distro_name), self.distro_name)
+
+    def _on_shortcut_check_failed(self, error: Exception) -> None:
+        """Report a failed shortcut check."""
+        self.health_task = None
+        self.check_shortcuts_btn.setEnabled(True)
+        self.update_status(f"Error checking shortcuts: {error}", True)
+
+    def _on_shortcuts_checked(self, reports: List[ShortcutHealth]) -> None:
+        """Show the result of the shortcut check and offer to remove broken shortcuts."""
+        self.health_task = None
+        self.check_shortcuts_btn.setEnabled(True)
+        if self.distro is not None:
+            # The check ran inside the distribution, so it is running now
+            self._mark_distro_running()
         try:
-            self.update_status("Scanning for WSL applications...")
-            self.app_listbox.clear()
+            if self.index is not None and self.distro_name:
+                self.index.sync_shortcuts(self.distro_name, [
+                    self._index_entry(report['path'], report['arguments'], report['icon_location'])
+                    for report in reports
+                ])
+            broken = {report['name']: report for report in reports if report['status'] == STATUS_BROKEN}
             
-            search_paths = [
-                '/usr/share/applications/*.desktop',
-                '/var/lib/snapd/desktop/applications/*.desktop',
-                '~/.local/share/applications/*.desktop'
-            ]
+            for row in range(self.shortcuts_listbox.count()):
+                item = self.shortcuts_listbox.item(row)
+                report = broken.get(item.text()) if item is not None else None
+                if item is not None and report:
+                    item.setForeground(QColor(COLORS['danger']))
+                    item.setToolTip(report['reason'] or "")
             
-            apps_found = 0
-            for search_path in search_paths:
-                cmd = f'wsl -- ls {search_path}'
-                logger.debug(f"Executing command: {cmd}")
-                result = subprocess.run(cmd, capture_output=True, text=True, shell=True)
+            if not broken:
+                self.update_status(f"All {len(reports)} shortcut{'s' if len(reports) != 1 else ''} are working")
+                return
+            
+            self.update_status(f"{len(broken)} of {len(reports)} shortcuts are broken", True)
+            answer = QMessageBox.question(
+                self, "Broken Shortcuts",
+                f"{len(broken)} shortcut{'s' if len(broken) != 1 else ''} point to applications "
+                f"that are no longer installed. Remove {'them' if len(broken) != 1 else 'it'}?"
+            )
+            if answer == QMessageBox.Yes:
+                # Identical copies deployed to the other folders go as well
+                roots = deploy_roots(self.folder_name) if self.folder_name else []
+                for report in broken.values():
+                    remove_copies(report['path'], roots)
+                removed = prune_broken(list(broken.values()))
+                if self.index is not None and self.distro_name:
+                    self.index.remove_shortcuts(self.distro_name, [
+                        report['path'] for report in broken.values() if not os.path.exists(report['path'])
+                    ])
+                self.load_existing_shortcuts()
+                self.update_status(f"Removed {removed} broken shortcut{'s' if removed != 1 else ''}")
                 
-                if result.returncode == 0 and result.stdout.strip():
-                    desktop_files = result.stdout.strip().split('\n')
-                    for file_path in desktop_files:
-                        if not file_path:  # Skip empty lines
-                            continue
-                        
-                        # Read application name from .desktop file
-                        name_cmd = ['wsl', '--', '/bin/bash', '-c', 
-                                  f'cat "{file_path}" | grep "^Name=" | head -n 1']
-                        name_result = subprocess.run(name_cmd, capture_output=True, text=True)
-                        
-                        logger.debug(f"Name result for {file_path}: {name_result.stdout}")
-                        
-                        if name_result.returncode == 0 and name_result.stdout:
-                            app_name = name_result.stdout.strip().replace('Name=', '')
-                            if app_name:
-                                item_text = f"{app_name} ({file_path})"
-                                logger.debug(f"Adding item: {item_text}")
-                                self.app_listbox.addItem(item_text)
-                                apps_found += 1
+        except Exception as e:
+            error_msg = f"Error checking shortcuts: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            self.update_status(error_msg, True)
+
+    def load_wsl_applications(self, boot: bool = False) -> None:
+        """
+        Load WSL applications by scanning the registered application sources.
+        
+        Sources (XDG data directories, Flatpak and Snap exports and user-configured
+        directories) are merged by desktop-file ID in precedence order so that user
+        overrides hide system entries.  Sources that have not changed since the last
+        scan are served from the scanner's cache.
         
+        Scanning runs commands inside the distribution, which would start its VM.
+        A stopped distribution is therefore shown from the last scan recorded in
+        the index unless boot is set.
+        
+        Args:
+            boot: Start the distribution if it is stopped and scan it
+        """
+        try:
+            if not self.distro_name:
+                self.update_status("No WSL distribution detected", True)
+                return
+            
+            self._refresh_distro_state()
+            if self.distro is not None and not is_running(self.distro):
+                if not boot:
+                    self._show_cached_applications(self.distro)
+                    return
+                self._ensure_distro_running('rescan')
+            
+            self.update_status("Scanning for WSL applications...")
+            
+            if self.app_scanner is None:
+                runner = distro_runner(self.distro_name)
+                registry = discover_registry(runner, settings.get('custom_app_dirs') or [])
+                logger.debug("Scan sources: %s", list(registry))
+                self.app_scanner = ApplicationScanner(registry, runner)
+            
+            records, stats = self.app_scanner.scan()
+            changes = []
+            with_shortcuts = set()
+            if self.index is not None:
+                changes = self.index.record_scan(self.distro_name, records, complete=not stats['sources_failed'])
+                with_shortcuts = self.index.apps_with_shortcuts(self.distro_name)
+            self._populate_applications(records, with_shortcuts)
+            
+            log_event(logger, logging.INFO, 'scan_finished', changes=len(changes), **stats)
+            self.last_scan_stats = stats
+        
+            apps_found = stats['apps_found']
             if apps_found > 0:
-                self.update_status(f"Found {apps_found} WSL application{'s' if apps_found != 1 else ''}")
+                message = f"Found {apps_found} WSL application{'s' if apps_found != 1 else ''}"
+                if stats['duplicates_skipped']:
+                    message += f" ({stats['duplicates_skipped']} duplicate{'s' if stats['duplicates_skipped'] != 1 else ''} skipped)"
+                added = sum(1 for change in changes if change['action'] == 'added')
+                # Every application is new on the first scan, so only report later additions
+                if added and added != len(records):
+                    message += f", {added} new since last scan"
+                self.update_status(message)
             else:
                 self.update_status("No WSL applications found. Try installing some GUI applications in WSL.", True)
                 logger.warning("No applications found in WSL")
@@ -323,6 +533,48 @@ class MainWindow(QMainWindow):
             logger.error(error_msg, exc_info=True)
             self.update_status(error_msg, True)
 
+    def rescan_applications(self) -> None:
+        """Scan the distribution again, starting it first if it is stopped."""
+        self.load_wsl_applications(boot=True)
+
+    def _show_cached_applications(self, distro: DistroInfo) -> None:
+        """Fill the application list from the last recorded scan of a stopped distribution."""
+        records: List[AppRecord] = []
+        with_shortcuts: Set[str] = set()
+        last_scan = None
+        if self.index is not None:
+            records = self.index.cached_apps(distro['name'])
+            with_shortcuts = self.index.apps_with_shortcuts(distro['name'])
+            last_scan = self.index.last_scan_time(distro['name'])
+        self._populate_applications(records, with_shortcuts)
+        log_event(logger, logging.INFO, 'scan_skipped', distro=self.distro_name,
+                  state=distro['state'], cached=len(records))
+        
+        if last_scan is None:
+            self.update_status(
+                f"{self.distro_name} is stopped. Click \"Rescan Applications\" to start it and scan for applications."
+            )
+            return
+        when = datetime.datetime.fromtimestamp(last_scan).strftime('%Y-%m-%d %H:%M')
+        self.update_status(
+            f"{self.distro_name} is stopped; showing {len(records)} application{'s' if len(records) != 1 else ''} "
+            f"from the scan of {when}. Click \"Rescan Applications\" to start it and scan again."
+        )
+
+    def _populate_applications(self, records: List[AppRecord], with_shortcuts: Set[str]) -> None:
+        """Replace the application list rows; applications that have a shortcut are shown in bold."""
+        self.app_listbox.clear()
+        for record in records:
+            item = QListWidgetItem(f"{record['name']} ({record['path']})")
+            if record['icon']:
+                item.setData(ICON_REF_ROLE, f"wsl:{record['icon']}")
+            if record['path'] in with_shortcuts:
+                font = item.font()
+                font.setBold(True)
+                item.setFont(font)
+                item.setToolTip("A shortcut for this application already exists")
+            self.app_listbox.addItem(item)
+
     def add_custom_application(self) -> None:
         """
         Open a dialog to add a custom WSL application.
@@ -351,7 +603,10 @@ class MainWindow(QMainWindow):
                 if icon:
                     item_text += f"|{icon}"
                 
-                self.app_listbox.addItem(item_text)
+                item = QListWidgetItem(item_text)
+                if icon:
+                    item.setData(ICON_REF_ROLE, f"file:{icon}")
+                self.app_listbox.addItem(item)
                 self.update_status(f"Custom application '{name}' added successfully")
                 
                 # Show success styling temporarily
@@ -384,10 +639,11 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            shortcut_dir = os.path.expandvars(f'%AppData%\\Microsoft\\Windows\\Start Menu\\Programs\\{self.distro_name}')
+            shortcut_dir = self.shortcut_dir
             if not os.path.exists(shortcut_dir):
                 os.makedirs(shortcut_dir)
-                
+            
+            specs = []
             for item in selected_items:
                 app_info = item.text()
                 parts = app_info.split('|')
@@ -397,42 +653,34 @@ class MainWindow(QMainWindow):
                 app_name = app_info.split(' (')[0]
                 app_path = app_info.split(' (')[1].rstrip(')')
                 
-                shortcut_path = os.path.join(shortcut_dir, f"{app_name}.lnk")
-                
-                # Check if this is a .desktop file or custom application
-                is_desktop_file = app_path.endswith('.desktop')
-                
-                # Create the shortcut using the Windows Script Host with appropriate parameters
-                with open('create_shortcut.vbs', 'w') as f:
-                    if is_desktop_file:
-                        # For .desktop files, use BAMF_DESKTOP_FILE_HINT
-                        args = f'-d {self.distro_name} --cd ""~"" -- env BAMF_DESKTOP_FILE_HINT={app_path} {app_name.lower()}'
-                    else:
-                        # For custom applications, directly execute the command
-                        args = f'-d {self.distro_name} --cd ""~"" -- {app_path}'
-                    
-                    icon_location = (
-                        icon_path if icon_path 
-                        else "C:\\Program Files\\WSL\\wslg.exe,0"
-                    )
-                    
-                    f.write(f'''
-                    Set WshShell = WScript.CreateObject("WScript.Shell")
-                    Set shortcut = WshShell.CreateShortcut("{shortcut_path}")
-                    shortcut.TargetPath = "C:\\Program Files\\WSL\\wslg.exe"
-                    shortcut.Arguments = "{args}"
-                    shortcut.WorkingDirectory = "%USERPROFILE%"
-                    shortcut.WindowStyle = 1
-                    shortcut.IconLocation = "{icon_location}"
-                    shortcut.Description = "WSL GUI Application: {app_name}"
-                    shortcut.Save
-                    '''.strip())
-                
-                # Execute the VBS script
-                subprocess.run(['cscript', '//Nologo', 'create_shortcut.vbs'], check=True)
-                os.remove('create_shortcut.vbs')  # Clean up
-                
-            self.status_label.setText("Shortcut(s) created successfully.")
+                specs.append(make_wsl_shortcut_spec(shortcut_dir, self.distro_name, app_name, app_path, icon_path))
+            
+            # Write the whole selection once and copy it to every configured folder
+            writer = create_writer()
+            roots = deploy_roots(self.folder_name)
+            results = ShortcutDeployer(writer, roots).deploy(specs)
+            failures = [result for result in results if not result['ok']]
+            # A shortcut only counts as created when every folder received it
+            failed_items = {failure['item'] for failure in failures}
+            log_event(logger, logging.INFO, 'shortcuts_created', backend=writer.name, roots=len(roots),
+                      requested=len(specs), failed=len(failed_items))
+            if self.index is not None:
+                # Only the folder shown in the shortcuts list is tracked in the index
+                self.index.record_shortcuts(self.distro_name, [
+                    self._index_entry(result['path'], specs[result['item']]['arguments'],
+                                      specs[result['item']]['icon_location'])
+                    for result in results if result['ok'] and result['root'] == LISTED_ROOT
+                ])
+            for failure in failures:
+                logger.error("Failed to create shortcut %s: %s", failure['path'], failure['error'])
+            
+            if failures:
+                self.status_label.setText(
+                    f"Created {len(specs) - len(failed_items)} of {len(specs)} shortcut(s); "
+                    f"error in {failures[0]['root']}: {failures[0]['error']}"
+                )
+            else:
+                self.status_label.setText("Shortcut(s) created successfully.")
             
             # Refresh the shortcuts list
             self.shortcuts_listbox.clear()
@@ -441,33 +689,131 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.status_label.setText(f"Error creating shortcut: {str(e)}")
 
-    def get_wsl_distro_info(self):
-        """Get the default WSL distribution name and its Start Menu folder name"""
+    def save_diagnostic_log(self) -> None:
+        """Save the recent log records kept in memory to a file chosen by the user."""
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Diagnostic Log",
+            "wsl-shortcut-creator.log",
+            "Log Files (*.log);;All Files (*.*)"
+        )
+        if not file_name:
+            return
         try:
-            # Get default distribution using different command format
-            cmd = ['wsl.exe', '-l', '-v']
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-16le')
-            print(f"WSL list output:\n{result.stdout}")  # Debug print
-            
-            # Parse the output line by line, handling UTF-16 encoding
-            lines = [line for line in result.stdout.split('\n') if line.strip()]
-            for line in lines[1:]:  # Skip header line
-                if '*' in line:
-                    # Split on multiple spaces and filter empty strings
-                    parts = [part for part in line.split('  ') if part.strip()]
-                    # The distribution name is the part after '*'
-                    if len(parts) >= 1:
-                        distro_name = parts[0].replace('*', '').strip()
-                        print(f"Detected distribution: {distro_name}")  # Debug print
-                        return distro_name, distro_name
-            
-            raise Exception("No default WSL distribution found")
-        except Exception as e:
-            error_msg = f"Error detecting WSL distribution: {str(e)}"
-            print(error_msg)  # Debug print
-            self.status_label.setText(error_msg)
-            return None, None
+            count = dump_ring_buffer(file_name)
+            self.update_status(f"Saved {count} log entries to {file_name}")
+        except OSError as e:
+            self.update_status(f"Could not save log: {e}", True)
+
+    def _open_index(self) -> Optional[ShortcutIndex]:
+        """Open the sidecar index; the application works without it if that fails."""
+        path = settings.get('index_db') or default_index_path()
+        try:
+            return ShortcutIndex(path)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Shortcut index unavailable at %s: %s", path, e)
+            return None
+
+    @staticmethod
+    def _index_entry(path: str, arguments: str, icon_location: Optional[str]) -> ShortcutEntry:
+        """Build the index record for a shortcut from its arguments."""
+        _, target = parse_launch_target(arguments)
+        return {
+            'path': path,
+            'app_path': target[1] if target else None,
+            'icon_location': split_icon_location(icon_location)[0] if icon_location else None,
+            'arguments': arguments,
+        }
+
+    def _refresh_distro_state(self) -> None:
+        """Re-read the state of the current distribution; keeps the previous state if that fails."""
+        try:
+            self.distro = find_distro(list_distros(), self.distro_name)
+            if self.distro is not None and is_running(self.distro):
+                with self.state_check_lock:
+                    self.state_check = (time.monotonic(), True)
+                # Started outside the application since the last check
+                self.app_icons.retry_deferred()
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("Could not read the state of %s: %s", self.distro_name, e)
+
+    def _ensure_distro_running(self, reason: str) -> None:
+        """Start the distribution if it is known to be stopped, for an action that needs it."""
+        if self.distro is None or is_running(self.distro):
+            return
+        log_event(logger, logging.INFO, 'distro_boot', distro=self.distro_name, reason=reason)
+        self.update_status(f"Starting {self.distro_name}...")
+        boot_distro(self.distro['name'])
+        self._mark_distro_running()
+
+    def _mark_distro_running(self) -> None:
+        """Record that the distribution was started and load the icons held back while it was stopped."""
+        if self.distro is not None:
+            self.distro['state'] = STATE_RUNNING
+        with self.state_check_lock:
+            self.state_check = (time.monotonic(), True)
+        self.app_icons.retry_deferred()
+
+    def _fetch_icon(self, icon_ref: str) -> Optional[bytes]:
+        """Fetch icon bytes for a list row; called on icon loader worker threads."""
+        distro = self.distro
+        if not icon_ref.startswith('wsl:') or distro is None:
+            return fetch_icon_bytes(icon_ref, self.distro_name)
+        if not is_running(distro):
+            # Reading the icon would start the stopped distribution
+            raise IconUnavailable(icon_ref)
+        try:
+            return fetch_icon_bytes(icon_ref, self.distro_name, allow_start=False)
+        except SessionUnavailable:
+            # No shell keeps the distribution up, so WSL may have stopped it since it was last listed
+            if not self._distro_still_running():
+                raise IconUnavailable(icon_ref) from None
+            return fetch_icon_bytes(icon_ref, self.distro_name)
+
+    def _distro_still_running(self) -> bool:
+        """Check whether the distribution is running, listing distributions at most every STATE_CHECK_INTERVAL."""
+        with self.state_check_lock:
+            checked_at, running = self.state_check
+            now = time.monotonic()
+            if now - checked_at >= STATE_CHECK_INTERVAL:
+                try:
+                    distro = find_distro(list_distros(), self.distro_name)
+                    running = distro is not None and is_running(distro)
+                except (OSError, subprocess.SubprocessError) as e:
+                    logger.warning("Could not read the state of %s: %s", self.distro_name, e)
+                    running = False
+                if not running:
+                    logger.info("%s has stopped; holding back its icons", self.distro_name)
+                self.state_check = (now, running)
+            return running
+
+    def closeEvent(self, event: Optional[QCloseEvent]) -> None:
+        """Stop background icon loading and WSL shell sessions before the window closes."""
+        self.app_icons.shutdown()
+        self.shortcut_icons.shutdown()
+        session_pool.close_all()
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+        super().closeEvent(event)
+
+    def get_wsl_distro_info(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the default WSL distribution name and its Start Menu folder name.
         
+        Only ``wsl -l -v`` is run, which does not start any distribution.  The
+        parsed row, including its state and WSL version, is kept in ``self.distro``.
+        """
+        try:
+            self.distro = find_distro(list_distros())
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.error("Error detecting WSL distribution: %s", e)
+            return None, None
+        if self.distro is None:
+            return None, None
+        logger.info("Detected distribution: %s (%s, WSL %d)",
+                    self.distro['name'], self.distro['state'], self.distro['version'])
+        return self.distro['name'], self.distro['name']
 
     def _create_list_section(self, title: str, select_multiple: bool = False) -> Dict[str, Union[QVBoxLayout, QListWidget]]:
         """
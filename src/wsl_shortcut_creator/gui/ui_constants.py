@@ -21,6 +21,26 @@ SELECTION_MODE: Dict[str, int] = {
     'contiguous': 4
 }
 
+# Define list icon settings
+ICON_SETTINGS: Dict[str, int] = {
+    'size': 24,             # Thumbnail edge length in pixels
+    'prefetch_rows': 10,    # Rows decorated beyond the viewport edges
+    'cache_kb': 4096,       # QPixmapCache ceiling in kilobytes
+    'worker_threads': 2,    # Concurrent fetch/decode jobs
+    'update_delay_ms': 30   # Scroll event coalescing interval
+}
+
+# Define incremental list loading settings
+LIST_LOADING: Dict[str, int] = {
+    'first_chunk': 100,     # Rows inserted before returning to the event loop
+    'chunk': 2000           # Rows inserted per subsequent event-loop turn
+}
+
+# Define event-loop watchdog settings
+WATCHDOG: Dict[str, int] = {
+    'heartbeat_ms': 50      # Heartbeat timer interval; late ticks measure event-loop latency
+}
+
 # Define styles
 STYLES: Dict[str, str] = {
     'button': f"""
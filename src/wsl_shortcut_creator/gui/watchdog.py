@@ -0,0 +1,54 @@
+"""Watchdog measuring the latency of the Qt event loop."""
+from typing import Optional
+
+from PyQt5.QtCore import QObject, Qt, QTimer
+
+import logging
+
+from .ui_constants import WATCHDOG
+from ..core.stalls import StallMonitor
+
+# Setup module logger
+logger = logging.getLogger(__name__)
+
+
+class EventLoopWatchdog(QObject):
+    """
+    Report stalls of the GUI thread's event loop.
+    
+    A precise heartbeat timer ticks on the GUI thread; a tick that arrives
+    later than the threshold means the event loop was blocked.  The
+    ``StallMonitor`` thread samples the GUI thread's stack during the stall
+    and records a report when the loop recovers.
+    """
+
+    def __init__(self, threshold_ms: float, report_path: Optional[str] = None,
+                 parent: Optional[QObject] = None) -> None:
+        """
+        Args:
+            threshold_ms: Minimum event-loop delay reported as a stall
+            report_path: JSON-lines file receiving the stall reports
+            parent: Optional parent object
+        """
+        super().__init__(parent)
+        interval = WATCHDOG['heartbeat_ms']
+        self.monitor = StallMonitor(threshold_ms, interval, report_path)
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._beat)
+
+    def _beat(self) -> None:
+        """Record a heartbeat; the monitor logs and saves any stall itself."""
+        self.monitor.beat()
+
+    def start(self) -> None:
+        """Start the heartbeat; must be called on the GUI thread."""
+        logger.debug("Event-loop watchdog started, threshold %.0f ms", self.monitor.threshold * 1000)
+        self.monitor.start()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """Stop the heartbeat and the monitoring thread."""
+        self._timer.stop()
+        self.monitor.stop()
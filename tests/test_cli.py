@@ -0,0 +1,52 @@
+"""Tests for the command line interface."""
+from wsl_shortcut_creator.cli import has_query, parse_args, run_query
+from wsl_shortcut_creator.core.index_db import ShortcutIndex
+
+def test_query_prints_apps_with_shortcuts(tmp_path, capsys):
+    """Test that index queries run without the GUI."""
+    path = str(tmp_path / 'index.sqlite3')
+    index = ShortcutIndex(path)
+    index.record_scan('Ubuntu', [{'desktop_id': 'a.desktop', 'path': '/a.desktop', 'name': 'A',
+                                  'icon': None, 'source': 'xdg'}])
+    index.record_shortcuts('Ubuntu', [{'path': 'A.lnk', 'app_path': '/a.desktop',
+                                       'icon_location': None, 'arguments': ''}])
+    index.close()
+
+    args, qt_args = parse_args(['--index', path, '--apps-with-shortcuts', '-style', 'fusion'])
+    assert has_query(args)
+    assert qt_args == ['-style', 'fusion']
+    assert run_query(args) == 0
+    assert capsys.readouterr().out == 'Ubuntu\t/a.desktop\n'
+    assert not has_query(parse_args([])[0])
+
+def test_stall_summary_and_profile(tmp_path, capsys):
+    """Test the stall summary query and session profiling."""
+    from wsl_shortcut_creator.cli import run_profiled
+    from wsl_shortcut_creator.core.stalls import StallMonitor
+
+    log = str(tmp_path / 'stalls.jsonl')
+    args, _ = parse_args(['--stall-report', '--stall-log', log])
+    assert has_query(args)
+    assert not has_query(parse_args(['--stalls'])[0])
+    assert run_query(args) == 0
+    assert capsys.readouterr().out == f"No UI stalls recorded in {log}\n"
+
+    monitor = StallMonitor(threshold_ms=10, interval_ms=0, report_path=log)
+    monitor._last_beat -= 0.5
+    monitor.beat()
+    assert run_query(args) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith('1 UI stall since')
+    assert lines[2].split()[0] == '1'
+
+    profile = tmp_path / 'session.prof'
+    assert run_profiled(lambda: 3, str(profile)) == 3
+    assert profile.exists()
+    assert f"Profile saved to {profile}" in capsys.readouterr().out
+
+def test_stall_log_defaults_next_to_the_chosen_index(tmp_path):
+    """Test that --stall-log follows --index unless it is given explicitly."""
+    args, _ = parse_args(['--index', str(tmp_path / 'other' / 'index.sqlite3')])
+    assert args.stall_log == str(tmp_path / 'other' / 'stalls.jsonl')
+    args, _ = parse_args(['--index', str(tmp_path / 'index.sqlite3'), '--stall-log', 'mine.jsonl'])
+    assert args.stall_log == 'mine.jsonl'
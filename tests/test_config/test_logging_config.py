@@ -0,0 +1,58 @@
+"""Tests for the logging setup."""
+import io
+import logging
+
+from wsl_shortcut_creator.config.logging_config import (
+    dump_ring_buffer, log_event, setup_logging, shutdown_logging
+)
+
+def test_queue_ring_buffer_and_structured_events(tmp_path):
+    """Test that records reach the file via the queue and the bounded ring buffer."""
+    log_file = tmp_path / 'app.log'
+    stream = io.StringIO()
+    ring = setup_logging(logging.INFO, str(log_file), ring_size=3, stream=stream)
+    logger = logging.getLogger('wsl_shortcut_creator.test')
+    try:
+        logger.debug("hidden %s", 'value')
+        for i in range(5):
+            logger.info("message %d", i)
+        log_event(logger, logging.INFO, 'scan_finished', apps=2, source='xdg')
+    finally:
+        shutdown_logging()
+
+    lines = ring.lines()
+    assert len(lines) == 3
+    assert lines[-1].endswith("scan_finished apps=2 source='xdg'")
+    content = log_file.read_text()
+    assert 'message 0' in content and 'hidden' not in content
+    assert "scan_finished apps=2 source='xdg'" in stream.getvalue()
+
+    assert dump_ring_buffer(str(tmp_path / 'report.log')) == 3
+    assert (tmp_path / 'report.log').read_text().count('\n') == 3
+
+def test_ring_buffer_keeps_formatted_lines():
+    """Test that the ring buffer formats records when they are emitted and keeps no arguments."""
+    class Value:
+        def __init__(self):
+            self.text = 'before'
+
+        def __repr__(self):
+            return self.text
+
+    ring = setup_logging(logging.INFO, stream=io.StringIO())
+    logger = logging.getLogger('wsl_shortcut_creator.test')
+    value = Value()
+    try:
+        logger.info("value %r", value)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+        value.text = 'after'
+    finally:
+        shutdown_logging()
+
+    lines = ring.lines()
+    assert lines[0].endswith('value before')
+    assert 'Traceback' in lines[1] and 'ValueError: boom' in lines[1]
+    assert all(isinstance(line, str) for line in ring.buffer)
@@ -0,0 +1,64 @@
+"""Tests for multi-root shortcut deployment."""
+import os
+
+from wsl_shortcut_creator.config import settings
+from wsl_shortcut_creator.core.deploy import ShortcutDeployer, deploy_roots, remove_copies
+from wsl_shortcut_creator.core.lnk import read_shortcut
+from wsl_shortcut_creator.core.shortcut_writer import create_writer, make_wsl_shortcut_spec
+
+def test_deploy_to_all_roots_and_remove_copies(tmp_path):
+    """Test that each shortcut reaches every root atomically and that failures stay per root."""
+    (tmp_path / 'blocked').write_text('not a folder')
+    roots = [
+        {'name': 'start_menu', 'directory': str(tmp_path / 'menu' / 'Ubuntu')},
+        {'name': 'desktop', 'directory': str(tmp_path / 'desktop')},
+        {'name': 'common_start_menu', 'directory': str(tmp_path / 'blocked' / 'Ubuntu')},
+    ]
+    specs = [make_wsl_shortcut_spec(str(tmp_path), 'Ubuntu', name, f'/usr/share/applications/{name}.desktop')
+             for name in ('Gedit', 'Files')]
+    results = ShortcutDeployer(create_writer('native'), roots).deploy(specs)
+
+    assert [(result['item'], result['root'], result['ok']) for result in results] == [
+        (0, 'start_menu', True), (0, 'desktop', True), (0, 'common_start_menu', False),
+        (1, 'start_menu', True), (1, 'desktop', True), (1, 'common_start_menu', False),
+    ]
+    assert results[0]['path'] == os.path.join(roots[0]['directory'], 'Gedit.lnk')
+    assert sorted(os.listdir(roots[1]['directory'])) == ['Files.lnk', 'Gedit.lnk']
+    assert read_shortcut(results[1]['path'])['arguments'] == specs[0]['arguments']
+
+    # Only identical copies are removed from the other roots
+    (tmp_path / 'desktop' / 'Files.lnk').write_bytes(b'user file')
+    assert remove_copies(results[0]['path'], roots) == [results[1]['path']]
+    assert remove_copies(results[3]['path'], roots) == []
+    assert os.listdir(roots[1]['directory']) == ['Files.lnk']
+
+def test_listed_root_is_always_deployed(tmp_path, monkeypatch):
+    """Test that the Start Menu folder shown in the list is deployed to even if not configured."""
+    monkeypatch.setitem(settings._config, 'shortcuts_dir', str(tmp_path / 'menu'))
+    monkeypatch.setitem(settings._config, 'desktop_dir', str(tmp_path / 'desktop'))
+    monkeypatch.setitem(settings._config, 'deploy_roots', ['desktop'])
+    assert deploy_roots('Ubuntu') == [
+        {'name': 'start_menu', 'directory': str(tmp_path / 'menu' / 'Ubuntu')},
+        {'name': 'desktop', 'directory': str(tmp_path / 'desktop')},
+    ]
+    assert [root['name'] for root in deploy_roots('Ubuntu', ['desktop', 'start_menu'])] == ['desktop', 'start_menu']
+
+def test_foreign_file_in_shared_root_is_not_replaced(tmp_path):
+    """Test that a user's shortcut with the same name survives and the root reports a failure."""
+    from wsl_shortcut_creator.core.lnk import write_shortcut
+
+    desktop = tmp_path / 'desktop'
+    desktop.mkdir()
+    write_shortcut(str(desktop / 'Firefox.lnk'), 'C:\\Program Files\\Mozilla Firefox\\firefox.exe')
+    write_shortcut(str(desktop / 'Gedit.lnk'), 'C:\\Program Files\\WSL\\wslg.exe',
+                   arguments='-d Ubuntu --cd "~" -- gedit')
+    original = (desktop / 'Firefox.lnk').read_bytes()
+    roots = [{'name': 'desktop', 'directory': str(desktop)}]
+    specs = [make_wsl_shortcut_spec(str(tmp_path), 'Ubuntu', name, f'/usr/share/applications/{name}.desktop')
+             for name in ('Firefox', 'Gedit')]
+    results = ShortcutDeployer(create_writer('native'), roots).deploy(specs)
+
+    assert [result['ok'] for result in results] == [False, True]
+    assert 'already exists' in results[0]['error']
+    assert (desktop / 'Firefox.lnk').read_bytes() == original
+    assert read_shortcut(str(desktop / 'Gedit.lnk'))['arguments'] == specs[1]['arguments']
@@ -0,0 +1,29 @@
+"""Tests for desktop-file ID handling and XDG precedence merging."""
+from wsl_shortcut_creator.core.desktop_entries import (
+    DesktopFileIndex, desktop_file_id, parse_find_listing
+)
+
+def test_desktop_file_id_flattens_subdirectories():
+    """Test that subdirectory separators become dashes."""
+    assert desktop_file_id('firefox.desktop') == 'firefox.desktop'
+    assert desktop_file_id('kde/konsole.desktop') == 'kde-konsole.desktop'
+
+def test_user_entry_shadows_system_entry():
+    """Test that the first source added wins and shadowed files are counted."""
+    index = DesktopFileIndex()
+    index.add_source([('/home/u/.local/share/applications/gedit.desktop', 'gedit.desktop')])
+    added = index.add_source([
+        ('/usr/share/applications/gedit.desktop', 'gedit.desktop'),
+        ('/usr/share/applications/xterm.desktop', 'xterm.desktop'),
+    ])
+    assert added == 1
+    assert index.path_for('gedit.desktop') == '/home/u/.local/share/applications/gedit.desktop'
+    assert [file_id for file_id, _ in index] == ['gedit.desktop', 'xterm.desktop']
+    assert index.stats['sources'] == 2
+    assert index.stats['files_listed'] == 3
+    assert index.stats['duplicates_skipped'] == 1
+
+def test_parse_find_listing_skips_malformed_lines():
+    """Test parsing of find -printf output."""
+    output = "/usr/share/applications/a.desktop\ta.desktop\n\nbogus\n"
+    assert parse_find_listing(output) == [('/usr/share/applications/a.desktop', 'a.desktop')]
@@ -0,0 +1,24 @@
+"""Tests for the WSL distribution list parser."""
+from wsl_shortcut_creator.core.distros import decode_wsl_output, find_distro, is_running, parse_distro_list
+
+LISTING = (
+    '  NAME                   STATE           VERSION\r\n'
+    '* Ubuntu-22.04           Running         2\r\n'
+    '  docker-desktop         Stopped         2\r\n'
+    '  Legacy                 Stopped         1\r\n'
+)
+
+def test_parse_distro_list():
+    """Test that every column of ``wsl -l -v`` is parsed from UTF-16 output."""
+    distros = parse_distro_list(decode_wsl_output(LISTING.encode('utf-16-le')))
+    assert distros == [
+        {'name': 'Ubuntu-22.04', 'state': 'Running', 'version': 2, 'default': True},
+        {'name': 'docker-desktop', 'state': 'Stopped', 'version': 2, 'default': False},
+        {'name': 'Legacy', 'state': 'Stopped', 'version': 1, 'default': False},
+    ]
+    assert find_distro(distros)['name'] == 'Ubuntu-22.04'
+    assert is_running(find_distro(distros))
+    assert not is_running(find_distro(distros, 'Legacy'))
+    assert find_distro(distros, 'Missing') is None
+    assert parse_distro_list(decode_wsl_output(LISTING.encode('utf-8'))) == distros
+    assert parse_distro_list('Windows Subsystem for Linux has no installed distributions.\n') == []
@@ -0,0 +1,95 @@
+"""Tests for the batched shortcut health check."""
+import os
+import subprocess
+
+from wsl_shortcut_creator.core.health import check_shortcuts, parse_launch_target
+from wsl_shortcut_creator.core.shortcut_writer import create_writer, make_wsl_shortcut_spec
+
+def test_parse_launch_target():
+    """Test extraction of desktop-file and command targets."""
+    assert parse_launch_target(
+        '-d Ubuntu --cd "~" -- env BAMF_DESKTOP_FILE_HINT=/usr/share/applications/x.desktop x'
+    ) == ('Ubuntu', ('f', '/usr/share/applications/x.desktop'))
+    assert parse_launch_target('-d Debian --cd "~" -- gedit --new-window') == ('Debian', ('c', 'gedit'))
+    assert parse_launch_target('-d Debian -- /opt/app/run') == ('Debian', ('f', '/opt/app/run'))
+    assert parse_launch_target('/S /K dir') == (None, None)
+
+def test_check_shortcuts_uses_one_call_and_prunes(tmp_path):
+    """Test that all targets are checked in one call and broken shortcuts are pruned."""
+    apps = tmp_path / 'apps'
+    apps.mkdir()
+    (apps / 'present.desktop').write_text('[Desktop Entry]\n')
+    folder = tmp_path / 'Ubuntu'
+    folder.mkdir()
+    specs = [make_wsl_shortcut_spec(str(folder), 'Ubuntu', f'Present {i}', str(apps / 'present.desktop'))
+             for i in range(50)]
+    specs += [
+        make_wsl_shortcut_spec(str(folder), 'Ubuntu', 'Gone', str(apps / 'gone.desktop')),
+        make_wsl_shortcut_spec(str(folder), 'Ubuntu', 'Shell', 'bash'),
+        make_wsl_shortcut_spec(str(folder), 'Ubuntu', 'Missing', 'no-such-command-xyz'),
+        make_wsl_shortcut_spec(str(folder), 'Debian', 'Other', 'no-such-command-xyz'),
+    ]
+    create_writer('native').write_batch(specs)
+    (folder / 'junk.lnk').write_bytes(b'junk')
+
+    calls = []
+
+    def runner(script, input=None):
+        calls.append(input)
+        return subprocess.run(['bash', '-c', script], input=input, capture_output=True, text=True)
+
+    reports = {r['name']: r for r in check_shortcuts(str(folder), runner, 'Ubuntu', prune=True)}
+    assert len(calls) == 1
+    assert len(calls[0].splitlines()) == 4
+    assert reports['Present 7.lnk']['status'] == 'ok'
+    assert reports['Shell.lnk']['status'] == 'ok'
+    assert reports['Gone.lnk']['status'] == 'broken'
+    assert reports['Missing.lnk']['status'] == 'broken'
+    assert reports['Other.lnk']['status'] == 'unknown'
+    assert reports['junk.lnk']['status'] == 'unknown'
+    assert not (folder / 'Gone.lnk').exists()
+    assert (folder / 'Other.lnk').exists()
+
+def test_expanded_and_spaced_targets_are_not_pruned(tmp_path):
+    """Test that targets the shell would expand are checked safely or left alone."""
+    home = tmp_path / 'home'
+    (home / 'bin').mkdir(parents=True)
+    (home / 'bin' / 'app').write_text('')
+    apps = tmp_path / '7-Zip'
+    apps.mkdir()
+    (apps / '7-Zip File Manager.desktop').write_text('[Desktop Entry]\n')
+    folder = tmp_path / 'Ubuntu'
+    folder.mkdir()
+    specs = [
+        make_wsl_shortcut_spec(str(folder), 'Ubuntu', 'Tilde', '~/bin/app'),
+        make_wsl_shortcut_spec(str(folder), 'Ubuntu', 'Variable', '$HOME/bin/app'),
+        make_wsl_shortcut_spec(str(folder), 'Ubuntu', '7-Zip', str(apps / '7-Zip File Manager.desktop')),
+        make_wsl_shortcut_spec(str(folder), 'Ubuntu', 'Old', str(apps / '7-Zip File Manager.desktop')),
+    ]
+    # Shortcuts written before the hint was quoted
+    specs[3]['arguments'] = specs[3]['arguments'].replace("'", '')
+    create_writer('native').write_batch(specs)
+
+    def runner(script, input=None):
+        return subprocess.run(['bash', '-c', script], input=input, capture_output=True, text=True,
+                              env={'HOME': str(home), 'PATH': '/usr/bin:/bin'})
+
+    reports = {r['name']: r for r in check_shortcuts(str(folder), runner, 'Ubuntu', prune=True)}
+    assert reports['Tilde.lnk']['status'] == 'ok'
+    assert reports['Variable.lnk']['status'] == 'unknown'
+    assert reports['7-Zip.lnk']['status'] == 'ok'
+    assert reports['Old.lnk']['status'] == 'unknown'
+    assert len(os.listdir(folder)) == 4
+
+def test_failed_check_reports_nothing_broken(tmp_path):
+    """Test that a check that does not answer every target prunes nothing."""
+    folder = tmp_path / 'Ubuntu'
+    folder.mkdir()
+    create_writer('native').write_batch([make_wsl_shortcut_spec(str(folder), 'Ubuntu', 'Gone', '/gone.desktop')])
+
+    def runner(script, input=None):
+        return subprocess.CompletedProcess(script, 1, '', 'wsl failed')
+
+    reports = check_shortcuts(str(folder), runner, 'Ubuntu', prune=True)
+    assert reports[0]['status'] == 'unknown'
+    assert (folder / 'Gone.lnk').exists()
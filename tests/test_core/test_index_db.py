@@ -0,0 +1,55 @@
+"""Tests for the SQLite sidecar index."""
+from wsl_shortcut_creator.core.index_db import ShortcutIndex
+
+def app(path, name, icon=None):
+    return {'desktop_id': path.rsplit('/', 1)[-1], 'path': path, 'name': name, 'icon': icon, 'source': 'xdg'}
+
+def test_scan_changes_and_relations(tmp_path):
+    """Test change tracking between scans and the app/shortcut/icon relations."""
+    index = ShortcutIndex(str(tmp_path / 'index.sqlite3'))
+    assert index.connection.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    first = index.record_scan('Ubuntu', [app('/a.desktop', 'A', 'a'), app('/b.desktop', 'B')])
+    assert [(c['action'], c['key']) for c in first] == [('added', '/a.desktop'), ('added', '/b.desktop')]
+
+    index.record_shortcuts('Ubuntu', [{'path': 'C:\\A.lnk', 'app_path': '/a.desktop',
+                                       'icon_location': 'C:\\a.ico', 'arguments': '-- a'}])
+    assert index.apps_with_shortcuts('Ubuntu') == {'/a.desktop'}
+    assert [ref for ref, _ in index.icons_in_use()] == ['file:C:\\a.ico', 'wsl:a']
+
+    second = index.record_scan('Ubuntu', [app('/a.desktop', 'A renamed', 'a'), app('/c.desktop', 'C')])
+    assert sorted((c['action'], c['key']) for c in second) == [
+        ('added', '/c.desktop'), ('changed', '/a.desktop'), ('removed', '/b.desktop')
+    ]
+    assert len(index.last_scan_changes('Ubuntu')) == 3
+    assert index.app_count('Ubuntu') == 2
+
+    index.sync_shortcuts('Ubuntu', [])
+    assert index.apps_with_shortcuts('Ubuntu') == set()
+    assert [c['action'] for c in index.last_scan_changes('Ubuntu')][-1] == 'removed'
+    assert index.distro_names() == ['Ubuntu']
+    index.close()
+
+def test_cached_apps(tmp_path):
+    """Test that the last scan can be read back for a distribution that is not scanned."""
+    index = ShortcutIndex(str(tmp_path / 'index.sqlite3'))
+    assert index.cached_apps('Ubuntu') == []
+    assert index.last_scan_time('Ubuntu') is None
+    index.record_scan('Ubuntu', [app('/b.desktop', 'b'), app('/a.desktop', 'A', 'a')])
+    assert index.cached_apps('Ubuntu') == [app('/a.desktop', 'A', 'a'), app('/b.desktop', 'b')]
+    assert index.last_scan_time('Ubuntu') is not None
+    index.close()
+
+def test_incomplete_scan_keeps_apps_and_changes_are_capped(tmp_path):
+    """Test that empty or failed scans remove nothing and old change rows are dropped."""
+    index = ShortcutIndex(str(tmp_path / 'index.sqlite3'), max_changes=3)
+    index.record_scan('Ubuntu', [app('/a.desktop', 'A'), app('/b.desktop', 'B')])
+    assert index.record_scan('Ubuntu', []) == []
+    assert [c['key'] for c in index.record_scan('Ubuntu', [app('/c.desktop', 'C')], complete=False)] == ['/c.desktop']
+    assert index.app_count('Ubuntu') == 3
+
+    index.record_scan('Ubuntu', [app('/c.desktop', 'C')])
+    assert index.app_count('Ubuntu') == 1
+    keys = [key for (key,) in index.connection.execute('SELECT key FROM changes ORDER BY id')]
+    assert keys == ['/c.desktop', '/a.desktop', '/b.desktop']
+    index.close()
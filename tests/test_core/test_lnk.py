@@ -0,0 +1,32 @@
+"""Tests for the shell link reader."""
+import struct
+
+import pytest
+from wsl_shortcut_creator.core.lnk import ShortcutFormatError, parse_shortcut
+
+def build_lnk(arguments: str, icon_location: str, icon_index: int = 0) -> bytes:
+    """Build a minimal unicode shell link with arguments and an icon location."""
+    flags = 0x20 | 0x40 | 0x80
+    header = struct.pack('<I16sI', 0x4C, b'\x00' * 16, flags)
+    header += b'\x00' * (0x38 - len(header))
+    header += struct.pack('<i', icon_index)
+    header += b'\x00' * (0x4C - len(header))
+    body = b''
+    for value in (arguments, icon_location):
+        body += struct.pack('<H', len(value)) + value.encode('utf-16-le')
+    return header + body
+
+def test_parse_shortcut_string_data():
+    """Test that arguments and icon location are decoded."""
+    info = parse_shortcut(build_lnk('-d Ubuntu -- gedit', 'C:\\icons\\gedit.ico', 2))
+    assert info['arguments'] == '-d Ubuntu -- gedit'
+    assert info['icon_location'] == 'C:\\icons\\gedit.ico'
+    assert info['icon_index'] == 2
+    assert info['target'] is None
+
+def test_parse_shortcut_rejects_other_files():
+    """Test that non-link data raises ShortcutFormatError."""
+    with pytest.raises(ShortcutFormatError):
+        parse_shortcut(b'not a shortcut')
+    with pytest.raises(ShortcutFormatError):
+        parse_shortcut(build_lnk('args', 'icon.ico')[:-4])
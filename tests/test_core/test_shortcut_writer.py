@@ -0,0 +1,87 @@
+"""Tests for shortcut writer backends and the writer line protocol."""
+import os
+import sys
+import threading
+
+import pytest
+from wsl_shortcut_creator.core.lnk import read_shortcut
+from wsl_shortcut_creator.core.shortcut_writer import (
+    ProcessShortcutWriter, PythonWorkerShortcutWriter, WshShortcutWriter, create_writer, decode_request,
+    encode_request, escape, make_wsl_shortcut_spec, unescape
+)
+
+def test_escape_roundtrip():
+    """Test that escaped fields are ASCII and decode to the original text."""
+    value = 'C:\\Users\\Zoë\\Start Menu\t"~" 日本 🙂'
+    encoded = escape(value)
+    assert encoded.isascii() and '\t' not in encoded
+    assert unescape(encoded) == value
+
+def test_request_roundtrip(tmp_path):
+    """Test encoding and decoding of a protocol request line."""
+    spec = make_wsl_shortcut_spec(str(tmp_path), 'Ubuntu', 'Gedit', '/usr/share/applications/gedit.desktop')
+    fields = decode_request(encode_request(7, spec))
+    assert fields[0] == '7'
+    assert fields[1] == spec['path']
+    assert fields[3] == spec['arguments']
+    assert fields[7] == '1'
+
+@pytest.mark.parametrize('backend', ['native', 'worker'])
+def test_write_batch_reports_per_item_results(tmp_path, backend):
+    """Test that a batch writes valid shortcuts and reports failures per item."""
+    specs = [make_wsl_shortcut_spec(str(tmp_path), 'Ubuntu', f'App {i}', f'app{i}') for i in range(20)]
+    specs.append(make_wsl_shortcut_spec(str(tmp_path / 'missing'), 'Ubuntu', 'Broken', 'broken'))
+    results = create_writer(backend).write_batch(specs)
+
+    assert [result['ok'] for result in results] == [True] * 20 + [False]
+    assert results[-1]['error']
+    info = read_shortcut(specs[3]['path'])
+    assert info['arguments'] == '-d Ubuntu --cd "~" -- app3'
+    assert info['icon_location'] == 'C:\\Program Files\\WSL\\wslg.exe'
+
+def test_concurrent_worker_batches(tmp_path):
+    """Test that batches running in parallel do not interfere."""
+    writer = PythonWorkerShortcutWriter()
+    outcomes = {}
+
+    def run(batch):
+        specs = [make_wsl_shortcut_spec(str(tmp_path), 'Ubuntu', f'{batch}-{i}', 'cmd') for i in range(10)]
+        outcomes[batch] = writer.write_batch(specs)
+
+    threads = [threading.Thread(target=run, args=(batch,)) for batch in 'abc']
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result['ok'] for results in outcomes.values() for result in results)
+    assert len(os.listdir(tmp_path)) == 30
+
+def test_missing_writer_raises(tmp_path):
+    """Test that a writer that cannot be started raises instead of reporting results."""
+    writer = WshShortcutWriter(cscript=os.path.join(str(tmp_path), 'no-such-cscript'))
+    with pytest.raises(OSError):
+        writer.write_batch([make_wsl_shortcut_spec(str(tmp_path), 'Ubuntu', 'App', 'cmd')])
+
+def test_writer_exit_marks_remaining_items(tmp_path):
+    """Test that items without a response are reported failed when the writer exits mid-batch."""
+    # Answers the first two requests, then dies
+    script = (
+        "import sys\n"
+        "for _ in range(2):\n"
+        "    print(sys.stdin.readline().split('\\t')[0] + '\\tOK', flush=True)\n"
+        "sys.stderr.write('writer crashed\\n')\n"
+        "sys.exit(3)\n"
+    )
+    writer = ProcessShortcutWriter([sys.executable, '-c', script])
+    specs = [make_wsl_shortcut_spec(str(tmp_path), 'Ubuntu', f'App {i}', 'cmd') for i in range(5)]
+    reported = []
+    results = writer.write_batch(specs, on_result=reported.append)
+
+    assert [result['ok'] for result in results] == [True, True, False, False, False]
+    assert results[2]['error'] == "Writer exited with code 3: writer crashed"
+    assert len(reported) == 5
+
+def test_unknown_backend():
+    """Test that unknown backend names are rejected."""
+    with pytest.raises(ValueError):
+        create_writer('nope')
@@ -0,0 +1,103 @@
+"""Tests for the scan source registry and incremental scanning."""
+import subprocess
+
+from wsl_shortcut_creator.core.sources import ApplicationScanner, ScanSource, SourceRegistry, discover_registry
+
+def local_runner(script, input=None):
+    """Run scan scripts with the local bash instead of WSL."""
+    return subprocess.run(['bash', '-c', script], input=input, capture_output=True, text=True)
+
+def write_desktop(directory, name, app_name, icon=None):
+    directory.mkdir(parents=True, exist_ok=True)
+    content = f"[Desktop Entry]\nName={app_name}\n"
+    if icon:
+        content += f"Icon={icon}\n"
+    content += "[Desktop Action new]\nName=Other\n"
+    (directory / name).write_text(content)
+
+def test_registry_follows_xdg_precedence():
+    """Test default source order and de-duplication of directories."""
+    registry = SourceRegistry.from_environment(
+        '/home/u', '', '/home/u/.local/share/flatpak/exports/share:/usr/share',
+        ['~/org/apps', '/usr/share/applications']
+    )
+    assert [source.path for source in registry] == [
+        '/home/u/.local/share/applications',
+        '/home/u/.local/share/flatpak/exports/share/applications',
+        '/var/lib/flatpak/exports/share/applications',
+        '/usr/share/applications',
+        '/var/lib/snapd/desktop/applications',
+        '/home/u/org/apps',
+    ]
+    assert [source.kind for source in registry][-1] == 'custom'
+
+def test_scan_merges_sources_and_skips_unchanged(tmp_path):
+    """Test merging by desktop-file ID and skipping unchanged sources on rescan."""
+    user_dir = tmp_path / 'user'
+    system_dir = tmp_path / 'system'
+    write_desktop(user_dir, 'gedit.desktop', 'My Gedit')
+    write_desktop(system_dir, 'gedit.desktop', 'Gedit')
+    write_desktop(system_dir / 'kde', 'konsole.desktop', 'Konsole', 'utilities-terminal')
+    registry = SourceRegistry([ScanSource(str(user_dir), 'xdg'), ScanSource(str(system_dir), 'xdg'),
+                               ScanSource(str(tmp_path / 'absent'), 'flatpak')])
+    scanner = ApplicationScanner(registry, local_runner)
+
+    records, stats = scanner.scan()
+    assert sorted((r['desktop_id'], r['name'], r['icon']) for r in records) == [
+        ('gedit.desktop', 'My Gedit', None),
+        ('kde-konsole.desktop', 'Konsole', 'utilities-terminal'),
+    ]
+    assert stats['duplicates_skipped'] == 1
+    assert stats['entries_parsed'] == 2
+
+    records, stats = scanner.scan()
+    assert len(records) == 2
+    assert stats['sources_skipped'] == 3
+    assert stats['entries_parsed'] == 0
+
+    # Removing the user override exposes the system entry, which is read on demand
+    (user_dir / 'gedit.desktop').unlink()
+    records, stats = scanner.scan()
+    assert sorted(r['name'] for r in records) == ['Gedit', 'Konsole']
+    assert stats['sources_skipped'] == 2
+    assert stats['entries_parsed'] == 1
+
+def test_rescan_sees_subdirectories_and_edits(tmp_path):
+    """Test that files added in subdirectories and edited files invalidate the cached source."""
+    apps = tmp_path / 'apps'
+    write_desktop(apps, 'a.desktop', 'A')
+    scanner = ApplicationScanner(SourceRegistry([ScanSource(str(apps), 'xdg')]), local_runner)
+    scanner.scan()
+
+    write_desktop(apps / 'kde', 'k.desktop', 'K')
+    write_desktop(apps, 'a.desktop', 'A renamed')
+    records, stats = scanner.scan()
+    assert sorted(r['name'] for r in records) == ['A renamed', 'K']
+    assert stats['sources_skipped'] == 0
+
+def test_discover_registry_without_home():
+    """Test that an unknown home directory does not produce unexpandable paths."""
+    def runner(script, input=None):
+        return subprocess.CompletedProcess(script, 0, '\n\n/usr/share\n', '')
+    registry = discover_registry(runner, ['~/apps', '/opt/apps'])
+    paths = [source.path for source in registry]
+    assert not any(path.startswith(('~', '/.local')) for path in paths)
+    assert paths[-1] == '/opt/apps'
+
+def test_failed_source_is_reported_and_read_again(tmp_path):
+    """Test that a source that cannot be listed is counted as failed and retried on the next scan."""
+    apps_dir = tmp_path / 'apps'
+    write_desktop(apps_dir, 'gedit.desktop', 'Gedit')
+    failing = [True]
+
+    def runner(script, input=None):
+        if failing[0] and 'find' in script and '-printf "%p' in script:
+            return subprocess.CompletedProcess(script, 1, '', 'I/O error')
+        return local_runner(script, input)
+    scanner = ApplicationScanner(SourceRegistry([ScanSource(str(apps_dir), 'xdg')]), runner)
+
+    records, stats = scanner.scan()
+    assert records == [] and stats['sources_failed'] == 1
+    failing[0] = False
+    records, stats = scanner.scan()
+    assert [r['name'] for r in records] == ['Gedit'] and stats['sources_failed'] == 0
@@ -0,0 +1,30 @@
+"""Tests for UI stall detection and reporting."""
+import time
+
+from wsl_shortcut_creator.core.stalls import StallMonitor, read_stall_reports, summarize_stalls
+
+def blocking_call():
+    time.sleep(0.3)
+
+def test_stall_is_sampled_while_blocked(tmp_path):
+    """Test that the monitoring thread samples the blocked thread and the report is saved."""
+    path = str(tmp_path / 'stalls.jsonl')
+    monitor = StallMonitor(threshold_ms=50, interval_ms=10, report_path=path)
+    monitor.start()
+    try:
+        assert monitor.beat() is None
+        blocking_call()
+        report = monitor.beat()
+        assert monitor.beat() is None
+    finally:
+        monitor.stop()
+
+    assert report['duration_ms'] >= 250
+    assert report['location'].endswith('in blocking_call')
+    assert read_stall_reports(path) == [report] == monitor.reports
+
+    with open(path, 'a') as f:
+        f.write('damaged\n')
+    summary = summarize_stalls(read_stall_reports(path) + [dict(report, location=None, duration_ms=1.0)])
+    assert [(group['location'], group['count']) for group in summary] == [(report['location'], 1), ('unknown', 1)]
+    assert read_stall_reports(str(tmp_path / 'missing.jsonl')) == []
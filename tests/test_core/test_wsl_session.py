@@ -0,0 +1,116 @@
+"""Tests for persistent shell sessions, using a local bash as the WSL shell."""
+import os
+import signal
+import subprocess
+import threading
+import time
+
+import pytest
+from wsl_shortcut_creator.core.wsl_session import SessionError, SessionPool, SessionUnavailable, WslSession
+
+LOCAL_SHELL = ['bash', '--noprofile', '--norc']
+
+@pytest.fixture
+def session():
+    session = WslSession(LOCAL_SHELL)
+    yield session
+    session.close()
+
+def test_run_returns_framed_output(session):
+    """Test return code, stdout, stderr and stdin handling."""
+    result = session.run('cat; echo err >&2; exit 3', input='hello\n')
+    assert (result.returncode, result.stdout, result.stderr) == (3, 'hello\n', 'err\n')
+    binary = session.run('printf "\\000\\n@@WSLSC 1 0 0 0\\n\\377"', text=False)
+    assert binary.stdout == b'\x00\n@@WSLSC 1 0 0 0\n\xff'
+    assert session.ping()
+
+def test_pipelined_requests_from_threads(session):
+    """Test that concurrent submissions are answered and matched by id."""
+    futures = [session.submit(f'echo {i}') for i in range(40)]
+    assert [future.result(5).stdout for future in futures] == [f'{i}\n' for i in range(40)]
+
+    results = {}
+    def run(i):
+        results[i] = session.run(f'sleep 0.01; echo {i}').stdout
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {i: f'{i}\n' for i in range(10)}
+
+def test_timeout_closes_session(session):
+    """Test that a timed out request closes the busy session."""
+    with pytest.raises(subprocess.TimeoutExpired):
+        session.run('sleep 5', timeout=0.2)
+    assert not session.is_alive()
+    with pytest.raises(SessionError):
+        session.submit('true')
+
+def test_pool_restarts_dead_sessions_and_closes_idle():
+    """Test automatic restart and idle shutdown of pooled sessions."""
+    pool = SessionPool(lambda distro: LOCAL_SHELL, idle_timeout=0.2)
+    try:
+        first = pool.session('Ubuntu')
+        pid = pool.run('Ubuntu', 'echo $$').stdout
+        assert pool.run('Ubuntu', 'echo $$').stdout == pid
+        # A shell that died is replaced on the next request
+        os.kill(int(pid), signal.SIGKILL)
+        first._reader.join(2)
+        assert pool.run('Ubuntu', 'echo again').stdout == 'again\n'
+        assert pool.session('Ubuntu') is not first
+
+        deadline = time.monotonic() + 3
+        while pool.session_count() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool.session_count() == 0
+    finally:
+        pool.close_all()
+
+def test_pool_spreads_busy_requests_and_pings_idle_sessions():
+    """Test that concurrent requests use several shells and that a hung idle shell is replaced."""
+    pool = SessionPool(lambda distro: LOCAL_SHELL, max_sessions=4, ping_after=0.2, ping_timeout=0.3)
+    try:
+        start = time.monotonic()
+        threads = [threading.Thread(target=pool.run, args=('Ubuntu', 'sleep 0.5')) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert time.monotonic() - start < 1.5
+        assert pool.session_count('Ubuntu') == 4
+
+        # A shell that stopped answering fails its health check and is replaced
+        pool.close_all()
+        pid = pool.run('Ubuntu', 'echo $$').stdout.strip()
+        os.kill(int(pid), signal.SIGSTOP)
+        try:
+            time.sleep(0.3)
+            assert pool.run('Ubuntu', 'echo $$').stdout.strip() != pid
+        finally:
+            try:
+                os.kill(int(pid), signal.SIGCONT)
+            except ProcessLookupError:
+                pass  # Killed when its session was closed
+    finally:
+        pool.close_all()
+
+def test_pool_only_starts_shells_when_allowed():
+    """Test that allow_start=False reuses a running shell but never starts one."""
+    started = []
+    def command(distro):
+        started.append(distro)
+        return LOCAL_SHELL
+    pool = SessionPool(command)
+    try:
+        with pytest.raises(SessionUnavailable):
+            pool.run('Ubuntu', 'echo hi', allow_start=False)
+        assert started == []
+        pool.run('Ubuntu', 'true')
+        assert pool.run('Ubuntu', 'echo hi', allow_start=False).stdout == 'hi\n'
+        pool.close_all()
+        with pytest.raises(SessionUnavailable):
+            pool.run('Ubuntu', 'echo hi', allow_start=False)
+        assert started == ['Ubuntu']
+    finally:
+        pool.close_all()
@@ -0,0 +1,92 @@
+"""Tests for lazy icon loading in list widgets."""
+import threading
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PyQt5.QtGui import QImage, QPixmapCache
+from PyQt5.QtWidgets import QListWidget, QListWidgetItem
+from wsl_shortcut_creator.gui.icon_loader import ICON_REF_ROLE, LazyIconLoader
+
+def png_bytes() -> bytes:
+    """Return a small PNG image."""
+    image = QImage(32, 32, QImage.Format_ARGB32)
+    image.fill(Qt.red)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(data)
+
+def test_only_visible_rows_are_loaded(app):
+    """Test that a long list only fetches icons around the viewport."""
+    QPixmapCache.clear()
+    fetched = []
+    lock = threading.Lock()
+    data = png_bytes()
+
+    def fetch(icon_ref):
+        with lock:
+            fetched.append(icon_ref)
+        return data
+
+    list_widget = QListWidget()
+    list_widget.resize(200, 300)
+    for row in range(10000):
+        item = QListWidgetItem(f"App {row}")
+        item.setData(ICON_REF_ROLE, f"file:icon{row}.png")
+        list_widget.addItem(item)
+    list_widget.show()
+    loader = LazyIconLoader(list_widget, fetch)
+
+    rows = loader.visible_rows()
+    loader.update_visible()
+    loader._pool.waitForDone()
+    assert 0 < len(fetched) == len(rows) < 100
+
+    app.processEvents()
+    loader.update_visible()
+    assert not list_widget.item(0).icon().isNull()
+    assert list_widget.item(9000).icon().isNull()
+
+    # Scrolling away releases icons on rows that left the viewport
+    list_widget.scrollToItem(list_widget.item(9000))
+    loader.update_visible()
+    assert list_widget.item(0).icon().isNull()
+    loader.shutdown()
+
+def test_unavailable_icons_are_not_cached(app):
+    """Test that icons that cannot be read yet show the fallback and load after retry_deferred."""
+    from PyQt5.QtWidgets import QStyle
+    from wsl_shortcut_creator.gui.icon_loader import IconUnavailable
+
+    QPixmapCache.clear()
+    available = [False]
+    data = png_bytes()
+
+    def fetch(icon_ref):
+        if not available[0]:
+            raise IconUnavailable(icon_ref)
+        return data
+
+    list_widget = QListWidget()
+    item = QListWidgetItem("App")
+    item.setData(ICON_REF_ROLE, "wsl:/usr/share/icons/app.png")
+    list_widget.addItem(item)
+    list_widget.show()
+    fallback = list_widget.style().standardIcon(QStyle.SP_FileIcon)
+    loader = LazyIconLoader(list_widget, fetch, fallback)
+
+    loader.update_visible()
+    loader._pool.waitForDone()
+    app.processEvents()
+    loader.update_visible()
+    assert item.icon().cacheKey() == fallback.cacheKey()
+
+    available[0] = True
+    loader.retry_deferred()
+    loader.update_visible()
+    loader._pool.waitForDone()
+    app.processEvents()
+    loader.update_visible()
+    assert item.icon().cacheKey() != fallback.cacheKey()
+    assert not item.icon().isNull()
+    loader.shutdown()
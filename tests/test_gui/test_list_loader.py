@@ -0,0 +1,37 @@
+"""Tests for chunked list population."""
+from PyQt5.QtWidgets import QListWidget
+from wsl_shortcut_creator.core.shortcuts import iter_shortcut_names
+from wsl_shortcut_creator.gui.list_loader import ChunkedListLoader
+
+def test_rows_are_added_in_chunks(app, tmp_path):
+    """Test that the first chunk is added at once and the rest between event-loop turns."""
+    for i in range(1050):
+        (tmp_path / f"App {i}.lnk").write_bytes(b'')
+    (tmp_path / 'notes.txt').write_text('not a shortcut')
+    (tmp_path / 'folder.lnk').mkdir()
+
+    list_widget = QListWidget()
+    loader = ChunkedListLoader(list_widget, first_chunk=50, chunk=500)
+    finished = []
+    loader.finished.connect(finished.append)
+
+    loader.start(iter_shortcut_names(str(tmp_path)))
+    assert list_widget.count() == 50
+    assert loader.is_running()
+
+    while loader.is_running():
+        app.processEvents()
+    assert finished == [1050]
+    assert list_widget.count() == 1050
+    assert not any(list_widget.item(row).text() == 'folder.lnk' for row in range(list_widget.count()))
+
+def test_restart_cancels_running_load(app):
+    """Test that starting a new load stops the previous one."""
+    list_widget = QListWidget()
+    loader = ChunkedListLoader(list_widget, first_chunk=10, chunk=10)
+    loader.start(iter(str(i) for i in range(1000)))
+    list_widget.clear()
+    loader.start(iter(['a', 'b']))
+    app.processEvents()
+    assert not loader.is_running()
+    assert [list_widget.item(row).text() for row in range(list_widget.count())] == ['a', 'b']
@@ -2,7 +2,168 @@
 import pytest
 from wsl_shortcut_creator.gui.main_window import MainWindow
 
-def test_main_window_creation(app):
+def test_main_window_creation(app, tmp_path, monkeypatch):
     """Test that the main window can be created."""
+    from wsl_shortcut_creator.config import settings
+
+    monkeypatch.setitem(settings._config, 'index_db', str(tmp_path / 'index.sqlite3'))
     window = MainWindow()
     assert window is not None
+    window.close()
+
+def test_listed_shortcuts_are_synced_to_the_index(app, tmp_path, monkeypatch):
+    """Test that loading the Existing Shortcuts pane records the listed shortcuts in the index."""
+    from PyQt5.QtCore import QThreadPool
+    from wsl_shortcut_creator.config import settings
+    from wsl_shortcut_creator.core.lnk import write_shortcut
+    from wsl_shortcut_creator.gui import main_window
+
+    monkeypatch.setitem(settings._config, 'index_db', str(tmp_path / 'index.sqlite3'))
+    monkeypatch.setattr(main_window, 'list_distros', lambda: [])
+    window = MainWindow()
+    window.distro_name = 'Ubuntu'
+    window.shortcut_dir = str(tmp_path / 'menu')
+    (tmp_path / 'menu').mkdir()
+    write_shortcut(str(tmp_path / 'menu' / 'Gedit.lnk'), 'wsl.exe', arguments='-d Ubuntu -- gedit')
+    (tmp_path / 'menu' / 'Broken.lnk').write_bytes(b'not a shortcut')
+    window.index.record_shortcuts('Ubuntu', [{'path': str(tmp_path / 'menu' / 'Gone.lnk'), 'app_path': None,
+                                              'icon_location': None, 'arguments': ''}])
+
+    window.load_existing_shortcuts()
+    while window.shortcut_rows.is_running():
+        app.processEvents()
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    paths = [path for (path,) in window.index.connection.execute('SELECT path FROM shortcuts')]
+    assert paths == [str(tmp_path / 'menu' / 'Gedit.lnk')]
+    window.close()
+
+def test_stopped_distro_is_served_from_index(app, tmp_path, monkeypatch):
+    """Test that a stopped distribution is listed from the index and only started on rescan."""
+    from wsl_shortcut_creator.config import settings
+    from wsl_shortcut_creator.core.index_db import ShortcutIndex
+    from wsl_shortcut_creator.gui import main_window
+
+    index_path = str(tmp_path / 'index.sqlite3')
+    index = ShortcutIndex(index_path)
+    index.record_scan('Ubuntu', [{'desktop_id': 'x.desktop', 'path': '/x.desktop', 'name': 'X',
+                                  'icon': None, 'source': 'xdg'}])
+    index.close()
+    monkeypatch.setitem(settings._config, 'index_db', index_path)
+    monkeypatch.setitem(settings._config, 'shortcuts_dir', str(tmp_path))
+    monkeypatch.setattr(main_window, 'list_distros', lambda: [
+        {'name': 'Ubuntu', 'state': 'Stopped', 'version': 2, 'default': True}
+    ])
+    booted = []
+    monkeypatch.setattr(main_window, 'boot_distro', booted.append)
+    monkeypatch.setattr(main_window, 'distro_runner', lambda name: pytest.fail("distribution was used"))
+
+    window = MainWindow()
+    assert [window.app_listbox.item(row).text() for row in range(window.app_listbox.count())] == ['X (/x.desktop)']
+    assert booted == []
+
+    def unavailable(name):
+        raise RuntimeError("WSL is not available")
+    monkeypatch.setattr(main_window, 'distro_runner', unavailable)
+    window.rescan_applications()
+    assert booted == ['Ubuntu']
+    assert window.distro['state'] == 'Running'
+    window.close()
+
+def test_shortcut_check_runs_off_the_gui_thread(app, tmp_path, monkeypatch):
+    """Test that checking shortcuts runs on a worker thread and reports back to the window."""
+    import threading
+    from PyQt5.QtCore import QThreadPool
+    from wsl_shortcut_creator.config import settings
+    from wsl_shortcut_creator.gui import main_window
+
+    monkeypatch.setitem(settings._config, 'index_db', str(tmp_path / 'index.sqlite3'))
+    monkeypatch.setitem(settings._config, 'shortcuts_dir', str(tmp_path))
+    monkeypatch.setattr(main_window, 'list_distros', lambda: [])
+    window = MainWindow()
+    window.shortcut_dir = str(tmp_path)
+    threads = []
+
+    def check(directory, runner, distro_name):
+        threads.append(threading.get_ident())
+        return []
+    monkeypatch.setattr(main_window, 'check_shortcuts', check)
+    monkeypatch.setattr(main_window, 'distro_runner', lambda name: None)
+
+    window.check_shortcut_health()
+    assert not window.check_shortcuts_btn.isEnabled()
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    assert threads and threads[0] != threading.get_ident()
+    assert window.check_shortcuts_btn.isEnabled()
+    assert window.health_task is None
+    window.close()
+
+def test_pruning_broken_shortcuts_removes_deployed_copies(app, tmp_path, monkeypatch):
+    """Test that removing broken shortcuts also removes their identical copies in other roots."""
+    from PyQt5.QtCore import QThreadPool
+    from PyQt5.QtWidgets import QMessageBox
+    from wsl_shortcut_creator.config import settings
+    from wsl_shortcut_creator.gui import main_window
+
+    monkeypatch.setitem(settings._config, 'index_db', str(tmp_path / 'index.sqlite3'))
+    monkeypatch.setitem(settings._config, 'shortcuts_dir', str(tmp_path / 'menu'))
+    monkeypatch.setitem(settings._config, 'desktop_dir', str(tmp_path / 'desktop'))
+    monkeypatch.setitem(settings._config, 'deploy_roots', ['start_menu', 'desktop'])
+    monkeypatch.setattr(main_window, 'list_distros', lambda: [])
+    window = MainWindow()
+    window.folder_name = 'Ubuntu'
+    window.shortcut_dir = str(tmp_path / 'menu' / 'Ubuntu')
+    for folder in (tmp_path / 'menu' / 'Ubuntu', tmp_path / 'desktop'):
+        folder.mkdir(parents=True)
+        (folder / 'Gone.lnk').write_bytes(b'shortcut')
+    path = str(tmp_path / 'menu' / 'Ubuntu' / 'Gone.lnk')
+    monkeypatch.setattr(main_window, 'check_shortcuts', lambda directory, runner, distro_name: [
+        {'name': 'Gone.lnk', 'path': path, 'status': 'broken', 'target': '/gone.desktop',
+         'reason': "Desktop file not found", 'arguments': '', 'icon_location': None}
+    ])
+    monkeypatch.setattr(main_window, 'distro_runner', lambda name: None)
+    monkeypatch.setattr(main_window.QMessageBox, 'question', lambda *args: QMessageBox.Yes)
+
+    window.check_shortcut_health()
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    assert not (tmp_path / 'menu' / 'Ubuntu' / 'Gone.lnk').exists()
+    assert not (tmp_path / 'desktop' / 'Gone.lnk').exists()
+    window.close()
+
+def test_icons_are_held_back_once_idle_distro_stops(app, tmp_path, monkeypatch):
+    """Test that an icon fetch without a running shell re-checks the state instead of booting the distribution."""
+    from wsl_shortcut_creator.config import settings
+    from wsl_shortcut_creator.gui import main_window
+    from wsl_shortcut_creator.gui.icon_loader import IconUnavailable
+
+    monkeypatch.setitem(settings._config, 'index_db', str(tmp_path / 'index.sqlite3'))
+    state = {'name': 'Ubuntu', 'state': 'Running', 'version': 2, 'default': True}
+    listings = []
+    def list_distros():
+        listings.append(state['state'])
+        return [dict(state)]
+    monkeypatch.setattr(main_window, 'list_distros', list_distros)
+    window = MainWindow()
+    fetched = []
+    def fetch_icon_bytes(icon_ref, distro_name=None, allow_start=True):
+        fetched.append(allow_start)
+        if not allow_start:
+            raise main_window.SessionUnavailable("no shell")
+        return b'icon'
+    monkeypatch.setattr(main_window, 'fetch_icon_bytes', fetch_icon_bytes)
+    monkeypatch.setattr(main_window, 'STATE_CHECK_INTERVAL', 0)
+
+    # The session was idle-closed but the distribution is still up
+    assert window._fetch_icon('wsl:gedit') == b'icon'
+    assert fetched == [False, True]
+
+    # WSL stopped the distribution after its last shell exited
+    state['state'] = 'Stopped'
+    fetched.clear()
+    with pytest.raises(IconUnavailable):
+        window._fetch_icon('wsl:gedit')
+    assert fetched == [False]
+    assert listings[-1] == 'Stopped'
+    window.close()
@@ -0,0 +1,21 @@
+"""Tests for the event-loop watchdog."""
+import time
+
+from PyQt5.QtCore import QEventLoop, QTimer
+
+from wsl_shortcut_creator.gui.watchdog import EventLoopWatchdog
+
+def test_watchdog_reports_blocked_event_loop(app):
+    """Test that a handler blocking the event loop is reported with its stack."""
+    watchdog = EventLoopWatchdog(100)
+    watchdog.start()
+    loop = QEventLoop()
+    QTimer.singleShot(100, lambda: time.sleep(0.4))
+    QTimer.singleShot(800, loop.quit)
+    loop.exec_()
+    watchdog.stop()
+
+    reports = watchdog.monitor.reports
+    assert len(reports) == 1
+    assert reports[0]['duration_ms'] >= 300
+    assert reports[0]['location'].endswith('in <lambda>')